@@ -0,0 +1,9 @@
+"""Helpers shared by the assignment apps."""
+
+from .http_cache import HTTPCache, FetchResult, CacheMiss, get_http_cache, fetch_text
+from .pipeline import FetchParseResult, fetch_and_parse
+
+__all__ = [
+    "HTTPCache", "FetchResult", "CacheMiss", "get_http_cache", "fetch_text",
+    "FetchParseResult", "fetch_and_parse",
+]
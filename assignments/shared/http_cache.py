@@ -0,0 +1,223 @@
+"""
+On-disk HTTP cache for changelog and release-note fetching
+
+Every assignment that analyzes upgrades downloads the same GitHub raw
+files. HTTPCache keeps one copy of each response on disk, shared by all of
+them:
+
+- A response younger than max_age seconds is served straight from disk.
+- Older responses are revalidated with If-None-Match / If-Modified-Since;
+  a 304 costs one round trip and no body.
+- If the network fails or GitHub rate-limits the request, the last cached
+  copy is served instead.
+- In offline mode nothing is requested at all and a missing entry raises
+  CacheMiss. The default comes from HTTP_CACHE_OFFLINE=1; callers that let
+  a user toggle it (one Streamlit session among many) pass offline= per
+  fetch instead of changing the shared instance.
+
+All requests go through one pooled requests.Session, so repeated fetches to
+the same host reuse their connection.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "genai_journey", "http")
+
+# Status codes answered from a stale cache entry instead of failing
+STALE_OK_STATUSES = {403, 429, 500, 502, 503, 504}
+
+
+class CacheMiss(requests.RequestException):
+    """Raised in offline mode when a URL has never been cached"""
+
+
+@dataclass
+class FetchResult:
+    url: str
+    text: str
+    source: str  # 'cache', 'revalidated', 'network', 'stale' or 'offline'
+    fetched_at: float
+
+    @property
+    def from_cache(self) -> bool:
+        return self.source != "network"
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class HTTPCache:
+    """Persistent content cache with conditional revalidation"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_age: float = 300,
+        offline: Optional[bool] = None,
+        pool_size: int = 16
+    ):
+        """
+        Args:
+            cache_dir: Directory for cached responses (HTTP_CACHE_DIR or ~/.cache/genai_journey/http)
+            max_age: Seconds a cached response is used without revalidating
+            offline: Default for fetches that don't pass offline (defaults to the HTTP_CACHE_OFFLINE env var)
+            pool_size: Connections kept open per host
+        """
+        self.cache_dir = cache_dir or os.environ.get("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_age = max_age
+        self.offline = _env_flag("HTTP_CACHE_OFFLINE") if offline is None else offline
+        self.stats = {"cache": 0, "revalidated": 0, "network": 0, "stale": 0, "offline": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for a URL: metadata on the first line, then the raw body"""
+        try:
+            with open(self._path(url), "rb") as f:
+                entry = json.loads(f.readline())
+                entry["body"] = f.read()
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _store(self, url: str, response: requests.Response) -> Dict[str, Any]:
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding or response.apparent_encoding or "utf-8",
+            "fetched_at": time.time(),
+        }
+        self._write(url, entry, response.content)
+        entry["body"] = response.content
+        return entry
+
+    def _touch(self, url: str, entry: Dict[str, Any]) -> None:
+        entry["fetched_at"] = time.time()
+        self._write(url, {k: v for k, v in entry.items() if k != "body"}, entry["body"])
+
+    def _write(self, url: str, meta: Dict[str, Any], body: bytes) -> None:
+        # Write to a temp file and rename, so readers never see half an entry
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(body)
+            os.replace(tmp, self._path(url))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _result(self, entry: Dict[str, Any], source: str) -> FetchResult:
+        with self._lock:
+            self.stats[source] += 1
+        return FetchResult(
+            url=entry["url"],
+            text=entry["body"].decode(entry["encoding"], errors="replace"),
+            source=source,
+            fetched_at=entry["fetched_at"],
+        )
+
+    def fetch(
+        self,
+        url: str,
+        timeout: float = 20,
+        max_age: Optional[float] = None,
+        offline: Optional[bool] = None
+    ) -> FetchResult:
+        """
+        Fetch a URL through the cache.
+
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+            max_age: Override of the instance max_age (0 always revalidates)
+            offline: Serve only from cache (None for the instance default)
+
+        Returns:
+            FetchResult with the decoded text and where it came from
+
+        Raises:
+            CacheMiss: Offline and the URL is not cached
+            requests.RequestException: The request failed and nothing is cached
+        """
+        entry = self._load(url)
+        max_age = self.max_age if max_age is None else max_age
+        offline = self.offline if offline is None else offline
+
+        if offline:
+            if entry is None:
+                raise CacheMiss(f"Offline and not cached: {url}")
+            return self._result(entry, "offline")
+
+        if entry is not None and time.time() - entry["fetched_at"] < max_age:
+            return self._result(entry, "cache")
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            if entry is None:
+                raise
+            return self._result(entry, "stale")
+
+        if response.status_code == 304 and entry is not None:
+            self._touch(url, entry)
+            return self._result(entry, "revalidated")
+
+        if response.status_code != 200 and entry is not None and response.status_code in STALE_OK_STATUSES:
+            return self._result(entry, "stale")
+
+        response.raise_for_status()
+        return self._result(self._store(url, response), "network")
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isfile(path):
+                os.remove(path)
+
+
+_default_cache: Optional[HTTPCache] = None
+_default_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache:
+    """The process-wide cache shared by every fetch helper."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HTTPCache()
+        return _default_cache
+
+
+def fetch_text(url: str, timeout: float = 20, offline: Optional[bool] = None) -> str:
+    """Fetch a URL's text through the shared cache (raises like HTTPCache.fetch)."""
+    return get_http_cache().fetch(url, timeout=timeout, offline=offline).text
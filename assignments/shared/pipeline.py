@@ -0,0 +1,115 @@
+"""
+Concurrent fetch-and-parse pipeline for changelog files
+
+All URLs are downloaded at once on a thread pool (through the shared
+HTTPCache), and each document is parsed as soon as it arrives while the
+rest are still downloading, so a span of several CHANGELOG files costs
+roughly one round trip plus the slowest parse.
+
+Parsing runs in the calling thread by default, which is what a handful of
+changelogs per request needs. Callers with many large documents can opt in
+to a process pool; it is created once per process with the platform's
+default start method and reused by every later call.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from .http_cache import FetchResult, get_http_cache
+
+
+@dataclass
+class FetchParseResult:
+    url: str
+    fetch: Optional[FetchResult] = None
+    parsed: Any = None
+    error: Optional[Exception] = None
+    stage: Optional[str] = None  # 'fetch' or 'parse', whichever raised error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_parser_pool: Optional[ProcessPoolExecutor] = None
+_parser_pool_lock = threading.Lock()
+
+
+def _noop() -> None:
+    pass
+
+
+def _get_parser_pool(workers: int) -> ProcessPoolExecutor:
+    """The process-wide parser pool, sized by the first caller that needs it."""
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is None:
+            _parser_pool = ProcessPoolExecutor(workers)
+            # Start the workers now, before this call's fetch threads exist
+            _parser_pool.submit(_noop).result()
+        return _parser_pool
+
+
+def fetch_and_parse(
+    urls: List[str],
+    parse: Callable[[str], Any],
+    fetch_workers: int = 8,
+    parse_workers: int = 0,
+    timeout: float = 20,
+    offline: Optional[bool] = None
+) -> List[FetchParseResult]:
+    """
+    Fetch URLs concurrently and parse each one as soon as it arrives.
+
+    Args:
+        urls: URLs to fetch (duplicates are fetched once)
+        parse: Function from text to parsed result (module-level and picklable for the pool)
+        fetch_workers: Downloads in flight
+        parse_workers: Size of the shared parser process pool, used from its
+            first creation on (0 parses in the calling thread)
+        timeout: Request timeout in seconds
+        offline: Serve only from cache (None for the cache's default)
+
+    Returns:
+        One FetchParseResult per unique URL, in input order. Failures are
+        reported in 'error' instead of raised, with 'stage' saying whether
+        the fetch or the parse failed.
+    """
+    urls = list(dict.fromkeys(urls))
+    results = {url: FetchParseResult(url) for url in urls}
+    if not urls:
+        return []
+
+    cache = get_http_cache()
+    parser_pool = _get_parser_pool(parse_workers) if parse_workers > 0 else None
+
+    with ThreadPoolExecutor(max_workers=min(fetch_workers, len(urls))) as fetcher:
+        downloads = {fetcher.submit(cache.fetch, url, timeout, offline=offline): url for url in urls}
+        parses = {}
+
+        for future in as_completed(downloads):
+            result = results[downloads[future]]
+            try:
+                result.fetch = future.result()
+            except Exception as e:
+                result.error, result.stage = e, "fetch"
+                continue
+
+            if parser_pool is not None:
+                parses[parser_pool.submit(parse, result.fetch.text)] = result
+                continue
+            try:
+                result.parsed = parse(result.fetch.text)
+            except Exception as e:
+                result.error, result.stage = e, "parse"
+
+        for future in as_completed(parses):
+            result = parses[future]
+            try:
+                result.parsed = future.result()
+            except Exception as e:
+                result.error, result.stage = e, "parse"
+
+    return [results[url] for url in urls]
@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import sqlite3
 import requests
 import streamlit as st
@@ -11,6 +12,10 @@ from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+# Shared fetch layer lives in assignments/shared
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared import fetch_text
+
 # =========================================================
 # CONFIG
 # =========================================================
@@ -53,10 +58,10 @@ def convert_to_raw(url):
 
 def fetch_markdown(url):
     raw_url = convert_to_raw(url)
-    r = requests.get(raw_url, timeout=30)
-    if r.status_code != 200:
+    try:
+        return fetch_text(raw_url, timeout=30)
+    except requests.RequestException:
         return ""
-    return r.text
 
 # =========================================================
 # DETERMINISTIC STRUCTURED PARSER
@@ -1,7 +1,14 @@
+import os
+import sys
+
 import requests
 
+# Shared fetch layer lives in assignments/shared
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared import fetch_text
+
 def fetch_release_notes(url: str) -> str:
-    response = requests.get(url)
-    if response.status_code != 200:
+    try:
+        return fetch_text(url)
+    except requests.RequestException:
         raise Exception("Failed to fetch release notes")
-    return response.text
@@ -7,12 +7,13 @@ DevOps Upgrade Intelligence Assistant - PRODUCTION FINAL
 """
 
 import streamlit as st
-import requests
 import re
 import os
+import sys
+import time
 import shutil
+import hashlib
 from typing import List, Dict, Tuple
-from dataclasses import dataclass
 
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
@@ -24,6 +25,12 @@ from langchain.chains import LLMChain
 from neo4j import GraphDatabase
 import chromadb
 
+from changelog_parser import VersionData, parse_changelog_flexible
+
+# Shared fetch layer lives in assignments/shared
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from shared import get_http_cache, fetch_and_parse
+
 # Page config
 st.set_page_config(page_title="DevOps Upgrade Assistant", layout="wide", page_icon="🔄")
 
@@ -65,6 +72,14 @@ with st.sidebar:
             except Exception as e:
                 st.error(f"❌ Failed: {str(e)}")
     
+    st.markdown("### 📦 Changelog Cache")
+    http_cache = get_http_cache()
+    # Per session: the cache instance is shared by every session in this process
+    offline_mode = st.checkbox("Offline mode (cached changelogs only)", value=http_cache.offline)
+    if st.button("Clear Changelog Cache"):
+        http_cache.clear()
+        st.success("✅ Cache cleared")
+    
     st.markdown("---")
     if st.button("🗑️ Reset All"):
         if os.path.exists("./chroma_db"):
@@ -73,119 +88,23 @@ with st.sidebar:
             del st.session_state[key]
         st.rerun()
 
-# Data models
-@dataclass
-class VersionData:
-    version: str
-    content: str
-    breaking_changes: List[str]
-    deprecations: List[str]
-    removals: List[str]
-    security_fixes: List[str]
-
 # Helper functions
-def fetch_from_url(url: str) -> str:
-    """Fetch changelog from any GitHub URL"""
-    try:
-        # Convert GitHub blob URLs to raw
-        if 'github.com' in url and '/blob/' in url:
-            url = url.replace('github.com', 'raw.githubusercontent.com').replace('/blob/', '/')
-        
-        st.write(f"📥 Fetching: {url}")
-        response = requests.get(url, timeout=20)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        st.error(f"❌ Fetch failed: {str(e)}")
-        return None
-
-def parse_changelog_flexible(content: str) -> List[VersionData]:
-    """Parse ANY Kubernetes changelog format"""
-    if not content:
-        return []
-    
-    versions = []
-    lines = content.split('\n')
-    current_version = None
-    current_content = []
-    current_breaking = []
-    current_deprecated = []
-    current_removed = []
-    current_security = []
-    
-    for line in lines:
-        # Match version headers: # v1.24.0, ## v1.24.0, ### 1.24.0, etc.
-        version_match = re.match(r'^#{1,4}\s*v?(\d+\.\d+\.\d+)', line, re.IGNORECASE)
-        
-        if version_match:
-            # Save previous version
-            if current_version and len(current_content) > 5:
-                versions.append(VersionData(
-                    version=current_version,
-                    content='\n'.join(current_content),
-                    breaking_changes=current_breaking[:],
-                    deprecations=current_deprecated[:],
-                    removals=current_removed[:],
-                    security_fixes=current_security[:]
-                ))
-            
-            # Start new version
-            current_version = version_match.group(1)
-            current_content = [line]
-            current_breaking = []
-            current_deprecated = []
-            current_removed = []
-            current_security = []
-        else:
-            if current_version:
-                current_content.append(line)
-                line_lower = line.lower()
-                
-                # Flexible pattern matching
-                # Breaking changes
-                if any(pattern in line_lower for pattern in [
-                    'breaking', 'breaks', 'incompatible', 'removed api', 'removed feature'
-                ]):
-                    if line.strip() and not line.strip().startswith('#'):
-                        current_breaking.append(line.strip())
-                
-                # Deprecations
-                if any(pattern in line_lower for pattern in [
-                    'deprecat', 'will be removed', 'obsolete', 'legacy'
-                ]):
-                    if line.strip() and not line.strip().startswith('#'):
-                        current_deprecated.append(line.strip())
-                
-                # Removals
-                if any(pattern in line_lower for pattern in [
-                    'removed', 'deleted', 'dropped'
-                ]) and 'deprecat' not in line_lower:
-                    if line.strip() and not line.strip().startswith('#'):
-                        current_removed.append(line.strip())
-                
-                # Security
-                if any(pattern in line_lower for pattern in [
-                    'cve-', 'security', 'vulnerability', 'exploit', 'patch'
-                ]):
-                    if line.strip() and not line.strip().startswith('#'):
-                        current_security.append(line.strip())
-    
-    # Save last version
-    if current_version and len(current_content) > 5:
-        versions.append(VersionData(
-            version=current_version,
-            content='\n'.join(current_content),
-            breaking_changes=current_breaking,
-            deprecations=current_deprecated,
-            removals=current_removed,
-            security_fixes=current_security
-        ))
-    
-    return versions
+def to_raw_url(url: str) -> str:
+    """Convert GitHub blob URLs to raw"""
+    if 'github.com' in url and '/blob/' in url:
+        url = url.replace('github.com', 'raw.githubusercontent.com').replace('/blob/', '/')
+    return url
 
 # Neo4j Knowledge Graph
 class KnowledgeGraph:
-    def __init__(self, uri, user, password):
+    # Rows sent per UNWIND transaction
+    BATCH_SIZE = 1000
+    
+    def __init__(self, uri, user, password, sources: List[str]):
+        # Version nodes are keyed by (name, tool). The tool value here names
+        # the changelogs this graph is built from, so rebuilding it never
+        # touches versions written from other inputs or by comprehensive mode
+        self.tool = "changelog:" + hashlib.sha256("\n".join(sorted(sources)).encode("utf-8")).hexdigest()[:16]
         self.connected = False
         self.driver = None
         try:
@@ -197,50 +116,77 @@ class KnowledgeGraph:
             st.sidebar.success("✅ Neo4j Connected")
         except Exception as e:
             st.sidebar.error(f"❌ Neo4j: {str(e)[:50]}")
+            return
+        
+        # The constraint's index backs every MERGE/MATCH on a version
+        try:
+            with self.driver.session() as session:
+                session.run(
+                    "CREATE CONSTRAINT version_key IF NOT EXISTS "
+                    "FOR (v:Version) REQUIRE (v.name, v.tool) IS UNIQUE"
+                ).consume()
+        except Exception as e:
+            st.sidebar.warning(f"⚠️ Neo4j constraint: {str(e)[:50]}")
+    
+    def _write_batches(self, session, query: str, rows: List[Dict]):
+        """Run an UNWIND query over rows, one transaction per batch"""
+        for i in range(0, len(rows), self.BATCH_SIZE):
+            batch = rows[i:i + self.BATCH_SIZE]
+            session.execute_write(lambda tx: tx.run(query, rows=batch, tool=self.tool).consume())
     
     def create_graph(self, versions: List[VersionData]):
         if not self.connected:
             return
         
+        start_time = time.time()
+        sorted_v = sorted(versions, key=lambda x: tuple(map(int, x.version.split('.'))))
+        names = [v.version for v in sorted_v]
+        
+        version_rows = [{
+            'version': v.version,
+            'has_breaking': len(v.breaking_changes) > 0,
+            'has_deprecated': len(v.deprecations) > 0,
+            'has_removed': len(v.removals) > 0,
+            'has_security': len(v.security_fixes) > 0,
+            'num_breaking': len(v.breaking_changes),
+            'num_deprecated': len(v.deprecations)
+        } for v in sorted_v]
+        edge_rows = [{'v1': v1, 'v2': v2} for v1, v2 in zip(names, names[1:])]
+        
         with self.driver.session() as session:
-            # Clear old data
-            session.run("MATCH (n) DETACH DELETE n")
+            # Clear old data: only this graph's stale versions and its version chain
+            session.execute_write(lambda tx: tx.run("""
+                MATCH (v:Version {tool: $tool})
+                WHERE NOT v.name IN $names
+                DETACH DELETE v
+                """, tool=self.tool, names=names).consume())
+            session.execute_write(lambda tx: tx.run("""
+                MATCH (:Version {tool: $tool})-[r:PRECEDES]->(:Version {tool: $tool})
+                DELETE r
+                """, tool=self.tool).consume())
             
             # Create version nodes
-            for v in versions:
-                session.run("""
-                    CREATE (v:Version {
-                        name: $version,
-                        has_breaking: $breaking,
-                        has_deprecated: $deprecated,
-                        has_removed: $removed,
-                        has_security: $security,
-                        num_breaking: $num_breaking,
-                        num_deprecated: $num_deprecated
-                    })
-                    """,
-                    version=v.version,
-                    breaking=len(v.breaking_changes) > 0,
-                    deprecated=len(v.deprecations) > 0,
-                    removed=len(v.removals) > 0,
-                    security=len(v.security_fixes) > 0,
-                    num_breaking=len(v.breaking_changes),
-                    num_deprecated=len(v.deprecations)
-                )
+            self._write_batches(session, """
+                UNWIND $rows AS row
+                MERGE (v:Version {name: row.version, tool: $tool})
+                SET v.has_breaking = row.has_breaking,
+                    v.has_deprecated = row.has_deprecated,
+                    v.has_removed = row.has_removed,
+                    v.has_security = row.has_security,
+                    v.num_breaking = row.num_breaking,
+                    v.num_deprecated = row.num_deprecated
+                """, version_rows)
             
             # Create PRECEDES relationships
-            sorted_v = sorted(versions, key=lambda x: tuple(map(int, x.version.split('.'))))
-            for i in range(len(sorted_v) - 1):
-                session.run("""
-                    MATCH (v1:Version {name: $v1})
-                    MATCH (v2:Version {name: $v2})
-                    CREATE (v1)-[:PRECEDES]->(v2)
-                    """,
-                    v1=sorted_v[i].version,
-                    v2=sorted_v[i+1].version
-                )
+            self._write_batches(session, """
+                UNWIND $rows AS row
+                MATCH (v1:Version {name: row.v1, tool: $tool})
+                MATCH (v2:Version {name: row.v2, tool: $tool})
+                MERGE (v1)-[:PRECEDES]->(v2)
+                """, edge_rows)
         
-        st.success(f"✅ Neo4j: {len(versions)} versions mapped")
+        elapsed = (time.time() - start_time) * 1000
+        st.success(f"✅ Neo4j: {len(versions)} versions mapped in {elapsed:.0f} ms")
     
     def analyze_path(self, start: str, end: str) -> str:
         """Get upgrade path analysis"""
@@ -249,7 +195,7 @@ class KnowledgeGraph:
         
         with self.driver.session() as session:
             result = session.run("""
-                MATCH path = (v1:Version {name: $start})-[:PRECEDES*]->(v2:Version {name: $end})
+                MATCH path = (v1:Version {name: $start, tool: $tool})-[:PRECEDES*]->(v2:Version {name: $end, tool: $tool})
                 WITH nodes(path) as versions
                 UNWIND versions as v
                 RETURN 
@@ -260,7 +206,7 @@ class KnowledgeGraph:
                     v.num_breaking as num_breaking,
                     v.num_deprecated as num_deprecated
                 ORDER BY v.name
-                """, start=start, end=end)
+                """, start=start, end=end, tool=self.tool)
             
             analysis = f"\n📊 KNOWLEDGE GRAPH ANALYSIS:\n"
             analysis += f"Upgrade Path: {start} → {end}\n\n"
@@ -366,24 +312,29 @@ def analyze_changelogs(url1: str, url2: str, enable_kg: bool):
     st.markdown("---")
     st.subheader("📊 Analysis")
     
-    # Fetch
-    with st.spinner("📥 Fetching changelogs..."):
-        content1 = fetch_from_url(url1)
-        content2 = fetch_from_url(url2)
-        
-        if not content1 or not content2:
-            return None, None, None
-    
-    # Parse
-    with st.spinner("📝 Parsing versions..."):
-        versions1 = parse_changelog_flexible(content1)
-        versions2 = parse_changelog_flexible(content2)
+    # Fetch both changelogs concurrently, parsing each as soon as it arrives
+    with st.spinner("📥 Fetching and parsing changelogs..."):
+        urls = [to_raw_url(url1), to_raw_url(url2)]
+        results = fetch_and_parse(urls, parse_changelog_flexible, offline=offline_mode)
         
-        # Merge and deduplicate
+        for result in results:
+            if result.stage == "parse":
+                st.error(f"❌ Parse failed for {result.url}: {str(result.error)}")
+                return None, None, None
+            if not result.ok or not result.fetch.text:
+                st.error(f"❌ Fetch failed: {str(result.error or 'empty changelog')}")
+                return None, None, None
+            st.write(f"📥 Fetched: {result.url}")
+            if result.fetch.from_cache:
+                st.write(f"⚡ Served from cache ({result.fetch.source})")
+    
+    # Merge and deduplicate
+    with st.spinner("📝 Merging versions..."):
         all_versions = {}
-        for v in versions1 + versions2:
-            if v.version not in all_versions:
-                all_versions[v.version] = v
+        for result in results:
+            for v in result.parsed:
+                if v.version not in all_versions:
+                    all_versions[v.version] = v
         
         versions = list(all_versions.values())
         versions.sort(key=lambda x: tuple(map(int, x.version.split('.'))))
@@ -406,7 +357,7 @@ def analyze_changelogs(url1: str, url2: str, enable_kg: bool):
     kg = None
     if enable_kg:
         with st.spinner("🕸️ Building Knowledge Graph..."):
-            kg = KnowledgeGraph(neo4j_uri, neo4j_user, neo4j_pass)
+            kg = KnowledgeGraph(neo4j_uri, neo4j_user, neo4j_pass, urls)
             if kg.connected:
                 kg.create_graph(versions)
     
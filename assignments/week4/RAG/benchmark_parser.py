@@ -0,0 +1,176 @@
+"""
+Changelog Parser Benchmark
+
+Times the original list-based parse_changelog_flexible against the streaming
+parser (from a string and from a memory-mapped file) on a large synthetic
+Kubernetes-style changelog, checks that all three give identical results,
+and reports throughput and peak memory.
+
+    python benchmark_parser.py --versions 3000
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from changelog_parser import VersionData, parse_changelog_flexible, iter_changelog_file
+
+LINES = [
+    "- Fixed a bug where kubelet would restart pods on node reboot ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n}), [@dev](https://github.com/dev)) [SIG Node]",
+    "- Added `--max-pods` validation to kubeadm ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n})) [SIG Cluster Lifecycle]",
+    "- ACTION REQUIRED: the `batch/v1beta1` CronJob API is removed; this is a BREAKING change ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n}))",
+    "- The `PodSecurityPolicy` API is deprecated and will be removed in v1.25 ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n}))",
+    "- Dropped support for the legacy `--insecure-port` flag ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n}))",
+    "- Fixes CVE-2023-{n}: apiserver security vulnerability in aggregated discovery ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n}))",
+    "- Updated etcd client to v3.5.{m} ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n})) [SIG API Machinery]",
+    "- kube-proxy: improved iptables sync performance for large clusters ([#{n}](https://github.com/kubernetes/kubernetes/pull/{n}))",
+    "",
+    "  Courtesy of SIG Network, see the KEP for details.",
+]
+
+
+def make_changelog(num_versions: int, lines_per_version: int, seed: int = 0) -> str:
+    """Build a synthetic changelog in the layout of kubernetes/CHANGELOG/CHANGELOG-1.x.md"""
+    rng = random.Random(seed)
+    out = []
+    for i in range(num_versions):
+        out.append(f"# v1.{i // 100}.{i % 100}")
+        out.append("")
+        out.append("## Downloads for v1.{0}.{1}".format(i // 100, i % 100))
+        out.append("")
+        out.append("## Changelog since v1.{0}.{1}".format(i // 100, max(0, i % 100 - 1)))
+        out.append("")
+        for _ in range(lines_per_version):
+            out.append(rng.choice(LINES).format(n=rng.randint(100000, 130000), m=rng.randint(0, 20)))
+    return '\n'.join(out) + '\n'
+
+
+def parse_changelog_legacy(content: str) -> List[VersionData]:
+    """The original list-based parser, kept here as the baseline"""
+    if not content:
+        return []
+
+    versions = []
+    lines = content.split('\n')
+    current_version = None
+    current_content = []
+    current_breaking = []
+    current_deprecated = []
+    current_removed = []
+    current_security = []
+
+    for line in lines:
+        version_match = re.match(r'^#{1,4}\s*v?(\d+\.\d+\.\d+)', line, re.IGNORECASE)
+
+        if version_match:
+            if current_version and len(current_content) > 5:
+                versions.append(VersionData(
+                    version=current_version,
+                    content='\n'.join(current_content),
+                    breaking_changes=current_breaking[:],
+                    deprecations=current_deprecated[:],
+                    removals=current_removed[:],
+                    security_fixes=current_security[:]
+                ))
+
+            current_version = version_match.group(1)
+            current_content = [line]
+            current_breaking = []
+            current_deprecated = []
+            current_removed = []
+            current_security = []
+        else:
+            if current_version:
+                current_content.append(line)
+                line_lower = line.lower()
+
+                if any(pattern in line_lower for pattern in [
+                    'breaking', 'breaks', 'incompatible', 'removed api', 'removed feature'
+                ]):
+                    if line.strip() and not line.strip().startswith('#'):
+                        current_breaking.append(line.strip())
+
+                if any(pattern in line_lower for pattern in [
+                    'deprecat', 'will be removed', 'obsolete', 'legacy'
+                ]):
+                    if line.strip() and not line.strip().startswith('#'):
+                        current_deprecated.append(line.strip())
+
+                if any(pattern in line_lower for pattern in [
+                    'removed', 'deleted', 'dropped'
+                ]) and 'deprecat' not in line_lower:
+                    if line.strip() and not line.strip().startswith('#'):
+                        current_removed.append(line.strip())
+
+                if any(pattern in line_lower for pattern in [
+                    'cve-', 'security', 'vulnerability', 'exploit', 'patch'
+                ]):
+                    if line.strip() and not line.strip().startswith('#'):
+                        current_security.append(line.strip())
+
+    if current_version and len(current_content) > 5:
+        versions.append(VersionData(
+            version=current_version,
+            content='\n'.join(current_content),
+            breaking_changes=current_breaking,
+            deprecations=current_deprecated,
+            removals=current_removed,
+            security_fixes=current_security
+        ))
+
+    return versions
+
+
+def measure(label: str, parse, size_mb: float, repeat: int, lazy: bool = False) -> List[VersionData]:
+    """Best-of-repeat wall time and peak traced memory of one parser"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = list(parse())
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    if lazy:
+        # Consume one version at a time, as a caller that only aggregates counts would
+        count = sum(1 for _ in parse())
+    else:
+        count = len(parse())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"{label:<26} {best:>7.3f} s {size_mb / best:>7.1f} MB/s {peak / 1e6:>8.1f} MB peak  ({count} versions)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark changelog parsing")
+    parser.add_argument("--versions", type=int, default=3000, help="Number of version sections")
+    parser.add_argument("--lines", type=int, default=60, help="Change lines per version")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per parser (best is reported)")
+    args = parser.parse_args()
+
+    content = make_changelog(args.versions, args.lines)
+    size_mb = len(content.encode('utf-8')) / 1e6
+    print(f"Synthetic changelog: {size_mb:.1f} MB, {content.count(chr(10))} lines, {args.versions} versions\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "CHANGELOG.md")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        legacy = measure("Legacy (split + any())", lambda: parse_changelog_legacy(content), size_mb, args.repeat)
+        streaming = measure("Streaming (string)", lambda: parse_changelog_flexible(content), size_mb, args.repeat)
+        mapped = measure("Streaming (mmap, lazy)", lambda: iter_changelog_file(path), size_mb, args.repeat, lazy=True)
+
+    assert streaming == legacy, "streaming parser output differs from the legacy parser"
+    assert mapped == legacy, "mmap parser output differs from the legacy parser"
+    print("\nAll parsers produced identical VersionData")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Streaming changelog parser for the DevOps Upgrade Assistant
+
+Yields each version of a changelog as soon as its section ends, reading from
+a string, a text stream or a memory-mapped file, so multi-megabyte Kubernetes
+CHANGELOG files are never split into one big list of lines. Version headers
+are located with one precompiled regex, and each section is classified with
+one substring scan per keyword over the whole section instead of per-line
+keyword checks.
+"""
+
+import mmap
+import re
+from typing import List, Iterable, Iterator, Tuple
+from dataclasses import dataclass
+
+
+@dataclass
+class VersionData:
+    version: str
+    content: str
+    breaking_changes: List[str]
+    deprecations: List[str]
+    removals: List[str]
+    security_fixes: List[str]
+
+
+# Match version headers: # v1.24.0, ## v1.24.0, ### 1.24.0, etc.
+VERSION_RE = re.compile(r'^#{1,4}\s*v?(\d+\.\d+\.\d+)', re.IGNORECASE)
+
+# The same header anywhere in a text, without crossing into the next line
+_HEADER_RE = re.compile(r'^#{1,4}[^\S\n]*v?(\d+\.\d+\.\d+)', re.IGNORECASE | re.MULTILINE)
+
+# Keywords per category, matched as lowercase substrings of a line
+KEYWORDS = {
+    'breaking': ['breaking', 'breaks', 'incompatible', 'removed api', 'removed feature'],
+    'deprecation': ['deprecat', 'will be removed', 'obsolete', 'legacy'],
+    'removal': ['removed', 'deleted', 'dropped'],
+    'security': ['cve-', 'security', 'vulnerability', 'exploit', 'patch'],
+}
+
+CATEGORIES = list(KEYWORDS)
+
+_REMOVAL = 1 << CATEGORIES.index('removal')
+_DEPRECAT = 1 << len(CATEGORIES)  # marks lines containing 'deprecat' itself
+
+# (keyword, bitmask) pairs scanned over every section
+_KEYWORD_BITS = [
+    (keyword, 1 << bit | (_DEPRECAT if keyword == 'deprecat' else 0))
+    for bit, category in enumerate(CATEGORIES)
+    for keyword in KEYWORDS[category]
+]
+
+# Sections with more lines than this are kept
+MIN_SECTION_LINES = 5
+
+
+def _resolve(mask: int) -> int:
+    # A deprecation notice that mentions removal is not a removal yet
+    if mask & _REMOVAL and mask & _DEPRECAT:
+        mask &= ~_REMOVAL
+    return mask
+
+
+def _line_mask(line_lower: str) -> int:
+    mask = 0
+    for keyword, bits in _KEYWORD_BITS:
+        if keyword in line_lower:
+            mask |= bits
+    return _resolve(mask)
+
+
+def classify_line(line: str) -> List[str]:
+    """Return the change categories a changelog line belongs to"""
+    mask = _line_mask(line.lower())
+    return [category for bit, category in enumerate(CATEGORIES) if mask & (1 << bit)]
+
+
+def _section_masks(content: str) -> Iterator[Tuple[str, int]]:
+    """Yield (line, mask) for the lines of a section that hit a keyword, in order"""
+    content_lower = content.lower()
+    header_end = content.find('\n')
+    if header_end < 0:
+        return
+
+    if len(content_lower) != len(content):
+        # Lowercasing changed some lengths (rare Unicode), so offsets don't line up
+        for line in content[header_end + 1:].split('\n'):
+            mask = _line_mask(line.lower())
+            if mask:
+                yield line, mask
+        return
+
+    # Each keyword is found with one C-level substring search per hit line,
+    # skipping to the end of the line after a hit
+    hits = {}
+    for keyword, bits in _KEYWORD_BITS:
+        pos = content_lower.find(keyword, header_end)
+        while pos >= 0:
+            start = content_lower.rfind('\n', 0, pos) + 1
+            end = content_lower.find('\n', pos)
+            if end < 0:
+                end = len(content)
+            hits[start] = (hits[start][0] | bits, end) if start in hits else (bits, end)
+            pos = content_lower.find(keyword, end)
+
+    for start in sorted(hits):
+        mask, end = hits[start]
+        yield content[start:end], _resolve(mask)
+
+
+def _build_version(version: str, content: str) -> VersionData:
+    """Classify a finished version section (header line first)"""
+    sections = [[] for _ in CATEGORIES]
+    for line, mask in _section_masks(content):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        for bit, section in enumerate(sections):
+            if mask & (1 << bit):
+                section.append(stripped)
+
+    return VersionData(
+        version=version,
+        content=content,
+        breaking_changes=sections[0],
+        deprecations=sections[1],
+        removals=sections[2],
+        security_fixes=sections[3]
+    )
+
+
+def iter_changelog_string(content: str) -> Iterator[VersionData]:
+    """
+    Parse a changelog held in memory, one version at a time
+
+    Sections are sliced between version headers without splitting the text
+    into lines.
+
+    Args:
+        content: Changelog markdown
+
+    Yields:
+        VersionData for every version section with more than 5 lines
+    """
+    if not content:
+        return
+
+    previous = None
+    for match in _HEADER_RE.finditer(content):
+        if previous is not None:
+            section = content[previous.start():match.start() - 1]
+            if section.count('\n') + 1 > MIN_SECTION_LINES:
+                yield _build_version(previous.group(1), section)
+        previous = match
+
+    if previous is not None:
+        section = content[previous.start():]
+        if section.count('\n') + 1 > MIN_SECTION_LINES:
+            yield _build_version(previous.group(1), section)
+
+
+def iter_changelog_versions(stream: Iterable[str]) -> Iterator[VersionData]:
+    """
+    Parse ANY Kubernetes changelog format from a text stream, one version at a time
+
+    Lines are split on '\\n' only, as str.split('\\n') would.
+
+    Args:
+        stream: Text stream or other iterable of lines (e.g. an open file or io.StringIO)
+
+    Yields:
+        VersionData for every version section with more than 5 lines
+    """
+    current_version = None
+    current_content = []
+    ended_with_newline = True
+
+    def finish():
+        if current_version and len(current_content) > MIN_SECTION_LINES:
+            return _build_version(current_version, '\n'.join(current_content))
+        return None
+
+    for line in stream:
+        ended_with_newline = line.endswith('\n')
+        if ended_with_newline:
+            line = line[:-1]
+
+        version_match = VERSION_RE.match(line) if line.startswith('#') else None
+        if version_match:
+            version = finish()
+            if version:
+                yield version
+            current_version = version_match.group(1)
+            current_content = [line]
+        elif current_version:
+            current_content.append(line)
+
+    if ended_with_newline and current_version:
+        current_content.append('')
+
+    version = finish()
+    if version:
+        yield version
+
+
+def _hash_line_starts(mapped: mmap.mmap) -> Iterator[int]:
+    """Offsets of the lines that start with '#'"""
+    if mapped[:1] == b'#':
+        yield 0
+    pos = mapped.find(b'\n#')
+    while pos >= 0:
+        yield pos + 1
+        pos = mapped.find(b'\n#', pos + 1)
+
+
+def iter_changelog_file(path: str, encoding: str = 'utf-8') -> Iterator[VersionData]:
+    """
+    Parse a changelog file through a read-only memory map
+
+    Only lines starting with '#' are decoded to look for version headers,
+    then each section is decoded once as it is yielded. The encoding must
+    be ASCII-compatible (UTF-8, Latin-1, ...).
+
+    Args:
+        path: Path of the changelog file
+        encoding: Text encoding of the file
+
+    Yields:
+        VersionData as in iter_changelog_string
+    """
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            previous = None  # (offset, version) of the open section
+
+            def section(start: int, end: int) -> Iterator[VersionData]:
+                content = mapped[start:end].decode(encoding, errors='replace')
+                if content.count('\n') + 1 > MIN_SECTION_LINES:
+                    yield _build_version(previous[1], content)
+
+            for start in _hash_line_starts(mapped):
+                end = mapped.find(b'\n', start)
+                line = mapped[start:end if end >= 0 else size].decode(encoding, errors='replace')
+                version_match = VERSION_RE.match(line)
+                if version_match:
+                    if previous is not None:
+                        yield from section(previous[0], start - 1)
+                    previous = (start, version_match.group(1))
+
+            if previous is not None:
+                yield from section(previous[0], size)
+
+
+def parse_changelog_flexible(content: str) -> List[VersionData]:
+    """Parse ANY Kubernetes changelog format"""
+    return list(iter_changelog_string(content))
@@ -7,13 +7,13 @@ Complete DevOps Upgrade Assistant with Hybrid RAG
 """
 
 import streamlit as st
-import requests
-import re
 import os
+import sys
+import time
+import uuid
+import hashlib
 import shutil
 from typing import List, Dict, Tuple, Set
-from dataclasses import dataclass
-from enum import Enum
 
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
@@ -25,31 +25,14 @@ from langchain.chains import LLMChain
 from neo4j import GraphDatabase
 from chromadb.config import Settings
 
-# -------------------------------------------------
-# Data Models
-# -------------------------------------------------
-class ChangeType(Enum):
-    BREAKING = "breaking"
-    DEPRECATION = "deprecation"
-    REMOVAL = "removal"
-    SECURITY = "security"
-    FEATURE = "feature"
-    BUG_FIX = "bug_fix"
-    BEHAVIOR = "behavior_change"
-
-@dataclass
-class Change:
-    version: str
-    type: ChangeType
-    description: str
-    component: str = ""
-    action_required: str = ""
-
-@dataclass
-class VersionInfo:
-    version: str
-    changes: List[Change]
-    raw_content: str
+# Shared fetch layer lives in assignments/shared
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared import fetch_and_parse
+
+from k8s_changelog import (
+    ChangeType, Change, VersionInfo,
+    k8s_changelog_urls, parse_k8s_changelog
+)
 
 # -------------------------------------------------
 # Page Config
@@ -127,143 +110,6 @@ def normalize_version(v: str) -> str:
     v = v.strip()
     return v[1:] if v.startswith('v') else v
 
-def fetch_k8s_changelog(version: str) -> Tuple[str, str]:
-    parts = version.split('.')
-    if len(parts) >= 2:
-        major_minor = f"{parts[0]}.{parts[1]}"
-        url = f"https://raw.githubusercontent.com/kubernetes/kubernetes/master/CHANGELOG/CHANGELOG-{major_minor}.md"
-        try:
-            resp = requests.get(url, timeout=15)
-            if resp.status_code == 200:
-                return resp.text, url
-        except:
-            pass
-    return None, None
-
-def extract_changes_from_content(content: str, version: str) -> List[Change]:
-    """Extract all types of changes from changelog content"""
-    changes = []
-    lines = content.split('\n')
-    
-    # Patterns for different change types
-    patterns = {
-        ChangeType.BREAKING: [
-            r'(?i)\bbreaking\b.*?change',
-            r'(?i)\bremoved?.*?(api|feature|support)',
-            r'(?i)\bmust\b.*?(update|change|migrate)',
-            r'(?i)\bno longer\b',
-        ],
-        ChangeType.DEPRECATION: [
-            r'(?i)\bdeprecat(ed|ion|ing)\b',
-            r'(?i)\bwill be removed\b',
-            r'(?i)\blegacy\b',
-        ],
-        ChangeType.REMOVAL: [
-            r'(?i)\bremoved?\b',
-            r'(?i)\bdeleted?\b',
-            r'(?i)\bdropped?\b',
-        ],
-        ChangeType.SECURITY: [
-            r'(?i)\bsecurity\b',
-            r'(?i)\bcve-\d{4}-\d+',
-            r'(?i)\bvulnerability\b',
-            r'(?i)\bpatch(es|ed)?\b.*?security',
-        ],
-        ChangeType.FEATURE: [
-            r'(?i)\bnew feature\b',
-            r'(?i)\badded?\b',
-            r'(?i)\bintroduced?\b',
-            r'(?i)\bga\b',  # General Availability
-        ]
-    }
-    
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        
-        # Skip empty or header lines
-        if not line.strip() or line.startswith('#'):
-            continue
-        
-        # Check each pattern
-        for change_type, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                if re.search(pattern, line_lower):
-                    # Extract component (API name, feature name, etc.)
-                    component = extract_component(line)
-                    
-                    # Get context (surrounding lines)
-                    context_lines = lines[max(0, i-1):min(len(lines), i+3)]
-                    description = '\n'.join(context_lines).strip()
-                    
-                    changes.append(Change(
-                        version=version,
-                        type=change_type,
-                        description=line.strip(),
-                        component=component
-                    ))
-                    break
-    
-    return changes
-
-def extract_component(text: str) -> str:
-    """Extract component/API/feature name from text"""
-    # Match patterns like: APIName, feature-name, api/version
-    patterns = [
-        r'\b([A-Z][a-zA-Z]+(?:API|Policy|Controller|Manager))\b',
-        r'\b(batch/v\w+|apps/v\w+|core/v\w+)\b',
-        r'\b([a-z]+-[a-z]+)\b',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(1)
-    return ""
-
-def parse_k8s_changelog(content: str) -> List[VersionInfo]:
-    """Parse Kubernetes changelog with detailed extraction"""
-    if not content:
-        return []
-    
-    versions = []
-    lines = content.split('\n')
-    current_version = None
-    current_content = []
-    
-    for line in lines:
-        # Version header
-        match = re.match(r'^#{1,2}\s+v?(\d+\.\d+\.\d+)', line)
-        if match:
-            # Save previous
-            if current_version and current_content:
-                text = '\n'.join(current_content)
-                if len(text.strip()) > 100:
-                    changes = extract_changes_from_content(text, current_version)
-                    versions.append(VersionInfo(
-                        version=current_version,
-                        changes=changes,
-                        raw_content=text
-                    ))
-            
-            current_version = match.group(1)
-            current_content = [line]
-        else:
-            if current_version:
-                current_content.append(line)
-    
-    # Last version
-    if current_version and current_content:
-        text = '\n'.join(current_content)
-        if len(text.strip()) > 100:
-            changes = extract_changes_from_content(text, current_version)
-            versions.append(VersionInfo(
-                version=current_version,
-                changes=changes,
-                raw_content=text
-            ))
-    
-    return versions
-
 def filter_versions(versions: List[VersionInfo], start: str, end: str) -> List[VersionInfo]:
     def to_tuple(v):
         try:
@@ -280,6 +126,15 @@ def filter_versions(versions: List[VersionInfo], start: str, end: str) -> List[V
 # Knowledge Graph (Neo4j)
 # -------------------------------------------------
 class UpgradeKnowledgeGraph:
+    # Rows sent per UNWIND transaction
+    BATCH_SIZE = 1000
+    
+    CONSTRAINTS = [
+        "CREATE CONSTRAINT tool_name IF NOT EXISTS FOR (t:Tool) REQUIRE t.name IS UNIQUE",
+        "CREATE CONSTRAINT version_key IF NOT EXISTS FOR (v:Version) REQUIRE (v.name, v.tool) IS UNIQUE",
+        "CREATE CONSTRAINT change_key IF NOT EXISTS FOR (c:Change) REQUIRE c.key IS UNIQUE",
+    ]
+    
     def __init__(self, uri, user, password):
         self.connected = False
         try:
@@ -289,78 +144,144 @@ class UpgradeKnowledgeGraph:
             self.connected = True
         except:
             self.driver = None
-    
-    def create_upgrade_graph(self, tool: str, versions: List[VersionInfo]):
-        if not self.connected:
             return
         
+        # Each constraint also creates the index its MERGE lookups use
+        try:
+            with self.driver.session() as session:
+                for constraint in self.CONSTRAINTS:
+                    session.run(constraint).consume()
+        except Exception as e:
+            st.sidebar.warning(f"⚠️ Neo4j constraints: {str(e)[:50]}")
+    
+    @staticmethod
+    def change_key(tool: str, change: Change) -> str:
+        """Content hash identifying a change node"""
+        content = "\x1f".join([tool, change.version, change.type.value, change.description[:200], change.component])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    def _write_batches(self, session, query: str, rows: List[Dict], **params) -> None:
+        """Run an UNWIND query over rows, one transaction per batch"""
+        for i in range(0, len(rows), self.BATCH_SIZE):
+            batch = rows[i:i + self.BATCH_SIZE]
+            session.execute_write(lambda tx: tx.run(query, rows=batch, **params).consume())
+    
+    def create_upgrade_graph(self, tool: str, versions: List[VersionInfo]) -> Dict:
+        """
+        Load versions and their changes for one tool in batched transactions.
+        
+        Nodes are MERGEd on their keys and stamped with a build id; whatever
+        this tool's previous build left behind is swept afterwards, so other
+        tools' graphs are untouched.
+        
+        Returns:
+            Dictionary with row counts, elapsed seconds and rows_per_second
+        """
+        if not self.connected:
+            return {}
+        
+        start_time = time.time()
+        build = uuid.uuid4().hex
+        sorted_versions = sorted(versions, key=lambda v: tuple(map(int, v.version.split('.'))))
+        
+        version_rows = []
+        change_rows = {}
+        for v_info in sorted_versions:
+            types = {c.type for c in v_info.changes}
+            version_rows.append({
+                'name': v_info.version,
+                'has_breaking': ChangeType.BREAKING in types,
+                'has_deprecations': ChangeType.DEPRECATION in types,
+                'has_removals': ChangeType.REMOVAL in types,
+                'has_security': ChangeType.SECURITY in types,
+                'num_changes': len(v_info.changes)
+            })
+            for change in v_info.changes:
+                key = self.change_key(tool, change)
+                change_rows[key] = {
+                    'key': key,
+                    'description': change.description[:200],
+                    'type': change.type.value,
+                    'version': v_info.version,
+                    'component': change.component
+                }
+        change_rows = list(change_rows.values())
+        edge_rows = [
+            {'v1': v1['name'], 'v2': v2['name']}
+            for v1, v2 in zip(version_rows, version_rows[1:])
+        ]
+        
         with self.driver.session() as session:
-            # Clear old data
-            session.run("MATCH (n) DETACH DELETE n")
+            # Create tool node; the version chain is rebuilt from scratch
+            session.execute_write(lambda tx: tx.run("MERGE (t:Tool {name: $tool})", tool=tool).consume())
+            session.execute_write(lambda tx: tx.run("""
+                MATCH (:Version {tool: $tool})-[r:PRECEDES]->(:Version {tool: $tool})
+                DELETE r
+                """, tool=tool).consume())
             
-            # Create tool node
-            session.run("MERGE (t:Tool {name: $tool})", tool=tool)
+            # Create version nodes with metadata, linked to the tool
+            self._write_batches(session, """
+                UNWIND $rows AS row
+                MERGE (v:Version {name: row.name, tool: $tool})
+                SET v.has_breaking = row.has_breaking,
+                    v.has_deprecations = row.has_deprecations,
+                    v.has_removals = row.has_removals,
+                    v.has_security = row.has_security,
+                    v.num_changes = row.num_changes,
+                    v.build = $build
+                WITH v
+                MATCH (t:Tool {name: $tool})
+                MERGE (t)-[:HAS_VERSION]->(v)
+                """, version_rows, tool=tool, build=build)
             
-            # Create version nodes with metadata
-            for v_info in versions:
-                has_breaking = any(c.type == ChangeType.BREAKING for c in v_info.changes)
-                has_deprecated = any(c.type == ChangeType.DEPRECATION for c in v_info.changes)
-                has_removed = any(c.type == ChangeType.REMOVAL for c in v_info.changes)
-                has_security = any(c.type == ChangeType.SECURITY for c in v_info.changes)
-                
-                session.run("""
-                    MERGE (v:Version {name: $version, tool: $tool})
-                    SET v.has_breaking = $breaking,
-                        v.has_deprecations = $deprecated,
-                        v.has_removals = $removed,
-                        v.has_security = $security,
-                        v.num_changes = $num_changes
-                    """, 
-                    version=v_info.version, tool=tool,
-                    breaking=has_breaking, deprecated=has_deprecated,
-                    removed=has_removed, security=has_security,
-                    num_changes=len(v_info.changes)
-                )
-                
-                # Link to tool
-                session.run("""
-                    MATCH (t:Tool {name: $tool})
-                    MATCH (v:Version {name: $version, tool: $tool})
-                    MERGE (t)-[:HAS_VERSION]->(v)
-                    """, tool=tool, version=v_info.version)
-                
-                # Create change nodes
-                for change in v_info.changes:
-                    session.run("""
-                        MERGE (c:Change {
-                            description: $desc,
-                            type: $type,
-                            version: $version,
-                            component: $component
-                        })
-                        WITH c
-                        MATCH (v:Version {name: $version, tool: $tool})
-                        MERGE (v)-[:HAS_CHANGE]->(c)
-                        """,
-                        desc=change.description[:200],
-                        type=change.type.value,
-                        version=v_info.version,
-                        component=change.component,
-                        tool=tool
-                    )
+            # Create change nodes, keyed by content hash
+            self._write_batches(session, """
+                UNWIND $rows AS row
+                MERGE (c:Change {key: row.key})
+                SET c.description = row.description,
+                    c.type = row.type,
+                    c.version = row.version,
+                    c.component = row.component,
+                    c.tool = $tool,
+                    c.build = $build
+                WITH c, row
+                MATCH (v:Version {name: row.version, tool: $tool})
+                MERGE (v)-[:HAS_CHANGE]->(c)
+                """, change_rows, tool=tool, build=build)
             
             # Create version sequence
-            sorted_versions = sorted(versions, key=lambda v: tuple(map(int, v.version.split('.'))))
-            for i in range(len(sorted_versions) - 1):
-                session.run("""
-                    MATCH (v1:Version {name: $v1, tool: $tool})
-                    MATCH (v2:Version {name: $v2, tool: $tool})
-                    MERGE (v1)-[:PRECEDES]->(v2)
-                    """,
-                    v1=sorted_versions[i].version,
-                    v2=sorted_versions[i+1].version,
-                    tool=tool
-                )
+            self._write_batches(session, """
+                UNWIND $rows AS row
+                MATCH (v1:Version {name: row.v1, tool: $tool})
+                MATCH (v2:Version {name: row.v2, tool: $tool})
+                MERGE (v1)-[:PRECEDES]->(v2)
+                """, edge_rows, tool=tool)
+            
+            # Clear what earlier builds of this tool left behind (plus unkeyed
+            # changes from older versions of this loader), in batches. Only
+            # nodes stamped with a build id came from here; versions other
+            # writers keep under the same tool value are never swept
+            sweeps = [
+                "MATCH (n:Change {tool: $tool}) WHERE n.build <> $build",
+                "MATCH (n:Version {tool: $tool}) WHERE n.build <> $build",
+                "MATCH (n:Change) WHERE n.key IS NULL",
+            ]
+            for match in sweeps:
+                session.run(
+                    f"{match} CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {self.BATCH_SIZE} ROWS",
+                    tool=tool, build=build
+                ).consume()
+        
+        elapsed = time.time() - start_time
+        rows = len(version_rows) + len(change_rows) + len(edge_rows)
+        return {
+            'versions': len(version_rows),
+            'changes': len(change_rows),
+            'edges': len(edge_rows),
+            'rows': rows,
+            'seconds': elapsed,
+            'rows_per_second': rows / elapsed if elapsed > 0 else 0.0
+        }
     
     def get_upgrade_path_analysis(self, current: str, target: str, tool: str) -> Dict:
         if not self.connected:
@@ -486,26 +407,25 @@ def comprehensive_analysis(tool: str, current: str, target: str):
     with col3:
         st.metric("Method", "Hybrid RAG" if kg and kg.connected else "Vector Only")
     
-    # Fetch changelogs
+    # Fetch every changelog in the span concurrently, parsing each as it arrives
     with st.spinner("🌐 Fetching changelogs..."):
         all_versions = []
         
         if tool == "Kubernetes":
-            content1, _ = fetch_k8s_changelog(current)
-            if content1:
-                st.success(f"✅ Fetched {current} changelog")
-                versions1 = parse_k8s_changelog(content1)
-                all_versions.extend(versions1)
-            
-            content2, _ = fetch_k8s_changelog(target)
-            if content2 and content2 != content1:
-                st.success(f"✅ Fetched {target} changelog")
-                versions2 = parse_k8s_changelog(content2)
-                all_versions.extend(versions2)
+            results = fetch_and_parse(k8s_changelog_urls(current, target), parse_k8s_changelog, timeout=15)
+            for result in results:
+                name = result.url.rsplit('/', 1)[-1]
+                if result.ok and result.parsed:
+                    source = " (cached)" if result.fetch.from_cache else ""
+                    st.success(f"✅ Fetched {name}{source}")
+                    all_versions.extend(result.parsed)
+                elif debug:
+                    reason = f"{result.stage} failed: {result.error}" if result.error else "no versions"
+                    st.warning(f"⚠️ Skipped {name}: {reason}")
     
     if not all_versions:
         st.error("❌ Failed to fetch changelog data")
-        return None, []
+        return None, [], []
     
     # Remove duplicates
     seen = set()
@@ -552,8 +472,11 @@ def comprehensive_analysis(tool: str, current: str, target: str):
     # Build Knowledge Graph
     if kg and kg.connected:
         with st.spinner("🕸️ Building Knowledge Graph..."):
-            kg.create_upgrade_graph(tool, filtered)
-            st.success("✅ Knowledge Graph created")
+            stats = kg.create_upgrade_graph(tool, filtered)
+            st.success(
+                f"✅ Knowledge Graph created: {stats['versions']} versions, {stats['changes']} changes "
+                f"in {stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} rows/s)"
+            )
     
     # Build Vector Database
     with st.spinner("🗄️ Building Vector Database..."):
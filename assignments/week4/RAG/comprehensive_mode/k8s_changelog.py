@@ -0,0 +1,192 @@
+"""
+Kubernetes changelog parsing for the comprehensive upgrade assistant
+
+Kept out of devops_comprehensive.py so the parser can run in worker
+processes without re-running the Streamlit script.
+"""
+
+import re
+from typing import List, Optional
+from dataclasses import dataclass
+from enum import Enum
+
+CHANGELOG_URL = "https://raw.githubusercontent.com/kubernetes/kubernetes/master/CHANGELOG/CHANGELOG-{}.md"
+
+# -------------------------------------------------
+# Data Models
+# -------------------------------------------------
+class ChangeType(Enum):
+    BREAKING = "breaking"
+    DEPRECATION = "deprecation"
+    REMOVAL = "removal"
+    SECURITY = "security"
+    FEATURE = "feature"
+    BUG_FIX = "bug_fix"
+    BEHAVIOR = "behavior_change"
+
+@dataclass
+class Change:
+    version: str
+    type: ChangeType
+    description: str
+    component: str = ""
+    action_required: str = ""
+
+@dataclass
+class VersionInfo:
+    version: str
+    changes: List[Change]
+    raw_content: str
+
+# -------------------------------------------------
+# Changelog Files
+# -------------------------------------------------
+def k8s_changelog_url(version: str) -> Optional[str]:
+    """CHANGELOG file URL for the minor release of a version"""
+    parts = version.split('.')
+    if len(parts) >= 2:
+        return CHANGELOG_URL.format(f"{parts[0]}.{parts[1]}")
+    return None
+
+def k8s_changelog_urls(current: str, target: str) -> List[str]:
+    """CHANGELOG file URLs for every minor release from current to target"""
+    try:
+        start = tuple(map(int, current.split('.')[:2]))
+        end = tuple(map(int, target.split('.')[:2]))
+    except ValueError:
+        start = end = None
+    
+    if start is None or len(start) < 2 or len(end) < 2 or start[0] != end[0]:
+        # Unparsable or across a major release: just the two endpoint files
+        urls = [k8s_changelog_url(current), k8s_changelog_url(target)]
+        return list(dict.fromkeys(url for url in urls if url))
+    
+    low, high = sorted((start[1], end[1]))
+    return [CHANGELOG_URL.format(f"{start[0]}.{minor}") for minor in range(low, high + 1)]
+
+# -------------------------------------------------
+# Parsing
+# -------------------------------------------------
+def extract_changes_from_content(content: str, version: str) -> List[Change]:
+    """Extract all types of changes from changelog content"""
+    changes = []
+    lines = content.split('\n')
+    
+    # Patterns for different change types
+    patterns = {
+        ChangeType.BREAKING: [
+            r'(?i)\bbreaking\b.*?change',
+            r'(?i)\bremoved?.*?(api|feature|support)',
+            r'(?i)\bmust\b.*?(update|change|migrate)',
+            r'(?i)\bno longer\b',
+        ],
+        ChangeType.DEPRECATION: [
+            r'(?i)\bdeprecat(ed|ion|ing)\b',
+            r'(?i)\bwill be removed\b',
+            r'(?i)\blegacy\b',
+        ],
+        ChangeType.REMOVAL: [
+            r'(?i)\bremoved?\b',
+            r'(?i)\bdeleted?\b',
+            r'(?i)\bdropped?\b',
+        ],
+        ChangeType.SECURITY: [
+            r'(?i)\bsecurity\b',
+            r'(?i)\bcve-\d{4}-\d+',
+            r'(?i)\bvulnerability\b',
+            r'(?i)\bpatch(es|ed)?\b.*?security',
+        ],
+        ChangeType.FEATURE: [
+            r'(?i)\bnew feature\b',
+            r'(?i)\badded?\b',
+            r'(?i)\bintroduced?\b',
+            r'(?i)\bga\b',  # General Availability
+        ]
+    }
+    
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        
+        # Skip empty or header lines
+        if not line.strip() or line.startswith('#'):
+            continue
+        
+        # Check each pattern
+        for change_type, pattern_list in patterns.items():
+            for pattern in pattern_list:
+                if re.search(pattern, line_lower):
+                    # Extract component (API name, feature name, etc.)
+                    component = extract_component(line)
+                    
+                    # Get context (surrounding lines)
+                    context_lines = lines[max(0, i-1):min(len(lines), i+3)]
+                    description = '\n'.join(context_lines).strip()
+                    
+                    changes.append(Change(
+                        version=version,
+                        type=change_type,
+                        description=line.strip(),
+                        component=component
+                    ))
+                    break
+    
+    return changes
+
+def extract_component(text: str) -> str:
+    """Extract component/API/feature name from text"""
+    # Match patterns like: APIName, feature-name, api/version
+    patterns = [
+        r'\b([A-Z][a-zA-Z]+(?:API|Policy|Controller|Manager))\b',
+        r'\b(batch/v\w+|apps/v\w+|core/v\w+)\b',
+        r'\b([a-z]+-[a-z]+)\b',
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(1)
+    return ""
+
+def parse_k8s_changelog(content: str) -> List[VersionInfo]:
+    """Parse Kubernetes changelog with detailed extraction"""
+    if not content:
+        return []
+    
+    versions = []
+    lines = content.split('\n')
+    current_version = None
+    current_content = []
+    
+    for line in lines:
+        # Version header
+        match = re.match(r'^#{1,2}\s+v?(\d+\.\d+\.\d+)', line)
+        if match:
+            # Save previous
+            if current_version and current_content:
+                text = '\n'.join(current_content)
+                if len(text.strip()) > 100:
+                    changes = extract_changes_from_content(text, current_version)
+                    versions.append(VersionInfo(
+                        version=current_version,
+                        changes=changes,
+                        raw_content=text
+                    ))
+            
+            current_version = match.group(1)
+            current_content = [line]
+        else:
+            if current_version:
+                current_content.append(line)
+    
+    # Last version
+    if current_version and current_content:
+        text = '\n'.join(current_content)
+        if len(text.strip()) > 100:
+            changes = extract_changes_from_content(text, current_version)
+            versions.append(VersionInfo(
+                version=current_version,
+                changes=changes,
+                raw_content=text
+            ))
+    
+    return versions
@@ -0,0 +1,258 @@
+"""Semantic answer cache shared by the Traditional RAG and Knowledge Graph RAG systems."""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    text = re.sub(r"\s+", " ", question.strip().lower())
+    return text.rstrip("?!. ")
+
+
+class SemanticAnswerCache:
+    """
+    Cache of generated answers, looked up by question.
+
+    A question hits when its normalized text matches a cached question
+    exactly or, given an embeddings object, when the cosine similarity of
+    their embeddings reaches similarity_threshold. Entries expire after ttl
+    seconds and the least recently used entries are evicted beyond
+    max_entries per namespace.
+
+    Entries live in their own table of the SQLite file, alongside the LLM
+    cache in llm_cache/cache.db. Each system uses its own namespace and
+    invalidates it when its index or graph is rebuilt.
+    """
+
+    EMBEDDING_MEMO_SIZE = 256  # recent question embeddings kept between get() and put()
+
+    def __init__(self, embeddings=None, db_path: str = "llm_cache/cache.db",
+                 similarity_threshold: float = 0.95, ttl: Optional[float] = 24 * 3600,
+                 max_entries: int = 1000):
+        """
+        Open (or create) the answer cache.
+
+        Args:
+            embeddings: LangChain embeddings for similarity lookups (None for exact matches only)
+            db_path: SQLite file holding the cache table
+            similarity_threshold: Minimum cosine similarity for a near-duplicate hit
+            ttl: Seconds an answer stays valid (None for no expiry)
+            max_entries: Maximum cached answers per namespace
+        """
+        self.embeddings = embeddings
+        self.db_path = db_path
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0}
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answer_cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                question TEXT NOT NULL,
+                vector BLOB,
+                result TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.commit()
+
+        # Per-namespace (keys, unit-vector matrix) for similarity search
+        self._matrices: Dict[str, Tuple[list, Optional[np.ndarray]]] = {}
+        self._memo: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def _key(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _embed(self, normalized: str) -> np.ndarray:
+        """Unit-length embedding of a normalized question (call without holding the lock)."""
+        with self._lock:
+            vector = self._memo.get(normalized)
+        if vector is not None:
+            return vector
+
+        vector = np.asarray(self.embeddings.embed_query(normalized), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+
+        with self._lock:
+            self._memo[normalized] = vector
+            while len(self._memo) > self.EMBEDDING_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return vector
+
+    def _matrix(self, namespace: str) -> Tuple[list, Optional[np.ndarray]]:
+        """Load (once) the embeddings of a namespace's cached questions."""
+        if namespace not in self._matrices:
+            rows = self._conn.execute(
+                "SELECT key, vector FROM answer_cache WHERE namespace = ? AND vector IS NOT NULL",
+                (namespace,)
+            ).fetchall()
+            keys = [key for key, _ in rows]
+            matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows]) if rows else None
+            self._matrices[namespace] = (keys, matrix)
+        return self._matrices[namespace]
+
+    def _select(self, namespace: str, key: str):
+        return self._conn.execute(
+            "SELECT question, result, created FROM answer_cache WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, namespace: str, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer.
+
+        Args:
+            namespace: Cache namespace of the calling system
+            question: User's question
+
+        Returns:
+            The cached result with 'similarity' and 'cached_question' added, or None
+        """
+        normalized = normalize_question(question)
+        key = self._key(normalized)
+        now = time.time()
+        similarity = 1.0
+
+        with self._lock:
+            row = self._select(namespace, key)
+
+        if row is None and self.embeddings is not None:
+            # Embed outside the lock; the embeddings call may hit the network
+            vector = self._embed(normalized)
+            with self._lock:
+                keys, matrix = self._matrix(namespace)
+                if matrix is not None:
+                    scores = matrix @ vector
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity_threshold:
+                        key = keys[best]
+                        similarity = float(scores[best])
+                        row = self._select(namespace, key)
+
+        with self._lock:
+            if row is None or self._expired(row[2], now):
+                if row is not None:
+                    self._delete(namespace, [key])
+                self.stats["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE answer_cache SET last_used = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key)
+            )
+            self._conn.commit()
+            self.stats["exact_hits" if similarity == 1.0 else "semantic_hits"] += 1
+
+        result = json.loads(row[1])
+        result["similarity"] = similarity
+        result["cached_question"] = row[0]
+        return result
+
+    def put(self, namespace: str, question: str, result: Dict[str, Any]) -> None:
+        """
+        Cache an answer.
+
+        Args:
+            namespace: Cache namespace of the calling system
+            question: User's question
+            result: JSON-serializable result to return on later hits
+        """
+        normalized = normalize_question(question)
+        key = self._key(normalized)
+        vector = self._embed(normalized) if self.embeddings is not None else None
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answer_cache "
+                "(namespace, key, question, vector, result, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (namespace, key, question, vector.tobytes() if vector is not None else None,
+                 json.dumps(result), now, now)
+            )
+
+            # Evict expired entries, then least recently used beyond max_entries
+            stale = []
+            if self.ttl is not None:
+                stale = [r[0] for r in self._conn.execute(
+                    "SELECT key FROM answer_cache WHERE namespace = ? AND created < ?",
+                    (namespace, now - self.ttl)
+                )]
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM answer_cache WHERE namespace = ?", (namespace,)
+            ).fetchone()[0] - len(stale)
+            if count > self.max_entries:
+                stale += [r[0] for r in self._conn.execute(
+                    "SELECT key FROM answer_cache WHERE namespace = ? ORDER BY last_used LIMIT ?",
+                    (namespace, count - self.max_entries)
+                )]
+            self._delete(namespace, sorted(set(stale)))
+
+            self._conn.commit()
+            self._matrices.pop(namespace, None)
+
+    def _delete(self, namespace: str, keys: list) -> None:
+        if not keys:
+            return
+        self._conn.executemany(
+            "DELETE FROM answer_cache WHERE namespace = ? AND key = ?",
+            [(namespace, key) for key in keys]
+        )
+        self._conn.commit()
+        self.stats["evictions"] += len(keys)
+        self._matrices.pop(namespace, None)
+
+    def invalidate(self, namespace: Optional[str] = None, keep: Optional[str] = None) -> None:
+        """
+        Drop cached answers, e.g. after the index or graph was rebuilt.
+
+        Args:
+            namespace: Namespace to clear, including its '<namespace>/...' sub-namespaces (None for all)
+            keep: A sub-namespace to leave in place (e.g. the current index version)
+        """
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM answer_cache")
+                self._matrices.clear()
+            else:
+                prefix = f"{namespace}/"
+                self._conn.execute(
+                    "DELETE FROM answer_cache WHERE (namespace = ? OR substr(namespace, 1, ?) = ?) "
+                    "AND namespace IS NOT ?",
+                    (namespace, len(prefix), prefix, keep)
+                )
+                for name in list(self._matrices):
+                    if (name == namespace or name.startswith(prefix)) and name != keep:
+                        del self._matrices[name]
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,93 @@
+"""
+Knowledge Graph Query Benchmark
+
+Measures query latency and throughput of KnowledgeGraphRAG with the old
+blocking generation call against the async path, sequentially and with
+aquery_many, using stub Graphiti and LLM clients (no API key or Neo4j needed).
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from knowledge_graph import KnowledgeGraphRAG
+from comparison.stubs import StubLLM, make_stub_kg_system
+
+console = Console()
+
+
+class BlockingLLM:
+    """Runs the stub's blocking invoke inside ainvoke, like the old generation path."""
+
+    def __init__(self, llm: StubLLM):
+        self.llm = llm
+
+    async def ainvoke(self, prompt):
+        return self.llm.invoke(prompt)
+
+
+async def measure(system: KnowledgeGraphRAG, questions, concurrency: int):
+    """Run all questions and return (wall time, per-query latencies)."""
+    start = time.perf_counter()
+    results = await system.aquery_many(questions, concurrency=concurrency)
+    wall = time.perf_counter() - start
+    latencies = np.array([r['metrics']['query_time'] for r in results])
+    return wall, latencies
+
+
+async def run(num_queries: int, concurrency: int, latency: float):
+    """Run the benchmark."""
+    questions = [f"How does endpoint /v1/resource{i} authenticate?" for i in range(num_queries)]
+
+    scenarios = [
+        ("Blocking invoke", BlockingLLM(StubLLM(latency)), concurrency),
+        ("Async, sequential", StubLLM(latency), 1),
+        ("Async, aquery_many", StubLLM(latency), concurrency),
+    ]
+
+    rows = []
+    for label, llm, level in scenarios:
+        wall, latencies = await measure(make_stub_kg_system(llm=llm), questions, level)
+        rows.append((label, level, wall, latencies))
+
+    table = Table(title=f"KG Query Benchmark ({num_queries} queries, {latency * 1000:.0f} ms generation)")
+    table.add_column("Mode")
+    table.add_column("Concurrency", justify="right")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("Queries/s", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+
+    for label, level, wall, latencies in rows:
+        table.add_row(
+            label,
+            str(level),
+            f"{wall:.2f}",
+            f"{len(latencies) / wall:.1f}",
+            f"{np.percentile(latencies, 50) * 1000:.0f}",
+            f"{np.percentile(latencies, 95) * 1000:.0f}"
+        )
+
+    console.print()
+    console.print(table)
+
+    speedup = rows[0][2] / rows[2][2]
+    console.print(f"\n[green]aquery_many vs blocking generation: {speedup:.1f}x throughput[/green]\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark knowledge graph queries")
+    parser.add_argument("--queries", type=int, default=40, help="Number of queries")
+    parser.add_argument("--concurrency", type=int, default=8, help="Queries in flight for aquery_many")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per generation call")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.queries, args.concurrency, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,14 @@
 
 from .compare import compare_systems, run_comparison_suite
 from .visualize import visualize_graph, plot_comparison_metrics
+from .graph_export import export_graph
+from .benchmark import run_benchmark
 
 __all__ = [
     'compare_systems',
     'run_comparison_suite',
     'visualize_graph',
-    'plot_comparison_metrics'
+    'plot_comparison_metrics',
+    'export_graph',
+    'run_benchmark'
 ]
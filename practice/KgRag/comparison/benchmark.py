@@ -0,0 +1,308 @@
+"""
+Latency benchmark harness for Traditional RAG vs Knowledge Graph RAG.
+
+Unlike compare_systems, which times one cold run per question, the
+benchmark discards warmup runs, repeats every question, and reports
+p50/p95/p99 per stage separately for cold answer caches (cleared before
+every run) and warm ones (primed once, then measured). Both phases use
+scratch answer caches in a temp directory, so the systems' own cached
+answers survive a benchmark run.
+
+Run offline with stub clients (no API key or Neo4j needed):
+
+    python -m comparison.benchmark --repetitions 5 --output benchmark_results.json --plot
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+console = Console()
+
+STAGES = ("query_time", "retrieval_time", "generation_time")
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summary statistics of latency samples.
+
+    Args:
+        samples: Latencies in seconds
+
+    Returns:
+        Dictionary with 'n', 'mean', 'min', 'max', 'p50', 'p95' and 'p99' keys
+    """
+    if not samples:
+        return {"n": 0, "mean": 0.0, "min": 0.0, "max": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    values = np.asarray(samples, dtype=float)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "n": int(values.size),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+    }
+
+
+# Answer cache namespace of each benchmarked system
+ANSWER_NAMESPACES = {"rag": "traditional_rag", "kg": "knowledge_graph"}
+
+
+@contextmanager
+def _scratch_answer_caches(rag_system, kg_system):
+    """
+    Point both systems at empty answer caches in a temp directory.
+
+    Cold runs clear the answer cache before every question; doing that on
+    the systems' own caches would throw away answers served in production.
+    Systems sharing one cache share one scratch copy. The original caches
+    are restored on exit.
+    """
+    from answer_cache import SemanticAnswerCache
+
+    systems = [system for system in (rag_system, kg_system)
+               if getattr(system, "answer_cache", None) is not None]
+    originals = {id(system): system.answer_cache for system in systems}
+
+    with tempfile.TemporaryDirectory(prefix="kgrag_benchmark_") as cache_dir:
+        scratch = {}
+        try:
+            for system in systems:
+                cache = system.answer_cache
+                if id(cache) not in scratch:
+                    scratch[id(cache)] = SemanticAnswerCache(
+                        cache.embeddings,
+                        db_path=os.path.join(cache_dir, f"cache_{len(scratch)}.db"),
+                        similarity_threshold=cache.similarity_threshold,
+                        ttl=cache.ttl,
+                        max_entries=cache.max_entries
+                    )
+                system.answer_cache = scratch[id(cache)]
+            yield
+        finally:
+            for system in systems:
+                system.answer_cache = originals[id(system)]
+            for cache in scratch.values():
+                cache.close()
+
+
+def _clear_answer_caches(rag_system, kg_system) -> None:
+    """Drop only the benchmarked systems' namespaces from their answer caches."""
+    for key, system in (("rag", rag_system), ("kg", kg_system)):
+        cache = getattr(system, "answer_cache", None)
+        if cache is not None:
+            cache.invalidate(ANSWER_NAMESPACES[key])
+
+
+async def _run_once(rag_system, kg_system, question: str):
+    """Query each system on its own, so neither run skews the other's timings."""
+    rag_result = await asyncio.to_thread(rag_system.query, question)
+    kg_result = await kg_system.query(question)
+    return rag_result, kg_result
+
+
+async def run_benchmark(
+    rag_system,
+    kg_system,
+    questions: List[str],
+    warmup: int = 1,
+    repetitions: int = 5,
+    output_file: str = None
+) -> Dict[str, Any]:
+    """
+    Benchmark both systems on a list of questions.
+
+    Args:
+        rag_system: TraditionalRAG instance
+        kg_system: KnowledgeGraphRAG instance
+        questions: Questions to benchmark
+        warmup: Unrecorded runs per question before measuring
+        repetitions: Recorded runs per question and cache phase
+        output_file: Optional path for the JSON report
+
+    Returns:
+        Report dictionary with 'config', 'summary' and 'results' keys.
+        'results' holds one entry per question in the compare_systems
+        format (cold-cache medians), so it can be passed straight to
+        plot_comparison_metrics.
+    """
+    console.print(f"\n[bold green]Benchmarking {len(questions)} questions[/bold green] "
+                  f"({warmup} warmup, {repetitions} repetitions per cache phase)\n")
+
+    samples = {
+        phase: {system: {stage: [] for stage in STAGES} for system in ("rag", "kg")}
+        for phase in ("cold", "warm")
+    }
+    per_question = {
+        question: {phase: {"rag": [], "kg": []} for phase in ("cold", "warm")}
+        for question in questions
+    }
+    last_results = {}
+
+    def record(phase: str, question: str, rag_result, kg_result) -> None:
+        for system, result in (("rag", rag_result), ("kg", kg_result)):
+            metrics = result['metrics']
+            for stage in STAGES:
+                samples[phase][system][stage].append(metrics.get(stage, 0.0))
+            per_question[question][phase][system].append(metrics['query_time'])
+
+    start_time = time.time()
+
+    with _scratch_answer_caches(rag_system, kg_system):
+        # Warmup: connections, imports and lazy initialization, not answer caches
+        for _ in range(warmup):
+            for question in questions:
+                _clear_answer_caches(rag_system, kg_system)
+                await _run_once(rag_system, kg_system, question)
+
+        # Cold: every run starts from an empty answer cache
+        for _ in range(repetitions):
+            for question in questions:
+                _clear_answer_caches(rag_system, kg_system)
+                rag_result, kg_result = await _run_once(rag_system, kg_system, question)
+                record("cold", question, rag_result, kg_result)
+                last_results[question] = (rag_result, kg_result)
+
+        # Warm: prime the caches once, then measure repeated questions
+        _clear_answer_caches(rag_system, kg_system)
+        for question in questions:
+            await _run_once(rag_system, kg_system, question)
+        for _ in range(repetitions):
+            for question in questions:
+                rag_result, kg_result = await _run_once(rag_system, kg_system, question)
+                record("warm", question, rag_result, kg_result)
+
+    results = []
+    for question in questions:
+        rag_result, kg_result = last_results[question]
+        cold, warm = per_question[question]["cold"], per_question[question]["warm"]
+        rag_time = float(np.median(cold["rag"]))
+        kg_time = float(np.median(cold["kg"]))
+        results.append({
+            "question": question,
+            "comparison_metrics": {
+                "speedup": rag_time / kg_time if kg_time > 0 else 0.0,
+                "rag_time": rag_time,
+                "kg_time": kg_time,
+                "rag_time_p95": float(np.percentile(cold["rag"], 95)),
+                "kg_time_p95": float(np.percentile(cold["kg"], 95)),
+                "rag_time_warm": float(np.median(warm["rag"])),
+                "kg_time_warm": float(np.median(warm["kg"])),
+                "rag_sources": rag_result['metrics']['num_source_chunks'],
+                "kg_facts": kg_result['metrics']['num_facts'],
+                "kg_entities": kg_result['metrics']['num_entities'],
+                "kg_relationships": kg_result['metrics']['num_relationships']
+            }
+        })
+
+    report = {
+        "config": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "num_questions": len(questions),
+            "warmup": warmup,
+            "repetitions": repetitions,
+            "answer_cache": {
+                "rag": getattr(rag_system, "answer_cache", None) is not None,
+                "kg": getattr(kg_system, "answer_cache", None) is not None
+            },
+            "duration": time.time() - start_time
+        },
+        "summary": {
+            phase: {
+                system: {stage: summarize(values) for stage, values in stages.items()}
+                for system, stages in systems.items()
+            }
+            for phase, systems in samples.items()
+        },
+        "results": results
+    }
+
+    display_benchmark(report)
+
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        console.print(f"\nBenchmark report saved to: {output_file}")
+
+    return report
+
+
+def display_benchmark(report: Dict[str, Any]) -> None:
+    """
+    Display per-stage latency percentiles from a benchmark report.
+
+    Args:
+        report: Report dictionary from run_benchmark
+    """
+    table = Table(title="Latency Percentiles (ms)", box=box.ROUNDED)
+    table.add_column("Cache", style="cyan")
+    table.add_column("System", style="cyan")
+    table.add_column("Stage", style="cyan")
+    table.add_column("n", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+
+    names = {"rag": "Traditional RAG", "kg": "Knowledge Graph RAG"}
+    for phase, systems in report["summary"].items():
+        for system, stages in systems.items():
+            for stage, stats in stages.items():
+                table.add_row(
+                    phase,
+                    names[system],
+                    stage.replace("_time", ""),
+                    str(stats["n"]),
+                    f"{stats['p50'] * 1000:.1f}",
+                    f"{stats['p95'] * 1000:.1f}",
+                    f"{stats['p99'] * 1000:.1f}"
+                )
+
+    console.print(table)
+
+
+def main():
+    from answer_cache import SemanticAnswerCache
+    from comparison.stubs import StubLLM, StubGraphiti, StubEmbeddings, make_stub_rag_system, make_stub_kg_system
+    from comparison.visualize import plot_comparison_metrics
+
+    parser = argparse.ArgumentParser(description="Offline latency benchmark for RAG vs KG-RAG")
+    parser.add_argument("--questions", type=int, default=10, help="Number of synthetic questions")
+    parser.add_argument("--warmup", type=int, default=1, help="Unrecorded runs per question")
+    parser.add_argument("--repetitions", type=int, default=5, help="Recorded runs per question and cache phase")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per generation call")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON report path")
+    parser.add_argument("--plot", action="store_true", help="Also plot the results with plot_comparison_metrics")
+    args = parser.parse_args()
+
+    questions = [f"How does the /v1/resource{i} endpoint handle authentication?" for i in range(args.questions)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        answer_cache = SemanticAnswerCache(StubEmbeddings(), db_path=os.path.join(cache_dir, "cache.db"))
+        rag_system = make_stub_rag_system(StubLLM(args.latency, jitter=0.5), answer_cache=answer_cache)
+        kg_system = make_stub_kg_system(StubGraphiti(), StubLLM(args.latency, jitter=0.5), answer_cache=answer_cache)
+
+        report = asyncio.run(run_benchmark(rag_system, kg_system, questions, warmup=args.warmup,
+                                           repetitions=args.repetitions, output_file=args.output))
+        answer_cache.close()
+
+    if args.plot:
+        plot_comparison_metrics(report["results"], output_file="benchmark_metrics.png")
+
+
+if __name__ == "__main__":
+    main()
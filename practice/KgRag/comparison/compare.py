@@ -1,6 +1,7 @@
 """Comparison module for Traditional RAG vs Knowledge Graph RAG."""
 
 import asyncio
+import time
 from typing import Dict, Any, List, Tuple
 from rich.console import Console
 from rich.table import Table
@@ -14,7 +15,8 @@ async def compare_systems(
     rag_system,
     kg_system,
     question: str,
-    verbose: bool = True
+    verbose: bool = True,
+    parallel: bool = True
 ) -> Dict[str, Any]:
     """
     Compare Traditional RAG and Knowledge Graph RAG on a single question.
@@ -24,19 +26,31 @@ async def compare_systems(
         kg_system: KnowledgeGraphRAG instance
         question: Question to ask both systems
         verbose: Whether to print detailed comparison
+        parallel: Query both systems at the same time (the blocking RAG
+            query runs in a worker thread)
 
     Returns:
         Dictionary with results from both systems and comparison
     """
     console.print(f"\n[bold cyan]Comparing systems on question:[/bold cyan] {question}\n")
+    start_time = time.time()
+
+    if parallel:
+        console.print("[yellow]Querying Traditional RAG and Knowledge Graph RAG...[/yellow]")
+        rag_result, kg_result = await asyncio.gather(
+            asyncio.to_thread(rag_system.query, question),
+            kg_system.query(question)
+        )
+    else:
+        # Query Traditional RAG
+        console.print("[yellow]Querying Traditional RAG...[/yellow]")
+        rag_result = rag_system.query(question)
 
-    # Query Traditional RAG
-    console.print("[yellow]Querying Traditional RAG...[/yellow]")
-    rag_result = rag_system.query(question)
+        # Query Knowledge Graph RAG
+        console.print("[yellow]Querying Knowledge Graph RAG...[/yellow]")
+        kg_result = await kg_system.query(question)
 
-    # Query Knowledge Graph RAG
-    console.print("[yellow]Querying Knowledge Graph RAG...[/yellow]")
-    kg_result = await kg_system.query(question)
+    wall_time = time.time() - start_time
 
     # Prepare comparison
     comparison = {
@@ -47,6 +61,11 @@ async def compare_systems(
             "speedup": rag_result['metrics']['query_time'] / kg_result['metrics']['query_time'],
             "rag_time": rag_result['metrics']['query_time'],
             "kg_time": kg_result['metrics']['query_time'],
+            "rag_retrieval_time": rag_result['metrics'].get('retrieval_time', 0.0),
+            "rag_generation_time": rag_result['metrics'].get('generation_time', 0.0),
+            "kg_retrieval_time": kg_result['metrics']['retrieval_time'],
+            "kg_generation_time": kg_result['metrics']['generation_time'],
+            "wall_time": wall_time,
             "rag_sources": rag_result['metrics']['num_source_chunks'],
             "kg_facts": kg_result['metrics']['num_facts'],
             "kg_entities": kg_result['metrics']['num_entities'],
@@ -147,35 +166,85 @@ def display_comparison(comparison: Dict[str, Any]) -> None:
 async def run_comparison_suite(
     rag_system,
     kg_system,
-    questions: List[str]
+    questions: List[str],
+    concurrency: int = 4
 ) -> List[Dict[str, Any]]:
     """
     Run a suite of comparison tests.
 
+    Up to `concurrency` questions are compared at the same time, and each
+    comparison queries both systems in parallel.
+
     Args:
         rag_system: TraditionalRAG instance
         kg_system: KnowledgeGraphRAG instance
         questions: List of questions to test
+        concurrency: Maximum number of questions in flight
 
     Returns:
-        List of comparison results
+        List of comparison results, in the order of the questions
     """
     console.print("\n[bold green]Running Comparison Suite[/bold green]")
-    console.print(f"Testing {len(questions)} questions...\n")
+    console.print(f"Testing {len(questions)} questions (concurrency={concurrency})...\n")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    completed = 0
+    start_time = time.time()
+
+    async def run(question: str) -> Dict[str, Any]:
+        nonlocal completed
+        async with semaphore:
+            result = await compare_systems(rag_system, kg_system, question, verbose=False)
+        completed += 1
+        console.print(f"[green]✓ Complete {completed}/{len(questions)}[/green]")
+        return result
 
-    results = []
-    for i, question in enumerate(questions, 1):
-        console.print(f"[bold]Test {i}/{len(questions)}[/bold]")
-        result = await compare_systems(rag_system, kg_system, question, verbose=False)
-        results.append(result)
-        console.print("[green]✓ Complete[/green]\n")
+    results = await asyncio.gather(*(run(question) for question in questions))
+    suite_time = time.time() - start_time
 
-    # Summary statistics
+    # Per-question stage timings, then summary statistics
+    display_stage_timings(results, suite_time)
     display_summary_statistics(results)
 
     return results
 
 
+def display_stage_timings(results: List[Dict[str, Any]], suite_time: float) -> None:
+    """
+    Display retrieval and generation time per question for both systems.
+
+    Args:
+        results: List of comparison results
+        suite_time: Wall-clock time of the whole suite in seconds
+    """
+    table = Table(title="Stage Timings (seconds)", box=box.ROUNDED)
+    table.add_column("#", style="cyan", justify="right")
+    table.add_column("Question", style="cyan", max_width=40)
+    table.add_column("RAG Retrieval", style="blue", justify="right")
+    table.add_column("RAG Generation", style="blue", justify="right")
+    table.add_column("KG Retrieval", style="magenta", justify="right")
+    table.add_column("KG Generation", style="magenta", justify="right")
+    table.add_column("Wall", style="green", justify="right")
+
+    for i, result in enumerate(results, 1):
+        metrics = result['comparison_metrics']
+        table.add_row(
+            str(i),
+            result['question'],
+            f"{metrics['rag_retrieval_time']:.2f}",
+            f"{metrics['rag_generation_time']:.2f}",
+            f"{metrics['kg_retrieval_time']:.2f}",
+            f"{metrics['kg_generation_time']:.2f}",
+            f"{metrics['wall_time']:.2f}"
+        )
+
+    console.print(table)
+
+    sequential_time = sum(r['comparison_metrics']['rag_time'] + r['comparison_metrics']['kg_time'] for r in results)
+    console.print(f"\nSuite finished in [bold]{suite_time:.2f}s[/bold] "
+                  f"(sequential estimate {sequential_time:.2f}s)")
+
+
 def display_summary_statistics(results: List[Dict[str, Any]]) -> None:
     """
     Display summary statistics across all comparison results.
@@ -0,0 +1,289 @@
+"""Paged, sampled knowledge graph export with a lazy-loading HTML viewer."""
+
+import json
+import os
+from typing import List, Dict, Any, Optional
+
+from neo4j import GraphDatabase
+
+
+# Node kinds by label priority; other nodes use their first label
+KIND_LABELS = ["Entity", "Episodic", "Community"]
+
+NODE_FIELDS = """
+id(n) AS id, labels(n) AS labels,
+coalesce(n.name, n.title, '') AS name,
+left(coalesce(n.summary, n.content, ''), 200) AS info,
+COUNT { (n)--() } AS degree
+"""
+
+
+def _sample_by_degree(session, sample_size: int) -> List[int]:
+    """IDs of the highest-degree nodes, most connected first."""
+    result = session.run(
+        """
+        MATCH (n)
+        WITH n, COUNT { (n)--() } AS degree
+        ORDER BY degree DESC
+        LIMIT $limit
+        RETURN id(n) AS id
+        """,
+        limit=sample_size
+    )
+    return [record["id"] for record in result]
+
+
+def _sample_by_community(session, sample_size: int) -> List[int]:
+    """Highest-degree members of every Graphiti community, so each cluster is represented."""
+    num_communities = session.run("MATCH (c:Community) RETURN count(c) AS count").single()["count"]
+    if num_communities == 0:
+        return []
+
+    result = session.run(
+        """
+        MATCH (c:Community)-[:HAS_MEMBER]->(n)
+        WITH c, n, COUNT { (n)--() } AS degree
+        ORDER BY degree DESC
+        WITH c, collect(id(n))[..$per_community] AS members
+        UNWIND members AS id
+        RETURN DISTINCT id
+        """,
+        per_community=max(1, sample_size // num_communities)
+    )
+    return [record["id"] for record in result][:sample_size]
+
+
+class _ChunkWriter:
+    """Buffers columnar rows and writes one compact JSON file per page."""
+
+    def __init__(self, output_dir: str, prefix: str, columns: List[str], page_size: int):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.columns = columns
+        self.page_size = page_size
+        self.files: List[str] = []
+        self.count = 0
+        self._rows = {column: [] for column in columns}
+
+    def add(self, *values) -> None:
+        for column, value in zip(self.columns, values):
+            self._rows[column].append(value)
+        self.count += 1
+        if len(self._rows[self.columns[0]]) >= self.page_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows[self.columns[0]]:
+            return
+        filename = f"{self.prefix}_{len(self.files):04d}.json"
+        with open(os.path.join(self.output_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(self._rows, f, separators=(",", ":"))
+        self.files.append(filename)
+        self._rows = {column: [] for column in self.columns}
+
+
+def export_graph(
+    neo4j_uri: str,
+    neo4j_user: str,
+    neo4j_password: str,
+    output_dir: str = "graph_export",
+    sample_size: Optional[int] = 5000,
+    sample_by: str = "degree",
+    page_size: int = 2000
+) -> Dict[str, Any]:
+    """
+    Export the knowledge graph as paged JSON with a lazy-loading viewer.
+
+    Sampling runs in Neo4j: by degree (the most connected nodes) or by
+    community (the most connected members of each Graphiti community,
+    falling back to degree when the graph has none). Nodes and edges are
+    then streamed from the server in fetch_size pages and written to disk
+    one page at a time, so memory stays flat whatever the graph size. Only
+    display fields are exported, never embeddings or full properties.
+
+    The output directory holds manifest.json, nodes_NNNN.json and
+    edges_NNNN.json pages in columnar form, and index.html, which loads
+    pages on demand and stops the physics simulation once the layout settles.
+
+    Args:
+        neo4j_uri: Neo4j URI
+        neo4j_user: Neo4j username
+        neo4j_password: Neo4j password
+        output_dir: Directory for the export
+        sample_size: Maximum number of nodes to export (None for the whole graph)
+        sample_by: 'degree' or 'community'
+        page_size: Nodes or edges per page file
+
+    Returns:
+        The manifest dictionary
+    """
+    if sample_by not in ("degree", "community"):
+        raise ValueError("sample_by must be 'degree' or 'community'")
+
+    print(f"Exporting knowledge graph to {output_dir}/...")
+    os.makedirs(output_dir, exist_ok=True)
+
+    driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+    kinds: List[str] = []
+    types: List[str] = []
+
+    def index_of(table: List[str], value: str) -> int:
+        if value not in table:
+            table.append(value)
+        return table.index(value)
+
+    nodes = _ChunkWriter(output_dir, "nodes", ["id", "name", "kind", "degree", "info"], page_size)
+    edges = _ChunkWriter(output_dir, "edges", ["source", "target", "type"], page_size)
+
+    with driver.session(fetch_size=page_size) as session:
+        total_nodes = session.run("MATCH (n) RETURN count(n) AS count").single()["count"]
+
+        ids = None
+        if sample_size is not None and sample_size < total_nodes:
+            if sample_by == "community":
+                ids = _sample_by_community(session, sample_size)
+                if not ids:
+                    print("  No communities found, sampling by degree")
+            if not ids:
+                ids = _sample_by_degree(session, sample_size)
+
+        # Nodes: sampled ones in sample order (most connected first), or all of them
+        if ids is not None:
+            node_result = session.run(
+                f"UNWIND $ids AS node_id MATCH (n) WHERE id(n) = node_id RETURN {NODE_FIELDS}", ids=ids
+            )
+        else:
+            node_result = session.run(f"MATCH (n) RETURN {NODE_FIELDS}")
+
+        for record in node_result:
+            labels = record["labels"]
+            kind = next((label for label in KIND_LABELS if label in labels), labels[0] if labels else "Node")
+            nodes.add(record["id"], record["name"], index_of(kinds, kind), record["degree"], record["info"])
+        nodes.flush()
+
+        # Edges between exported nodes
+        if ids is not None:
+            edge_result = session.run(
+                """
+                MATCH (a)-[r]->(b)
+                WHERE id(a) IN $ids AND id(b) IN $ids
+                RETURN id(a) AS source, id(b) AS target, type(r) AS type
+                """,
+                ids=ids
+            )
+        else:
+            edge_result = session.run(
+                "MATCH (a)-[r]->(b) RETURN id(a) AS source, id(b) AS target, type(r) AS type"
+            )
+
+        for record in edge_result:
+            edges.add(record["source"], record["target"], index_of(types, record["type"]))
+        edges.flush()
+
+    driver.close()
+
+    manifest = {
+        "total_nodes": total_nodes,
+        "num_nodes": nodes.count,
+        "num_edges": edges.count,
+        "sample_by": sample_by if ids is not None else None,
+        "kinds": kinds,
+        "types": types,
+        "node_chunks": nodes.files,
+        "edge_chunks": edges.files
+    }
+    with open(os.path.join(output_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    with open(os.path.join(output_dir, "index.html"), 'w', encoding='utf-8') as f:
+        f.write(VIEWER_HTML)
+
+    print(f"Exported {nodes.count} of {total_nodes} nodes and {edges.count} edges "
+          f"in {len(nodes.files) + len(edges.files)} pages")
+    print(f"View with: python -m http.server --directory {output_dir}  (then open http://localhost:8000)")
+
+    return manifest
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Knowledge Graph</title>
+<script src="https://unpkg.com/vis-network@9.1.9/standalone/umd/vis-network.min.js"></script>
+<style>
+  body { margin: 0; background: #222222; color: white; font-family: sans-serif; }
+  #graph { width: 100%; height: 92vh; }
+  #bar { padding: 8px; }
+  button { margin-right: 8px; }
+</style>
+</head>
+<body>
+<div id="bar">
+  <button id="more">Load more</button>
+  <button id="all">Load all</button>
+  <span id="status">Loading...</span>
+</div>
+<div id="graph"></div>
+<script>
+const COLORS = {Entity: "#fb7e81", Episodic: "#7be141", Community: "#ffa500"};
+const nodes = new vis.DataSet();
+const edges = new vis.DataSet();
+const loaded = new Set();
+let pending = [];
+let manifest, nextNode = 0, nextEdge = 0;
+
+const network = new vis.Network(document.getElementById("graph"), {nodes, edges}, {
+  layout: {improvedLayout: false},
+  physics: {barnesHut: {gravitationalConstant: -8000, springLength: 200}, stabilization: {iterations: 150}},
+  nodes: {shape: "dot", font: {color: "white"}},
+  edges: {arrows: "to", color: {opacity: 0.4}, smooth: false}
+});
+// Freeze the layout once it settles; re-enabled briefly for each new page
+network.on("stabilizationIterationsDone", () => network.setOptions({physics: false}));
+
+async function fetchJson(name) {
+  return (await fetch(name)).json();
+}
+
+function addEdges(batch) {
+  const ready = [], waiting = [];
+  for (const e of batch) (loaded.has(e.from) && loaded.has(e.to) ? ready : waiting).push(e);
+  edges.add(ready);
+  pending = waiting;
+}
+
+async function loadPage() {
+  if (nextNode < manifest.node_chunks.length) {
+    const page = await fetchJson(manifest.node_chunks[nextNode++]);
+    nodes.add(page.id.map((id, i) => {
+      const kind = manifest.kinds[page.kind[i]];
+      loaded.add(id);
+      return {id, label: (page.name[i] || "").slice(0, 30), title: kind + "\\n" + page.info[i],
+              color: COLORS[kind] || "#97c2fc", value: page.degree[i]};
+    }));
+  }
+  let batch = pending;
+  if (nextEdge < manifest.edge_chunks.length) {
+    const page = await fetchJson(manifest.edge_chunks[nextEdge++]);
+    batch = batch.concat(page.source.map((from, i) => ({from, to: page.target[i], title: manifest.types[page.type[i]]})));
+  }
+  addEdges(batch);
+  network.setOptions({physics: true});
+  network.stabilize(150);
+  document.getElementById("status").textContent =
+    `${nodes.length} / ${manifest.num_nodes} nodes, ${edges.length} / ${manifest.num_edges} edges` +
+    ` (graph has ${manifest.total_nodes} nodes)`;
+}
+
+function done() {
+  return nextNode >= manifest.node_chunks.length && nextEdge >= manifest.edge_chunks.length;
+}
+
+document.getElementById("more").onclick = loadPage;
+document.getElementById("all").onclick = async () => { while (!done()) await loadPage(); };
+
+fetchJson("manifest.json").then(m => { manifest = m; return loadPage(); });
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,196 @@
+"""Deterministic local stand-ins for the OpenAI, vector store and Graphiti/Neo4j clients.
+
+Used by the benchmarks so they run offline, without API keys or a database.
+Latencies are fixed sleeps, so timings reflect the pipeline's own overhead
+and concurrency rather than network noise.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+
+@dataclass
+class StubMessage:
+    """Minimal stand-in for a LangChain AIMessage."""
+    content: str
+
+
+@dataclass
+class StubEdge:
+    """Minimal stand-in for a Graphiti search result (EntityEdge)."""
+    fact: str
+    uuid: str
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+class StubLLM:
+    """
+    Chat model stand-in with invoke/ainvoke like LangChain's ChatOpenAI.
+
+    Answers are derived from a hash of the prompt, so the same prompt always
+    gets the same answer.
+    """
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+
+    def _delay(self, prompt: str) -> float:
+        # Prompt-derived jitter: repeatable run to run, but spread across prompts
+        spread = int(_digest(str(prompt)), 16) / 16 ** 12
+        return self.latency * (1 + self.jitter * spread)
+
+    def _answer(self, prompt: str) -> StubMessage:
+        self.calls += 1
+        return StubMessage(content=f"Stub answer {_digest(str(prompt))} based on the provided context.")
+
+    def invoke(self, prompt) -> StubMessage:
+        time.sleep(self._delay(prompt))
+        return self._answer(prompt)
+
+    async def ainvoke(self, prompt) -> StubMessage:
+        await asyncio.sleep(self._delay(prompt))
+        return self._answer(prompt)
+
+
+class StubEmbeddings:
+    """
+    Embeddings stand-in: hashed bag of words, so rephrasings that share most
+    words get similar vectors.
+    """
+
+    def __init__(self, size: int = 256):
+        self.size = size
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(_digest(word), 16) % self.size] += 1.0
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+class StubRetriever:
+    """Vector store retriever stand-in returning `k` fixed chunks."""
+
+    def __init__(self, latency: float = 0.01, k: int = 4):
+        self.latency = latency
+        self.k = k
+
+    def invoke(self, question: str):
+        from langchain_core.documents import Document
+
+        time.sleep(self.latency)
+        return [
+            Document(page_content=f"Chunk {i} about '{question}'", metadata={"source": "stub", "doc_id": f"stub-{i}"})
+            for i in range(self.k)
+        ]
+
+
+class StubCombineChain:
+    """Stuff-documents chain stand-in that calls the stub LLM once."""
+
+    def __init__(self, llm: StubLLM):
+        self.llm = llm
+
+    def invoke(self, inputs: Dict[str, Any]) -> Dict[str, str]:
+        context = "\n\n".join(doc.page_content for doc in inputs["input_documents"])
+        return {"output_text": self.llm.invoke(f"{context}\n\n{inputs['question']}").content}
+
+
+class StubQAChain:
+    """RetrievalQA stand-in exposing the retriever and combine_documents_chain."""
+
+    def __init__(self, retriever: StubRetriever, llm: StubLLM):
+        self.retriever = retriever
+        self.combine_documents_chain = StubCombineChain(llm)
+
+
+class StubGraphiti:
+    """
+    Graphiti stand-in covering add_episode and search.
+
+    add_episode sleeps for `episode_latency` to model the LLM extraction
+    calls Graphiti makes per episode. Every `fail_every`-th call raises once,
+    to exercise retry handling.
+    """
+
+    def __init__(self, episode_latency: float = 0.05, search_latency: float = 0.01,
+                 fail_every: Optional[int] = None):
+        self.episode_latency = episode_latency
+        self.search_latency = search_latency
+        self.fail_every = fail_every
+        self.episodes = []
+        self.calls = 0
+
+    async def add_episode(self, name, episode_body, source_description, reference_time, source=None, **kwargs):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.episode_latency)
+        if self.fail_every and call % self.fail_every == 0:
+            raise RuntimeError(f"Simulated extraction failure for {name}")
+        self.episodes.append({"name": name, "body": episode_body, "reference_time": reference_time})
+
+    async def search(self, query: str, num_results: int = 10, **kwargs) -> List[StubEdge]:
+        await asyncio.sleep(self.search_latency)
+        return [
+            StubEdge(fact=f"Fact {i} related to '{query}'", uuid=_digest(f"{query}:{i}"))
+            for i in range(num_results)
+        ]
+
+
+def make_stub_kg_system(graphiti: Optional[StubGraphiti] = None, llm: Optional[StubLLM] = None,
+                        answer_cache=None):
+    """
+    Create a KnowledgeGraphRAG wired to stub clients.
+
+    Skips __init__, so no Neo4j driver or API key is needed. Incremental
+    ingestion needs the driver; call add_documents_to_graph with
+    incremental=False.
+    """
+    from collections import OrderedDict
+    from knowledge_graph import KnowledgeGraphRAG
+
+    system = object.__new__(KnowledgeGraphRAG)
+    system.graphiti = graphiti or StubGraphiti()
+    system.llm = llm or StubLLM()
+    system.model_name = "stub"
+    system.driver = None
+    system.checkpoint_dir = None
+    system.stats_ttl = 0.0
+    system._stats_cache = None
+    system._stats_cached_at = 0.0
+    system._relationship_cache = OrderedDict()
+    system.answer_cache = answer_cache
+    return system
+
+
+def make_stub_rag_system(llm: Optional[StubLLM] = None, retrieval_latency: float = 0.01,
+                         answer_cache=None):
+    """
+    Create a TraditionalRAG whose QA chain runs on stubs.
+
+    Skips __init__, so no OpenAI client is built; query() runs unchanged,
+    including the answer cache path.
+    """
+    from traditional_rag import TraditionalRAG
+
+    system = object.__new__(TraditionalRAG)
+    system.model_name = "stub"
+    system.qa_chain = StubQAChain(StubRetriever(retrieval_latency), llm or StubLLM())
+    system.answer_cache = answer_cache
+    system.answer_namespace = "traditional_rag/stub"
+    system.tombstones = set()
+    return system
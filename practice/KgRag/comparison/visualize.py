@@ -17,6 +17,8 @@ def visualize_graph(
     """
     Visualize the knowledge graph using pyvis.
 
+    Suited to small graphs; use export_graph for large ones.
+
     Args:
         neo4j_uri: Neo4j URI
         neo4j_user: Neo4j username
@@ -71,7 +73,7 @@ def visualize_graph(
             color = "#97c2fc"  # Default blue
             if "Entity" in labels:
                 color = "#fb7e81"  # Red for entities
-            elif "Episode" in labels:
+            elif "Episodic" in labels:
                 color = "#7be141"  # Green for episodes
             elif "Fact" in labels:
                 color = "#ffa500"  # Orange for facts
@@ -94,11 +96,11 @@ def visualize_graph(
         if node_ids:
             rel_query = f"""
             MATCH (a)-[r]->(b)
-            WHERE id(a) IN {list(range(max_nodes))} AND id(b) IN {list(range(max_nodes))}
+            WHERE id(a) IN $ids AND id(b) IN $ids
             RETURN id(a) as source, id(b) as target, type(r) as type, properties(r) as properties
             LIMIT {max_nodes * 2}
             """
-            relationships = session.run(rel_query)
+            relationships = session.run(rel_query, ids=[int(node_id) for node_id in node_ids])
 
             for record in relationships:
                 source = str(record["source"])
@@ -13,9 +13,12 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 
-from traditional_rag import TraditionalRAG
+from langchain_openai import OpenAIEmbeddings
+
+from traditional_rag import TraditionalRAG, CachedEmbeddings
 from knowledge_graph import KnowledgeGraphRAG
-from comparison import compare_systems, run_comparison_suite, plot_comparison_metrics, visualize_graph
+from comparison import compare_systems, run_comparison_suite, plot_comparison_metrics, visualize_graph, export_graph
+from answer_cache import SemanticAnswerCache
 
 console = Console()
 
@@ -63,12 +66,22 @@ async def initialize_systems():
     model_name = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
     embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
 
+    # Shared cache for repeated and near-duplicate questions
+    answer_cache = SemanticAnswerCache(
+        embeddings=CachedEmbeddings(
+            OpenAIEmbeddings(model=embedding_model, api_key=openai_api_key),
+            model_name=embedding_model
+        ),
+        similarity_threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+    )
+
     # Initialize Traditional RAG
     console.print("[yellow]1. Initializing Traditional RAG...[/yellow]")
     rag_system = TraditionalRAG(
         openai_api_key=openai_api_key,
         model_name=model_name,
-        embedding_model=embedding_model
+        embedding_model=embedding_model,
+        answer_cache=answer_cache
     )
 
     # Load and index documents
@@ -88,7 +101,8 @@ async def initialize_systems():
         neo4j_user=neo4j_username,
         neo4j_password=neo4j_password,
         openai_api_key=openai_api_key,
-        model_name=model_name
+        model_name=model_name,
+        answer_cache=answer_cache
     )
 
     # Build required Neo4j indexes and constraints
@@ -103,25 +117,32 @@ async def initialize_systems():
             kg_system.clear_graph()
             stats = kg_system.get_graph_statistics()
 
-    # Build knowledge graph if needed
+    # Build the knowledge graph, or bring an existing one up to date.
+    # Unchanged chunks are skipped, so refreshing an existing graph only
+    # pays for new or edited chunks.
     if stats['total_nodes'] == 0:
         console.print("[yellow]Building knowledge graph (this may take a few minutes)...[/yellow]")
-        # Split documents for KG
-        doc_texts = [doc.page_content for doc in documents]
-        await kg_system.add_documents_to_graph(doc_texts, source="api_documentation")
-
-        stats = kg_system.get_graph_statistics()
-        console.print(f"[green][OK] Knowledge Graph initialized[/green]")
-        console.print(f"  - Nodes: {stats['total_nodes']}")
-        console.print(f"  - Relationships: {stats['total_relationships']}")
-        console.print(f"  - Entities: {stats['num_entities']}")
-        console.print(f"  - Episodes: {stats['num_episodes']}\n")
     else:
-        console.print(f"[green][OK] Using existing Knowledge Graph[/green]")
-        console.print(f"  - Nodes: {stats['total_nodes']}")
-        console.print(f"  - Relationships: {stats['total_relationships']}")
-        console.print(f"  - Entities: {stats['num_entities']}")
-        console.print(f"  - Episodes: {stats['num_episodes']}\n")
+        console.print("[yellow]Checking existing knowledge graph for changed chunks...[/yellow]")
+
+    # Split documents for KG
+    doc_texts = [doc.page_content for doc in documents]
+    concurrency = int(os.getenv("KG_INGEST_CONCURRENCY", "4"))
+    ingest_stats = await kg_system.add_documents_to_graph(
+        doc_texts, source="api_documentation", concurrency=concurrency
+    )
+    if ingest_stats['failed']:
+        console.print(f"[yellow]{ingest_stats['failed']} chunks failed to ingest: "
+                      f"{ingest_stats['failed_chunks']} (run again to resume)[/yellow]")
+
+    stats = kg_system.get_graph_statistics()
+    console.print(f"[green][OK] Knowledge Graph ready[/green]")
+    console.print(f"  - Added: {ingest_stats['succeeded']} chunks, "
+                  f"unchanged: {ingest_stats['skipped']}, removed: {ingest_stats['removed']}")
+    console.print(f"  - Nodes: {stats['total_nodes']}")
+    console.print(f"  - Relationships: {stats['total_relationships']}")
+    console.print(f"  - Entities: {stats['num_entities']}")
+    console.print(f"  - Episodes: {stats['num_episodes']}\n")
 
     return rag_system, kg_system
 
@@ -170,6 +191,21 @@ def visualize_knowledge_graph(kg_system):
     """Generate knowledge graph visualization."""
     console.print("\n[bold cyan]Generating Knowledge Graph Visualization[/bold cyan]\n")
 
+    # pyvis renders every node at once; large graphs get the paged export instead
+    stats = kg_system.get_graph_statistics()
+    if stats['total_nodes'] > 1000:
+        export_graph(
+            neo4j_uri=os.getenv("NEO4J_URI"),
+            neo4j_user=os.getenv("NEO4J_USERNAME"),
+            neo4j_password=os.getenv("NEO4J_PASSWORD"),
+            output_dir="graph_export",
+            sample_size=5000
+        )
+        console.print("[green][OK] Graph exported to: graph_export/[/green]")
+        console.print("[yellow]Run 'python -m http.server --directory graph_export' and open "
+                      "http://localhost:8000 to explore the graph[/yellow]")
+        return
+
     visualize_graph(
         neo4j_uri=os.getenv("NEO4J_URI"),
         neo4j_user=os.getenv("NEO4J_USERNAME"),
@@ -0,0 +1,5 @@
+"""Hybrid RAG combining vector search and knowledge graph facts."""
+
+from .hybrid_pipeline import HybridRAG
+
+__all__ = ['HybridRAG']
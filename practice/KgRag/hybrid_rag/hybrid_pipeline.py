@@ -0,0 +1,233 @@
+"""Hybrid RAG: FAISS chunks and Graphiti facts fused into one context."""
+
+import asyncio
+import re
+import time
+from typing import List, Dict, Any
+
+import tiktoken
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"\w+", text))
+
+
+class HybridRAG:
+    """
+    Retrieval from both a TraditionalRAG index and a KnowledgeGraphRAG graph.
+
+    The FAISS similarity search and the Graphiti search run concurrently.
+    Their ranked lists are merged with reciprocal rank fusion, facts that
+    repeat each other or are already contained in a retrieved chunk are
+    merged, and the fused list is trimmed to a token budget before a
+    single generation call.
+    """
+
+    def __init__(
+        self,
+        rag_system,
+        kg_system,
+        llm=None,
+        k: int = 4,
+        max_facts: int = 10,
+        max_context_tokens: int = 3000,
+        rrf_k: int = 60,
+        dedupe_threshold: float = 0.8
+    ):
+        """
+        Initialize Hybrid RAG.
+
+        Args:
+            rag_system: TraditionalRAG instance with a built index
+            kg_system: KnowledgeGraphRAG instance
+            llm: Chat model for generation (defaults to the KG system's)
+            k: Number of chunks from vector search
+            max_facts: Number of facts from graph search
+            max_context_tokens: Token budget for the fused context
+            rrf_k: Reciprocal rank fusion constant (higher flattens rank differences)
+            dedupe_threshold: Word-overlap (Jaccard) at which two facts count as duplicates
+        """
+        self.rag_system = rag_system
+        self.kg_system = kg_system
+        self.llm = llm or kg_system.llm
+        self.k = k
+        self.max_facts = max_facts
+        self.max_context_tokens = max_context_tokens
+        self.rrf_k = rrf_k
+        self.dedupe_threshold = dedupe_threshold
+
+        try:
+            self._encoding = tiktoken.encoding_for_model(kg_system.model_name)
+        except Exception:
+            try:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # Offline without a cached encoding: fall back to ~4 characters per token
+                self._encoding = None
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of a context item."""
+        if self._encoding is None:
+            return max(1, len(text) // 4)
+        return len(self._encoding.encode(text))
+
+    async def retrieve(self, question: str) -> Dict[str, List[str]]:
+        """
+        Run vector search and graph search concurrently.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Dictionary with ranked 'chunks' and 'facts' text lists
+        """
+        docs, results = await asyncio.gather(
+            asyncio.to_thread(self.rag_system.similarity_search, question, self.k),
+            self.kg_system.graphiti.search(query=question, num_results=self.max_facts)
+        )
+
+        facts = []
+        for result in results:
+            if hasattr(result, 'fact'):
+                facts.append(result.fact)
+            if hasattr(result, 'content'):
+                facts.append(result.content)
+
+        return {"chunks": [doc.page_content for doc in docs], "facts": facts}
+
+    def fuse(self, chunks: List[str], facts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Merge ranked chunks and facts with reciprocal rank fusion.
+
+        Each item scores 1 / (rrf_k + rank) in its own list. A fact that is
+        contained in a chunk, or that overlaps an earlier fact by at least
+        dedupe_threshold, adds its score to that item instead of appearing
+        twice.
+
+        Args:
+            chunks: Chunk texts in vector search order
+            facts: Fact texts in graph search order
+
+        Returns:
+            Items with 'text', 'source' and 'score' keys, best first
+        """
+        items = []
+        by_text: Dict[str, Dict[str, Any]] = {}
+
+        for rank, chunk in enumerate(chunks, 1):
+            key = _normalize(chunk)
+            if key in by_text:
+                by_text[key]["score"] += 1.0 / (self.rrf_k + rank)
+                continue
+            item = {"text": chunk, "source": "vector", "score": 1.0 / (self.rrf_k + rank), "_key": key}
+            by_text[key] = item
+            items.append(item)
+
+        kept_facts = []
+        for rank, fact in enumerate(facts, 1):
+            key = _normalize(fact)
+            score = 1.0 / (self.rrf_k + rank)
+
+            duplicate = by_text.get(key)
+            if duplicate is None:
+                duplicate = next((item for item in items if item["source"] == "vector" and key in item["_key"]), None)
+            if duplicate is None:
+                words = _words(key)
+                for item in kept_facts:
+                    union = words | item["_words"]
+                    if union and len(words & item["_words"]) / len(union) >= self.dedupe_threshold:
+                        duplicate = item
+                        break
+
+            if duplicate is not None:
+                duplicate["score"] += score
+                if duplicate["source"] == "vector":
+                    duplicate["source"] = "vector+graph"
+                continue
+
+            item = {"text": fact, "source": "graph", "score": score, "_key": key, "_words": _words(key)}
+            by_text[key] = item
+            kept_facts.append(item)
+            items.append(item)
+
+        items.sort(key=lambda item: item["score"], reverse=True)
+        return [{"text": item["text"], "source": item["source"], "score": item["score"]} for item in items]
+
+    def trim(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep the best items that fit in max_context_tokens.
+
+        Items that do not fit are skipped, so a smaller item further down
+        can still use the remaining budget.
+        """
+        selected = []
+        used = 0
+        for item in items:
+            tokens = self.count_tokens(item["text"])
+            if used + tokens > self.max_context_tokens:
+                continue
+            selected.append({**item, "tokens": tokens})
+            used += tokens
+        return selected
+
+    async def query(self, question: str) -> Dict[str, Any]:
+        """
+        Query the hybrid system.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Dictionary with answer, context items, and metrics
+        """
+        print(f"\nQuerying Hybrid RAG: {question}")
+        start_time = time.time()
+
+        retrieved = await self.retrieve(question)
+        retrieval_time = time.time() - start_time
+
+        fused = self.fuse(retrieved["chunks"], retrieved["facts"])
+        context_items = self.trim(fused)
+        context = "\n\n".join(item["text"] for item in context_items) or "No relevant information found."
+
+        generation_start = time.time()
+        prompt = f"""You are a helpful AI assistant answering questions about the CloudStore API documentation.
+
+Use the following context to answer the question. It combines documentation excerpts and knowledge graph facts describing entities and their relationships.
+
+Context:
+{context}
+
+Question: {question}
+
+Provide a comprehensive answer based on the context. If the context doesn't contain enough information, say so.
+
+Answer:"""
+
+        response = await self.llm.ainvoke(prompt)
+        answer = response.content
+
+        generation_time = time.time() - generation_start
+        total_time = time.time() - start_time
+
+        return {
+            "answer": answer,
+            "context": context_items,
+            "metrics": {
+                "query_time": total_time,
+                "retrieval_time": retrieval_time,
+                "generation_time": generation_time,
+                "num_chunks": len(retrieved["chunks"]),
+                "num_facts": len(retrieved["facts"]),
+                "num_context_items": len(context_items),
+                "num_merged": len(retrieved["chunks"]) + len(retrieved["facts"]) - len(fused),
+                "num_dropped": len(fused) - len(context_items),
+                "context_tokens": sum(item["tokens"] for item in context_items),
+                "answer_tokens": len(answer.split()),
+                "retrieval_method": "hybrid_rrf"
+            }
+        }
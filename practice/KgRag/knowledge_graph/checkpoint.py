@@ -0,0 +1,100 @@
+"""Append-only checkpoint journal for resumable knowledge graph builds."""
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, Optional
+
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+REMOVED = "removed"
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a chunk's text, used to detect changed chunks."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IngestJournal:
+    """
+    Per-chunk ingestion status, persisted as JSON lines.
+
+    Every status change is appended as one line (episode name, content hash,
+    status), so a crash loses at most the line being written. On load the
+    last line for each episode wins; compact() rewrites the file with only
+    those lines.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a journal.
+
+        Args:
+            path: Path to the JSON lines journal file
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from an interrupted write
+                        continue
+                    if entry["status"] == REMOVED:
+                        self.entries.pop(entry["name"], None)
+                    else:
+                        self.entries[entry["name"]] = entry
+
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the latest entry for an episode, if any."""
+        return self.entries.get(name)
+
+    def is_done(self, name: str, digest: str) -> bool:
+        """Whether an episode was ingested with exactly this content."""
+        entry = self.entries.get(name)
+        return entry is not None and entry["status"] == DONE and entry["hash"] == digest
+
+    def record(self, name: str, digest: str, status: str) -> None:
+        """
+        Record a status change for an episode.
+
+        Args:
+            name: Episode name
+            digest: Content hash of the chunk
+            status: One of 'pending', 'done' or 'failed'
+        """
+        entry = {"name": name, "hash": digest, "status": status}
+        self.entries[name] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def forget(self, name: str) -> None:
+        """Drop an episode from the journal (e.g. after removing it from the graph)."""
+        if self.entries.pop(name, None) is not None:
+            self._file.write(json.dumps({"name": name, "hash": None, "status": REMOVED}) + "\n")
+            self._file.flush()
+
+    def compact(self) -> None:
+        """Rewrite the journal with one line per live episode."""
+        self._file.close()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        """Compact and close the journal."""
+        self.compact()
+        self._file.close()
@@ -1,26 +1,35 @@
 """Knowledge Graph RAG Pipeline using Graphiti and Neo4j."""
 
+import asyncio
 import os
 import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from graphiti_core import Graphiti
 from graphiti_core.nodes import EpisodeType
 from neo4j import GraphDatabase
 from langchain_openai import ChatOpenAI
 
+from .checkpoint import IngestJournal, content_hash, PENDING, DONE, FAILED
+
 
 class KnowledgeGraphRAG:
     """Knowledge Graph-based RAG system using Graphiti."""
 
+    RELATIONSHIP_CACHE_SIZE = 1024  # entities whose neighborhoods are kept in memory
+
     def __init__(
         self,
         neo4j_uri: str,
         neo4j_user: str,
         neo4j_password: str,
         openai_api_key: str,
-        model_name: str = "gpt-5-nano"
+        model_name: str = "gpt-5-nano",
+        checkpoint_dir: Optional[str] = "llm_cache",
+        stats_ttl: float = 30.0,
+        answer_cache=None
     ):
         """
         Initialize Knowledge Graph RAG system.
@@ -31,12 +40,23 @@ class KnowledgeGraphRAG:
             neo4j_password: Neo4j password
             openai_api_key: OpenAI API key
             model_name: LLM model to use
+            checkpoint_dir: Directory for ingestion checkpoint journals (None to disable)
+            stats_ttl: Seconds graph statistics and entity lookups are cached
+            answer_cache: Optional SemanticAnswerCache for repeated questions
         """
         self.neo4j_uri = neo4j_uri
         self.neo4j_user = neo4j_user
         self.neo4j_password = neo4j_password
         self.openai_api_key = openai_api_key
         self.model_name = model_name
+        self.checkpoint_dir = checkpoint_dir
+        self.stats_ttl = stats_ttl
+        self.answer_cache = answer_cache
+
+        # Read caches, cleared whenever this instance changes the graph
+        self._stats_cache = None
+        self._stats_cached_at = 0.0
+        self._relationship_cache: "OrderedDict[str, tuple]" = OrderedDict()
 
         # Initialize Neo4j driver
         self.driver = GraphDatabase.driver(
@@ -69,44 +89,248 @@ class KnowledgeGraphRAG:
             api_key=openai_api_key
         )
 
+        try:
+            self._create_indexes()
+        except Exception as e:
+            print(f"Warning: could not create Neo4j indexes: {e}")
+
         print("Knowledge Graph RAG initialized")
 
+    def _create_indexes(self) -> None:
+        """Create the index used by entity lookups (no-op if it exists)."""
+        with self.driver.session() as session:
+            session.run("CREATE INDEX entity_name IF NOT EXISTS FOR (n:Entity) ON (n.name)")
+
+    def invalidate_caches(self) -> None:
+        """Drop cached statistics, entity lookups and answers after the graph changes."""
+        self._stats_cache = None
+        self._relationship_cache.clear()
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate("knowledge_graph")
+
     def clear_graph(self) -> None:
         """Clear all nodes and relationships from the graph."""
         with self.driver.session() as session:
             session.run("MATCH (n) DETACH DELETE n")
+        self.invalidate_caches()
+
+        # Checkpoints describe the old graph; drop them so the next build starts clean
+        if self.checkpoint_dir and os.path.isdir(self.checkpoint_dir):
+            for filename in os.listdir(self.checkpoint_dir):
+                if filename.startswith("kg_ingest_") and filename.endswith(".jsonl"):
+                    os.remove(os.path.join(self.checkpoint_dir, filename))
         print("Graph cleared")
 
+    @staticmethod
+    def _episode_names(documents: List[str], source: str) -> List[str]:
+        """
+        Content-addressed episode names for a list of chunks.
+
+        Names depend on the chunk text rather than its position, so inserting
+        or editing one chunk does not rename every chunk after it. Repeated
+        chunks get an occurrence suffix.
+        """
+        seen: Dict[str, int] = {}
+        names = []
+        for doc in documents:
+            digest = content_hash(doc)[:16]
+            occurrence = seen.get(digest, 0)
+            seen[digest] = occurrence + 1
+            suffix = f"_{occurrence}" if occurrence else ""
+            names.append(f"{source}_chunk_{digest}{suffix}")
+        return names
+
+    def _get_existing_episodes(self, source: str) -> set:
+        """Names of the episodes already stored in the graph for a source."""
+        with self.driver.session() as session:
+            result = session.run(
+                "MATCH (e:Episodic) WHERE e.name STARTS WITH $prefix RETURN e.name AS name",
+                prefix=f"{source}_chunk_"
+            )
+            return {record["name"] for record in result}
+
+    def _remove_episodes(self, names: List[str]) -> None:
+        """
+        Delete episodes along with the facts and entities only they support.
+
+        RELATES_TO facts list the episodes they were extracted from; those
+        removed episodes are trimmed from the list, and facts left with no
+        episode are deleted so they stop showing up in search.
+        """
+        def remove(tx) -> None:
+            tx.run(
+                """
+                MATCH (e:Episodic) WHERE e.name IN $names
+                WITH collect(e.uuid) AS removed
+                MATCH (:Entity)-[r:RELATES_TO]->(:Entity)
+                WHERE any(uuid IN r.episodes WHERE uuid IN removed)
+                WITH r, [uuid IN r.episodes WHERE NOT uuid IN removed] AS remaining
+                FOREACH (_ IN CASE WHEN size(remaining) = 0 THEN [1] ELSE [] END | DELETE r)
+                FOREACH (_ IN CASE WHEN size(remaining) > 0 THEN [1] ELSE [] END | SET r.episodes = remaining)
+                """,
+                names=names
+            ).consume()
+            tx.run(
+                """
+                MATCH (e:Episodic) WHERE e.name IN $names
+                OPTIONAL MATCH (e)-[:MENTIONS]->(n:Entity)
+                WITH collect(DISTINCT e) AS episodes, collect(DISTINCT n) AS mentioned
+                FOREACH (e IN episodes | DETACH DELETE e)
+                WITH mentioned
+                UNWIND mentioned AS n
+                WITH n WHERE NOT (n)<-[:MENTIONS]-(:Episodic)
+                DETACH DELETE n
+                """,
+                names=names
+            ).consume()
+
+        with self.driver.session() as session:
+            session.execute_write(remove)
+
     async def add_documents_to_graph(
         self,
         documents: List[str],
-        source: str = "api_documentation"
-    ) -> None:
+        source: str = "api_documentation",
+        concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        incremental: bool = True
+    ) -> Dict[str, Any]:
         """
         Add documents to the knowledge graph.
 
+        Chunks are ingested as Graphiti episodes with up to `concurrency`
+        add_episode calls in flight. Reference times are assigned up front in
+        chunk order, so the episodes keep their document order on the graph's
+        timeline whichever call finishes first. Graphiti uses earlier episodes
+        as extraction context; pass concurrency=1 when each chunk must see
+        every chunk before it.
+
+        Episodes are named by a hash of their chunk. With incremental=True,
+        chunks already stored as episodes are skipped and episodes whose chunk
+        is gone (edited or deleted) are removed, so a refresh only pays for
+        changed chunks. Every chunk's status is appended to a checkpoint
+        journal in checkpoint_dir, so an interrupted build resumes where it
+        stopped: an existing episode whose journal entry is still pending or
+        failed may be half-written, so it is removed and ingested again.
+
         Args:
             documents: List of document chunks
             source: Source identifier for the documents
+            concurrency: Maximum number of episodes ingested at the same time
+            max_retries: Retries per chunk after a failed add_episode call
+            retry_backoff: Initial retry delay in seconds (doubled on every retry)
+            incremental: Skip existing episodes and remove stale ones
+
+        Returns:
+            Dictionary with ingestion statistics
         """
-        print(f"Adding {len(documents)} documents to knowledge graph...")
         start_time = time.time()
 
-        for i, doc in enumerate(documents):
-            # Add each document as an episode to Graphiti
-            await self.graphiti.add_episode(
-                name=f"{source}_chunk_{i}",
-                episode_body=doc,
-                source_description=f"Document chunk {i} from {source}",
-                reference_time=datetime.now(),
-                source=EpisodeType.text
-            )
-
-            if (i + 1) % 10 == 0:
-                print(f"  Processed {i + 1}/{len(documents)} chunks...")
+        names = self._episode_names(documents, source)
+        digests = [content_hash(doc) for doc in documents]
+        stats = {"succeeded": 0, "failed": 0, "retries": 0, "failed_chunks": [],
+                 "skipped": 0, "removed": 0, "repaired": 0}
+
+        journal = None
+        if self.checkpoint_dir:
+            journal = IngestJournal(os.path.join(self.checkpoint_dir, f"kg_ingest_{source}.jsonl"))
+
+        pending = list(range(len(documents)))
+        if incremental:
+            existing = self._get_existing_episodes(source)
+
+            stale = sorted(existing - set(names))
+            if stale:
+                self._remove_episodes(stale)
+                self.invalidate_caches()
+                stats["removed"] = len(stale)
+                if journal:
+                    for name in stale:
+                        journal.forget(name)
+
+            pending = []
+            interrupted = []
+            for i, name in enumerate(names):
+                if name not in existing:
+                    pending.append(i)
+                elif journal and journal.get(name) is not None and not journal.is_done(name, digests[i]):
+                    # add_episode was cut off (or failed) partway through this chunk
+                    interrupted.append(name)
+                    pending.append(i)
+                else:
+                    # Done, or stored by a build without a journal
+                    if journal and journal.get(name) is None:
+                        journal.record(name, digests[i], DONE)
+                    stats["skipped"] += 1
+
+            if interrupted:
+                self._remove_episodes(interrupted)
+                self.invalidate_caches()
+                stats["repaired"] = len(interrupted)
+
+        if journal:
+            for i in pending:
+                journal.record(names[i], digests[i], PENDING)
+
+        print(f"Adding {len(pending)} documents to knowledge graph "
+              f"(concurrency={concurrency}, {stats['skipped']} unchanged, "
+              f"{stats['removed']} removed, {stats['repaired']} repaired)...")
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        base_time = datetime.now()
+
+        async def ingest(i: int) -> None:
+            async with semaphore:
+                for attempt in range(max_retries + 1):
+                    try:
+                        # Add each document as an episode to Graphiti
+                        await self.graphiti.add_episode(
+                            name=names[i],
+                            episode_body=documents[i],
+                            source_description=f"Document chunk {i} from {source}",
+                            reference_time=base_time + timedelta(milliseconds=i),
+                            source=EpisodeType.text
+                        )
+                        break
+                    except Exception as e:
+                        if attempt == max_retries:
+                            stats["failed"] += 1
+                            stats["failed_chunks"].append(i)
+                            if journal:
+                                journal.record(names[i], digests[i], FAILED)
+                            print(f"  Chunk {i} failed after {attempt + 1} attempts: {e}")
+                            return
+                        stats["retries"] += 1
+                        await asyncio.sleep(retry_backoff * (2 ** attempt))
+
+            stats["succeeded"] += 1
+            if journal:
+                journal.record(names[i], digests[i], DONE)
+            done = stats["succeeded"] + stats["failed"]
+            if done % 10 == 0:
+                elapsed = time.time() - start_time
+                print(f"  Processed {done}/{len(pending)} chunks "
+                      f"({done / elapsed:.2f} chunks/s)...")
+
+        try:
+            await asyncio.gather(*(ingest(i) for i in pending))
+        finally:
+            if journal:
+                journal.close()
+            if stats["succeeded"]:
+                self.invalidate_caches()
 
         build_time = time.time() - start_time
-        print(f"Knowledge graph built in {build_time:.2f} seconds")
+        stats["failed_chunks"].sort()
+        stats["build_time"] = build_time
+        stats["chunks_per_second"] = len(pending) / build_time if build_time > 0 else 0.0
+
+        print(f"Knowledge graph built in {build_time:.2f} seconds "
+              f"({stats['chunks_per_second']:.2f} chunks/s, {stats['retries']} retries, "
+              f"{stats['failed']} failed)")
+
+        return stats
 
     async def query(self, question: str, max_facts: int = 10) -> Dict[str, Any]:
         """
@@ -122,6 +346,17 @@ class KnowledgeGraphRAG:
         print(f"\nQuerying Knowledge Graph: {question}")
         start_time = time.time()
 
+        answer_namespace = f"knowledge_graph/{self.model_name}/{max_facts}"
+        if self.answer_cache is not None:
+            # The cache may embed the question; keep that off the event loop
+            cached = await asyncio.to_thread(self.answer_cache.get, answer_namespace, question)
+            if cached is not None:
+                cached["metrics"]["query_time"] = time.time() - start_time
+                cached["metrics"]["retrieval_time"] = 0.0
+                cached["metrics"]["generation_time"] = 0.0
+                cached["metrics"]["cache_hit"] = True
+                return cached
+
         # Search the knowledge graph for relevant facts
         search_results = await self.graphiti.search(
             query=question,
@@ -170,7 +405,8 @@ Provide a comprehensive answer based on the knowledge graph facts. If the facts
 
 Answer:"""
 
-        response = self.llm.invoke(prompt)
+        # Async call so concurrent queries overlap instead of blocking the event loop
+        response = await self.llm.ainvoke(prompt)
         answer = response.content
 
         generation_time = time.time() - generation_start
@@ -182,7 +418,7 @@ Answer:"""
         num_entities = len(set(entities))
         num_relationships = len(relationships)
 
-        return {
+        response = {
             "answer": answer,
             "facts": facts,
             "entities": list(set(entities)),
@@ -195,61 +431,108 @@ Answer:"""
                 "num_entities": num_entities,
                 "num_relationships": num_relationships,
                 "answer_tokens": num_tokens,
-                "retrieval_method": "knowledge_graph"
+                "retrieval_method": "knowledge_graph",
+                "cache_hit": False
             }
         }
 
+        if self.answer_cache is not None:
+            await asyncio.to_thread(self.answer_cache.put, answer_namespace, question, response)
+
+        return response
+
+    async def aquery_many(
+        self,
+        questions: List[str],
+        concurrency: int = 4,
+        max_facts: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Answer several questions concurrently.
+
+        Args:
+            questions: Questions to answer
+            concurrency: Maximum number of queries in flight at the same time
+            max_facts: Maximum number of facts to retrieve per question
+
+        Returns:
+            One query result per question, in the order of the questions
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(question: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.query(question, max_facts=max_facts)
+
+        return await asyncio.gather(*(run(question) for question in questions))
+
     def get_entity_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
         """
         Get all relationships for a specific entity.
 
+        Results are cached for stats_ttl seconds.
+
         Args:
             entity_name: Name of the entity
 
         Returns:
             List of relationships
         """
+        cached = self._relationship_cache.get(entity_name)
+        if cached is not None and time.monotonic() - cached[0] < self.stats_ttl:
+            self._relationship_cache.move_to_end(entity_name)
+            return [dict(row) for row in cached[1]]
+
         with self.driver.session() as session:
+            # One index seek on Entity.name covers both directions
             query = """
-            MATCH (e:Entity {name: $entity_name})-[r]->(target)
-            RETURN e.name as source, type(r) as relationship, target.name as target
-            UNION
-            MATCH (source)-[r]->(e:Entity {name: $entity_name})
-            RETURN source.name as source, type(r) as relationship, e.name as target
+            MATCH (e:Entity {name: $entity_name})-[r]-()
+            RETURN DISTINCT startNode(r).name as source, type(r) as relationship, endNode(r).name as target
             """
             result = session.run(query, entity_name=entity_name)
-            return [dict(record) for record in result]
+            relationships = [dict(record) for record in result]
+
+        self._relationship_cache[entity_name] = (time.monotonic(), relationships)
+        self._relationship_cache.move_to_end(entity_name)
+        while len(self._relationship_cache) > self.RELATIONSHIP_CACHE_SIZE:
+            self._relationship_cache.popitem(last=False)
+
+        return [dict(row) for row in relationships]
 
     def get_graph_statistics(self) -> Dict[str, int]:
         """
         Get statistics about the knowledge graph.
 
+        All four counts come from one round trip. Each subquery is a plain
+        count that Neo4j answers from its count store, without scanning
+        nodes or relationships. Results are cached for stats_ttl seconds.
+
         Returns:
             Dictionary with graph statistics
         """
+        if self._stats_cache is not None and time.monotonic() - self._stats_cached_at < self.stats_ttl:
+            return dict(self._stats_cache)
+
         with self.driver.session() as session:
-            # Count nodes
-            node_result = session.run("MATCH (n) RETURN count(n) as count")
-            num_nodes = node_result.single()["count"]
-
-            # Count relationships
-            rel_result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-            num_relationships = rel_result.single()["count"]
-
-            # Count entities
-            entity_result = session.run("MATCH (n:Entity) RETURN count(n) as count")
-            num_entities = entity_result.single()["count"]
-
-            # Count episodes
-            episode_result = session.run("MATCH (n:Episode) RETURN count(n) as count")
-            num_episodes = episode_result.single()["count"]
-
-        return {
-            "total_nodes": num_nodes,
-            "total_relationships": num_relationships,
-            "num_entities": num_entities,
-            "num_episodes": num_episodes
+            record = session.run(
+                """
+                CALL { MATCH (n) RETURN count(n) AS total_nodes }
+                CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships }
+                CALL { MATCH (n:Entity) RETURN count(n) AS num_entities }
+                CALL { MATCH (n:Episodic) RETURN count(n) AS num_episodes }
+                RETURN total_nodes, total_relationships, num_entities, num_episodes
+                """
+            ).single()
+
+        self._stats_cache = {
+            "total_nodes": record["total_nodes"],
+            "total_relationships": record["total_relationships"],
+            "num_entities": record["num_entities"],
+            "num_episodes": record["num_episodes"]
         }
+        self._stats_cached_at = time.monotonic()
+
+        return dict(self._stats_cache)
 
     def close(self) -> None:
         """Close the Neo4j driver connection."""
@@ -0,0 +1,61 @@
+"""Refreshing a memory-mapped saved index must save and reload cleanly."""
+
+import os
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from langchain_community.embeddings import DeterministicFakeEmbedding
+
+from traditional_rag.rag_pipeline import TraditionalRAG
+
+
+SECTIONS = [f"Section {i}: the CloudStore API endpoint /v1/items/{i} returns item {i} as JSON." for i in range(40)]
+SOURCE = "\n\n".join(SECTIONS)
+
+
+def make_rag() -> TraditionalRAG:
+    rag = TraditionalRAG(openai_api_key="sk-test", chunk_size=200, chunk_overlap=0, embedding_cache_path=None)
+    # Offline, deterministic vectors instead of OpenAI embeddings
+    rag.embeddings = DeterministicFakeEmbedding(size=32)
+    return rag
+
+
+def test_refresh_unchanged_source_after_mmap_load():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "docs.txt")
+        index_path = os.path.join(tmp, "index")
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write(SOURCE)
+
+        rag = make_rag()
+        rag.build_index(rag.load_documents(source))
+        rag.save_index(index_path)
+        total = rag.vectorstore.index.ntotal
+
+        # Load mapped, refresh with nothing added, and save over the mapped file
+        rag = make_rag()
+        rag.load_index(index_path, mmap=True)
+        stats = rag.refresh_index(source, index_path)
+        assert stats["added"] == 0 and stats["removed"] == 0
+
+        # Only removals: drop the last sections from the source
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write("\n\n".join(SECTIONS[:20]))
+        rag = make_rag()
+        rag.load_index(index_path, mmap=True)
+        stats = rag.refresh_index(source, index_path)
+        assert stats["added"] == 0 and stats["removed"] > 0
+
+        reloaded = make_rag()
+        reloaded.load_index(index_path, mmap=True)
+        assert reloaded.vectorstore.index.ntotal + stats["compacted"] == total
+        assert reloaded.similarity_search("item 3", k=2)
+        assert not [name for name in os.listdir(index_path) if name.endswith(".tmp")]
+
+
+if __name__ == "__main__":
+    test_refresh_unchanged_source_after_mmap_load()
+    print("[OK] Index refresh after mmap load")
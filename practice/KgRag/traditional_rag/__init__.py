@@ -2,5 +2,6 @@
 
 from .rag_pipeline import TraditionalRAG
 from .query import query_rag
+from .embedding_cache import CachedEmbeddings
 
-__all__ = ['TraditionalRAG', 'query_rag']
+__all__ = ['TraditionalRAG', 'query_rag', 'CachedEmbeddings']
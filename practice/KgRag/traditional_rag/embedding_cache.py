@@ -0,0 +1,144 @@
+"""Persistent, content-addressed cache for document embeddings."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Dict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that stores every vector in SQLite.
+
+    Vectors are keyed by a SHA-256 hash of the embedding model name and the
+    text, so unchanged chunks are read from disk on the next run and only
+    new or edited chunks are sent to the underlying embeddings API. Query
+    vectors are only kept in a small in-memory LRU, so ad-hoc questions
+    never grow the on-disk cache.
+    """
+
+    BATCH_SIZE = 500  # keys per SELECT, below SQLite's variable limit
+    QUERY_CACHE_SIZE = 256  # query vectors kept in memory
+
+    def __init__(self, embeddings: Embeddings, model_name: str, db_path: str = "llm_cache/embeddings.db"):
+        """
+        Wrap an embeddings object with a persistent cache.
+
+        Args:
+            embeddings: Underlying LangChain embeddings (e.g. OpenAIEmbeddings)
+            model_name: Embedding model name, part of every cache key
+            db_path: Path to the SQLite cache file
+        """
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Fetch cached vectors for the given keys."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self.BATCH_SIZE):
+                batch = keys[start:start + self.BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, calling the underlying API only for uncached texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per text
+        """
+        keys = [self._key(text) for text in texts]
+        cached = self._lookup(list(dict.fromkeys(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        self.hits += len(texts) - sum(1 for key in keys if key in missing)
+        self.misses += len(missing)
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            new_items = dict(zip(missing.keys(), vectors))
+            self._store(new_items)
+            cached.update(new_items)
+
+        return [list(cached[key]) for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query, reusing the vector of recently repeated queries.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        key = self._key(text)
+        with self._lock:
+            vector = self._query_cache.get(key)
+            if vector is not None:
+                self._query_cache.move_to_end(key)
+                return list(vector)
+
+        vector = self.embeddings.embed_query(text)
+
+        with self._lock:
+            self._query_cache[key] = vector
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return list(vector)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters and the number of stored vectors."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
@@ -1,17 +1,29 @@
 """Traditional RAG Pipeline using LangChain, OpenAI, and FAISS."""
 
+import hashlib
+import json
 import os
 import time
-from typing import List, Dict, Any
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+import faiss
+
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import RetrievalQA
 from langchain.docstore.document import Document
 from langchain.prompts import PromptTemplate
 
+from .embedding_cache import CachedEmbeddings
+
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.jsonl"
+
 
 class TraditionalRAG:
     """Traditional RAG system using vector similarity search."""
@@ -22,7 +34,9 @@ class TraditionalRAG:
         model_name: str = "gpt-4-turbo-preview",
         embedding_model: str = "text-embedding-3-small",
         chunk_size: int = 1000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        embedding_cache_path: Optional[str] = "llm_cache/embeddings.db",
+        answer_cache=None
     ):
         """
         Initialize Traditional RAG system.
@@ -33,12 +47,16 @@ class TraditionalRAG:
             embedding_model: Embedding model to use
             chunk_size: Size of text chunks
             chunk_overlap: Overlap between chunks
+            embedding_cache_path: SQLite file caching chunk embeddings (None to disable)
+            answer_cache: Optional SemanticAnswerCache for repeated questions
         """
         self.openai_api_key = openai_api_key
         self.model_name = model_name
         self.embedding_model = embedding_model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.answer_cache = answer_cache
+        self.answer_namespace = None
 
         # Initialize components
         self.embeddings = OpenAIEmbeddings(
@@ -46,6 +64,14 @@ class TraditionalRAG:
             api_key=openai_api_key
         )
 
+        # Re-use embeddings of unchanged chunks across runs
+        if embedding_cache_path:
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                model_name=embedding_model,
+                db_path=embedding_cache_path
+            )
+
         self.llm = ChatOpenAI(
             model=model_name,
             temperature=0,
@@ -61,6 +87,11 @@ class TraditionalRAG:
         self.vectorstore = None
         self.qa_chain = None
 
+        # Docstore IDs of chunks removed from the source but not yet compacted away
+        self.tombstones = set()
+        # Whether the FAISS index is a read-only memory map (see load_index)
+        self._index_readonly = False
+
     def load_documents(self, file_path: str) -> List[Document]:
         """
         Load documents from file.
@@ -77,15 +108,32 @@ class TraditionalRAG:
         # Split into chunks
         chunks = self.text_splitter.split_text(content)
 
-        # Create Document objects
+        # Create Document objects, each with a content-derived ID
         documents = [
-            Document(page_content=chunk, metadata={"source": file_path, "chunk_id": i})
-            for i, chunk in enumerate(chunks)
+            Document(page_content=chunk, metadata={"source": file_path, "chunk_id": i, "doc_id": doc_id})
+            for i, (chunk, doc_id) in enumerate(zip(chunks, self._chunk_ids(file_path, chunks)))
         ]
 
         print(f"Loaded {len(documents)} chunks from {file_path}")
         return documents
 
+    @staticmethod
+    def _chunk_ids(source: str, chunks: List[str]) -> List[str]:
+        """
+        Derive stable IDs from chunk content.
+
+        An unchanged chunk keeps its ID across re-splits of the file, so it
+        can be matched against the saved index. Repeated identical chunks get
+        an occurrence suffix to keep IDs unique.
+        """
+        seen = defaultdict(int)
+        ids = []
+        for chunk in chunks:
+            digest = hashlib.sha256(f"{source}\n{chunk}".encode("utf-8")).hexdigest()[:32]
+            ids.append(f"{digest}-{seen[digest]}")
+            seen[digest] += 1
+        return ids
+
     def build_index(self, documents: List[Document]) -> None:
         """
         Build FAISS vector index from documents.
@@ -96,17 +144,134 @@ class TraditionalRAG:
         print("Building FAISS index...")
         start_time = time.time()
 
+        # Use content-derived IDs so later refreshes can diff against this index
+        ids = None
+        if all("doc_id" in doc.metadata for doc in documents):
+            ids = [doc.metadata["doc_id"] for doc in documents]
+
         self.vectorstore = FAISS.from_documents(
             documents=documents,
-            embedding=self.embeddings
+            embedding=self.embeddings,
+            ids=ids
         )
+        self.tombstones = set()
+        self._index_readonly = False
 
         build_time = time.time() - start_time
         print(f"FAISS index built in {build_time:.2f} seconds")
 
+        if isinstance(self.embeddings, CachedEmbeddings):
+            stats = self.embeddings.stats()
+            print(f"Embedding cache: {stats['hits']} hits, {stats['misses']} newly embedded")
+
         # Create QA chain
         self._create_qa_chain()
 
+    def update_index(self, documents: List[Document], compact_threshold: float = 0.2) -> Dict[str, int]:
+        """
+        Bring the index in line with a fresh split of a source file.
+
+        Chunks are matched by their content-derived doc_id. New chunks are
+        embedded and added; chunks that disappeared from the source are
+        tombstoned (hidden from retrieval) instead of being removed right
+        away. Once tombstones exceed compact_threshold of the index, they
+        are physically deleted in one compaction pass.
+
+        Args:
+            documents: Output of load_documents() for one source file
+            compact_threshold: Fraction of tombstoned vectors that triggers compaction
+
+        Returns:
+            Dictionary with 'added', 'removed', 'unchanged' and 'compacted' counts
+        """
+        if not self.vectorstore:
+            self.build_index(documents)
+            return {"added": len(documents), "removed": 0, "unchanged": 0, "compacted": 0}
+
+        start_time = time.time()
+        sources = {doc.metadata.get("source") for doc in documents}
+        docstore = self.vectorstore.docstore
+
+        existing_ids = set()
+        for doc_id in self.vectorstore.index_to_docstore_id.values():
+            doc = docstore.search(doc_id)
+            if isinstance(doc, Document) and doc.metadata.get("source") in sources:
+                existing_ids.add(doc_id)
+
+        incoming = {doc.metadata["doc_id"]: doc for doc in documents}
+        incoming_ids = set(incoming)
+
+        new_docs = [doc for doc_id, doc in incoming.items() if doc_id not in existing_ids]
+        revived = existing_ids & self.tombstones & incoming_ids
+        removed = (existing_ids - incoming_ids) - self.tombstones
+        unchanged = len(incoming) - len(new_docs)
+
+        self.tombstones -= revived
+        self.tombstones |= removed
+
+        if new_docs:
+            self._ensure_writable()
+            self.vectorstore.add_documents(new_docs, ids=[doc.metadata["doc_id"] for doc in new_docs])
+
+        compacted = 0
+        if self.tombstones and len(self.tombstones) > compact_threshold * self.vectorstore.index.ntotal:
+            compacted = self.compact_index()
+
+        self._create_qa_chain()
+
+        update_time = time.time() - start_time
+        print(f"Index updated in {update_time:.2f} seconds: {len(new_docs)} added, "
+              f"{len(removed)} removed, {unchanged} unchanged")
+
+        return {"added": len(new_docs), "removed": len(removed), "unchanged": unchanged, "compacted": compacted}
+
+    def compact_index(self) -> int:
+        """
+        Physically delete tombstoned vectors from the FAISS index.
+
+        Returns:
+            Number of vectors removed
+        """
+        if not self.vectorstore or not self.tombstones:
+            return 0
+
+        count = len(self.tombstones)
+        self._ensure_writable()
+        self.vectorstore.delete(list(self.tombstones))
+        self.tombstones = set()
+        print(f"Compacted index: removed {count} tombstoned vectors")
+        return count
+
+    def refresh_index(self, file_path: str, index_path: str, compact_threshold: float = 0.2) -> Dict[str, int]:
+        """
+        Re-ingest a source file into the saved index without a full rebuild.
+
+        Args:
+            file_path: Path to the document file
+            index_path: Directory of the saved FAISS index
+            compact_threshold: Fraction of tombstoned vectors that triggers compaction
+
+        Returns:
+            Update counts from update_index()
+        """
+        if not self.vectorstore and os.path.exists(index_path):
+            self.load_index(index_path)
+
+        documents = self.load_documents(file_path)
+        stats = self.update_index(documents, compact_threshold=compact_threshold)
+        self.save_index(index_path)
+        return stats
+
+    def _is_live(self, metadata: Dict[str, Any]) -> bool:
+        """Retrieval filter hiding tombstoned chunks."""
+        return metadata.get("doc_id") not in self.tombstones
+
+    def _search_kwargs(self, k: int) -> Dict[str, Any]:
+        """Search arguments that skip tombstoned chunks."""
+        if not self.tombstones:
+            return {"k": k}
+        return {"k": k, "filter": self._is_live, "fetch_k": k + len(self.tombstones)}
+
     def _create_qa_chain(self) -> None:
         """Create the QA chain with custom prompt."""
         prompt_template = """You are a helpful AI assistant answering questions about the CloudStore API documentation.
@@ -128,10 +293,34 @@ Answer: """
         self.qa_chain = RetrievalQA.from_chain_type(
             llm=self.llm,
             chain_type="stuff",
-            retriever=self.vectorstore.as_retriever(search_kwargs={"k": 4}),
+            retriever=self.vectorstore.as_retriever(search_kwargs=self._search_kwargs(4)),
             return_source_documents=True,
             chain_type_kwargs={"prompt": PROMPT}
         )
+        self._update_answer_namespace()
+
+    def _update_answer_namespace(self) -> None:
+        """
+        Point the answer cache at the current index contents.
+
+        The namespace is a fingerprint of the live chunk IDs (which are
+        content hashes) and the model, so rebuilding an unchanged index keeps
+        its cached answers, while any change to the index starts a fresh
+        namespace and drops the answers cached for older versions.
+        """
+        if self.answer_cache is None:
+            return
+
+        live_ids = sorted(
+            doc_id for doc_id in self.vectorstore.index_to_docstore_id.values()
+            if doc_id not in self.tombstones
+        )
+        digest = hashlib.sha256("\n".join([self.model_name] + live_ids).encode("utf-8")).hexdigest()[:16]
+        namespace = f"traditional_rag/{digest}"
+
+        if namespace != self.answer_namespace:
+            self.answer_cache.invalidate("traditional_rag", keep=namespace)
+            self.answer_namespace = namespace
 
     def query(self, question: str) -> Dict[str, Any]:
         """
@@ -149,30 +338,60 @@ Answer: """
         print(f"\nQuerying Traditional RAG: {question}")
         start_time = time.time()
 
-        # Execute query
-        result = self.qa_chain.invoke({"query": question})
+        if self.answer_cache is not None:
+            cached = self.answer_cache.get(self.answer_namespace, question)
+            if cached is not None:
+                cached["source_documents"] = [
+                    Document(page_content=doc["page_content"], metadata=doc["metadata"])
+                    for doc in cached["source_documents"]
+                ]
+                cached["metrics"]["query_time"] = time.time() - start_time
+                cached["metrics"]["retrieval_time"] = 0.0
+                cached["metrics"]["generation_time"] = 0.0
+                cached["metrics"]["cache_hit"] = True
+                return cached
+
+        # Run the chain's two stages separately so each can be timed
+        source_docs = self.qa_chain.retriever.invoke(question)
+        retrieval_time = time.time() - start_time
+
+        generation_start = time.time()
+        result = self.qa_chain.combine_documents_chain.invoke(
+            {"input_documents": source_docs, "question": question}
+        )
+        answer = result['output_text']
+        generation_time = time.time() - generation_start
 
         query_time = time.time() - start_time
 
-        # Extract results
-        answer = result['result']
-        source_docs = result['source_documents']
-
         # Calculate metrics
         num_tokens = len(answer.split())  # Rough estimate
         num_chunks = len(source_docs)
 
-        return {
+        response = {
             "answer": answer,
             "source_documents": source_docs,
             "metrics": {
                 "query_time": query_time,
+                "retrieval_time": retrieval_time,
+                "generation_time": generation_time,
                 "num_source_chunks": num_chunks,
                 "answer_tokens": num_tokens,
-                "retrieval_method": "vector_similarity"
+                "retrieval_method": "vector_similarity",
+                "cache_hit": False
             }
         }
 
+        if self.answer_cache is not None:
+            self.answer_cache.put(self.answer_namespace, question, {
+                **response,
+                "source_documents": [
+                    {"page_content": doc.page_content, "metadata": doc.metadata} for doc in source_docs
+                ]
+            })
+
+        return response
+
     def similarity_search(self, query: str, k: int = 4) -> List[Document]:
         """
         Perform similarity search without generation.
@@ -187,20 +406,113 @@ Answer: """
         if not self.vectorstore:
             raise ValueError("Index not built. Call build_index() first.")
 
-        return self.vectorstore.similarity_search(query, k=k)
+        return self.vectorstore.similarity_search(query, **self._search_kwargs(k))
 
     def save_index(self, path: str) -> None:
-        """Save FAISS index to disk."""
+        """
+        Save FAISS index to disk.
+
+        Vectors are written with FAISS's own serializer (index.faiss) and the
+        documents as JSON lines in index order (docstore.jsonl), so loading
+        needs no pickle and the vectors can be memory-mapped. Each file is
+        written to a temp file and renamed into place, so processes that
+        have the old index mapped keep reading a complete file.
+        """
         if self.vectorstore:
-            self.vectorstore.save_local(path)
+            os.makedirs(path, exist_ok=True)
+            # Never write over a file this index (or another process) still maps
+            self._ensure_writable()
+
+            index_file = os.path.join(path, INDEX_FILE)
+            faiss.write_index(self.vectorstore.index, index_file + ".tmp")
+
+            docstore = self.vectorstore.docstore
+            docstore_file = os.path.join(path, DOCSTORE_FILE)
+            with open(docstore_file + ".tmp", 'w', encoding='utf-8') as f:
+                for position in range(self.vectorstore.index.ntotal):
+                    doc_id = self.vectorstore.index_to_docstore_id[position]
+                    doc = docstore.search(doc_id)
+                    f.write(json.dumps({"id": doc_id, "page_content": doc.page_content,
+                                        "metadata": doc.metadata}) + "\n")
+
+            tombstone_file = os.path.join(path, "tombstones.json")
+            with open(tombstone_file + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(sorted(self.tombstones), f)
+
+            # Swap the new files in by rename, so existing mappings keep the old inode
+            for target in (index_file, docstore_file, tombstone_file):
+                os.replace(target + ".tmp", target)
             print(f"Index saved to {path}")
 
-    def load_index(self, path: str) -> None:
-        """Load FAISS index from disk."""
-        self.vectorstore = FAISS.load_local(
-            path,
-            embeddings=self.embeddings,
-            allow_dangerous_deserialization=True
-        )
+    def load_index(self, path: str, mmap: bool = True) -> None:
+        """
+        Load FAISS index from disk.
+
+        With mmap=True the vectors are memory-mapped read-only where the
+        installed FAISS supports it, so worker processes loading the same
+        index share it through the page cache instead of each holding a
+        copy. The index is copied into memory on the first update.
+
+        Indexes saved in LangChain's pickle format (index.pkl) still load,
+        but should be re-saved to switch to the safe format.
+
+        Args:
+            path: Directory of the saved index
+            mmap: Memory-map the vectors instead of reading them into RAM
+        """
+        if not os.path.exists(os.path.join(path, DOCSTORE_FILE)):
+            print(f"Loading legacy pickle index from {path}; call save_index() to convert it")
+            self.vectorstore = FAISS.load_local(
+                path,
+                embeddings=self.embeddings,
+                allow_dangerous_deserialization=True
+            )
+            self._index_readonly = False
+        else:
+            index_file = os.path.join(path, INDEX_FILE)
+            index = None
+            self._index_readonly = False
+            if mmap:
+                flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+                try:
+                    index = faiss.read_index(index_file, flags)
+                    self._index_readonly = True
+                except RuntimeError:
+                    # This FAISS build cannot map this index type
+                    index = None
+            if index is None:
+                index = faiss.read_index(index_file)
+
+            documents = {}
+            index_to_docstore_id = {}
+            with open(os.path.join(path, DOCSTORE_FILE), 'r', encoding='utf-8') as f:
+                for position, line in enumerate(f):
+                    record = json.loads(line)
+                    documents[record["id"]] = Document(page_content=record["page_content"],
+                                                       metadata=record["metadata"])
+                    index_to_docstore_id[position] = record["id"]
+
+            self.vectorstore = FAISS(
+                embedding_function=self.embeddings,
+                index=index,
+                docstore=InMemoryDocstore(documents),
+                index_to_docstore_id=index_to_docstore_id
+            )
+
+        tombstone_path = os.path.join(path, "tombstones.json")
+        if os.path.exists(tombstone_path):
+            with open(tombstone_path, 'r', encoding='utf-8') as f:
+                self.tombstones = set(json.load(f))
+        else:
+            self.tombstones = set()
+
         self._create_qa_chain()
         print(f"Index loaded from {path}")
+
+    def _ensure_writable(self) -> None:
+        """Copy a memory-mapped, read-only index into memory before modifying it."""
+        if self._index_readonly:
+            # clone_index would keep viewing the mapped file; a serialize
+            # round trip gives the index its own buffers
+            self.vectorstore.index = faiss.deserialize_index(faiss.serialize_index(self.vectorstore.index))
+            self._index_readonly = False
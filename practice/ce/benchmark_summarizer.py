@@ -0,0 +1,85 @@
+"""
+Summarization Cost Benchmark
+Compares re-summarizing the whole conversation every turn against the
+hierarchical rolling summarizer, using a local stub LLM (no API key needed).
+"""
+
+import random
+import shutil
+import tempfile
+
+from utils import (
+    print_header,
+    print_section,
+    print_success,
+    print_info,
+    RollingSummarizer,
+    StubSummarizer
+)
+from utils.rolling_summarizer import BLOCK_PROMPT
+
+
+TOPICS = ["lists", "dictionaries", "file handling", "pathlib", "sorting", "comprehensions", "sets", "tuples"]
+
+
+def make_turn(rng, turn):
+    """Build one synthetic user/assistant exchange."""
+    topic = rng.choice(TOPICS)
+    return [
+        {"role": "user", "content": f"Question {turn}: how do I work with {topic} in Python?"},
+        {"role": "assistant", "content": f"For {topic}, start with the built-in methods. "
+                                         f"Here is a detailed explanation number {turn} with examples and caveats."},
+    ]
+
+
+def main(turns=120, block_size=6, fan_in=4, model="gpt-3.5-turbo"):
+    """Run the benchmark."""
+    print_header("SUMMARIZATION COST BENCHMARK")
+    print_info(f"{turns} turns, block size {block_size}, fan-in {fan_in}, stub LLM")
+
+    rng = random.Random(7)
+    history = [{"role": "system", "content": "You are a helpful Python programming tutor."}]
+
+    naive_llm = StubSummarizer(model)
+    rolling_llm = StubSummarizer(model)
+    cache_dir = tempfile.mkdtemp(prefix="summary_cache_")
+
+    try:
+        rolling = RollingSummarizer(rolling_llm, block_size=block_size, fan_in=fan_in,
+                                    cache_dir=cache_dir, model=model)
+
+        for turn in range(1, turns + 1):
+            history.extend(make_turn(rng, turn))
+
+            # Naive: summarize the entire conversation text on every turn
+            text = "\n".join(f"{m['role']}: {m['content']}" for m in history if m['role'] != 'system')
+            naive_llm(BLOCK_PROMPT.format(text=text))
+
+            # Rolling: only new blocks (and their path to the root) cost a call
+            rolling.compress(history)
+
+        print_section("Results")
+        print(f"{'Strategy':<25} {'LLM calls':<15} {'Prompt tokens':<15}")
+        print('─' * 60)
+        print(f"{'Full re-summarization':<25} {naive_llm.calls:<15,} {naive_llm.input_tokens:<15,}")
+        print(f"{'Rolling hierarchical':<25} {rolling_llm.calls:<15,} {rolling_llm.input_tokens:<15,}")
+
+        saved_calls = naive_llm.calls - rolling_llm.calls
+        saved_tokens = naive_llm.input_tokens - rolling_llm.input_tokens
+        print()
+        print_success(f"Calls saved: {saved_calls:,} ({saved_calls / naive_llm.calls * 100:.1f}%)")
+        print_success(f"Prompt tokens saved: {saved_tokens:,} ({saved_tokens / naive_llm.input_tokens * 100:.1f}%)")
+
+        # A new process reusing the disk cache pays nothing for the same history
+        warm_llm = StubSummarizer(model)
+        warm = RollingSummarizer(warm_llm, block_size=block_size, fan_in=fan_in,
+                                 cache_dir=cache_dir, model=model)
+        warm.compress(history)
+        print_info(f"Restart with warm disk cache: {warm_llm.calls} LLM calls, "
+                   f"{warm.stats['cache_hits']} cached summaries reused\n")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
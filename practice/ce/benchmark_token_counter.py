@@ -0,0 +1,82 @@
+"""
+Token Counting Benchmark
+Compares the per-conversation loop against the batched token counting API.
+"""
+
+import random
+import time
+
+from utils import (
+    print_header,
+    print_section,
+    print_success,
+    print_info,
+    estimate_tokens_for_messages,
+    estimate_tokens_for_messages_many,
+    clear_token_cache
+)
+
+
+WORDS = (
+    "python list dict tuple set append extend sort reverse file read write path "
+    "context window token summary agent session message assistant user system"
+).split()
+
+
+def make_conversations(count, seed=42):
+    """Build synthetic stored conversations with varied lengths."""
+    rng = random.Random(seed)
+    conversations = []
+    for _ in range(count):
+        messages = [{"role": "system", "content": "You are a helpful Python programming assistant."}]
+        for turn in range(rng.randint(4, 30)):
+            role = "user" if turn % 2 == 0 else "assistant"
+            length = rng.randint(8, 120)
+            content = " ".join(rng.choice(WORDS) for _ in range(length))
+            messages.append({"role": role, "content": content})
+        conversations.append(messages)
+    return conversations
+
+
+def time_call(func, repeats=3):
+    """Return the best wall-clock time of several runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        clear_token_cache()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(num_conversations=2000, model="gpt-3.5-turbo"):
+    """Run the benchmark."""
+    print_header("TOKEN COUNTING BENCHMARK")
+
+    conversations = make_conversations(num_conversations)
+    total_messages = sum(len(c) for c in conversations)
+    print_info(f"{num_conversations:,} conversations, {total_messages:,} messages, model {model}")
+
+    # Warm the encoder registry so neither path pays the load cost
+    estimate_tokens_for_messages(conversations[0], model)
+
+    print_section("Results")
+
+    loop_result = [estimate_tokens_for_messages(c, model) for c in conversations]
+    batch_result = estimate_tokens_for_messages_many(conversations, model)
+    if list(batch_result) != loop_result:
+        raise AssertionError("Batched token counts do not match the per-conversation loop")
+    print_success("Batched counts match the per-conversation loop")
+
+    loop_time = time_call(lambda: [estimate_tokens_for_messages(c, model) for c in conversations])
+    batch_time = time_call(lambda: estimate_tokens_for_messages_many(conversations, model))
+
+    print(f"{'Path':<35} {'Seconds':<12} {'Conversations/sec':<20}")
+    print('─' * 70)
+    print(f"{'estimate_tokens_for_messages loop':<35} {loop_time:<12.3f} {num_conversations / loop_time:<20,.0f}")
+    print(f"{'estimate_tokens_for_messages_many':<35} {batch_time:<12.3f} {num_conversations / batch_time:<20,.0f}")
+    print(f"\nSpeedup: {loop_time / batch_time:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,8 +22,8 @@ from utils import (
     visualize_tokens,
     print_messages,
     count_tokens,
-    estimate_tokens_for_messages,
-    get_context_window_size
+    get_context_window_size,
+    TokenLedger
 )
 
 
@@ -95,6 +95,7 @@ def demo_context_write():
 
     # Track token growth
     token_history = []
+    ledger = TokenLedger(model)
 
     for i, question in enumerate(questions, 1):
         print(f"\n{'━' * 80}")
@@ -107,8 +108,9 @@ def demo_context_write():
         # Get chat history
         chat_history = assistant.chat_messages[user]
 
-        # Count tokens
-        total_tokens = estimate_tokens_for_messages(chat_history, model)
+        # Count tokens (the ledger only encodes messages it has not seen yet)
+        ledger.sync(chat_history)
+        total_tokens = ledger.total
         token_history.append({
             'turn': i,
             'tokens': total_tokens,
@@ -125,7 +127,7 @@ def demo_context_write():
             print(f"{last_msg['content']}\n")
 
         # Warning if approaching limit
-        percentage = (total_tokens / context_window) * 100
+        percentage = ledger.percentage()
         if percentage > 70:
             print(f"⚠️  WARNING: Context usage at {percentage:.1f}% - Consider context management!")
         elif percentage > 50:
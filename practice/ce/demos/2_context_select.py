@@ -24,7 +24,8 @@ from utils import (
     estimate_tokens_for_messages,
     get_context_window_size,
     print_info,
-    print_success
+    print_success,
+    MessageSelector
 )
 
 
@@ -39,47 +40,37 @@ def load_config():
         sys.exit(1)
 
 
-def select_relevant_messages(messages, keywords=None, max_messages=5, keep_system=True):
+def select_relevant_messages(messages, keywords=None, max_messages=5, keep_system=True,
+                             max_tokens=None, model="gpt-3.5-turbo", selector=None):
     """
     Select relevant messages from conversation history.
 
+    Messages are ranked through a MessageSelector's inverted keyword index and
+    added until the token budget is filled, instead of scanning every message
+    for every keyword. Pass a prebuilt selector to reuse its index across
+    several selections over the same history.
+
     Args:
         messages: List of message dictionaries
         keywords: List of keywords to match (if None, use recency)
-        max_messages: Maximum number of messages to keep
+        max_messages: Maximum number of messages to keep (None for budget only)
         keep_system: Whether to always keep system messages
+        max_tokens: Token budget (defaults to the model's context window minus a reply reserve)
+        model: Model name for token counting and the default budget
+        selector: Optional MessageSelector already built over messages
 
     Returns:
         Filtered list of messages
     """
-    selected = []
-
-    # Always keep system message if requested
-    if keep_system:
-        system_msgs = [m for m in messages if m.get('role') == 'system']
-        selected.extend(system_msgs)
-
-    # Get non-system messages
-    other_msgs = [m for m in messages if m.get('role') != 'system']
-
-    if keywords:
-        # Select messages containing keywords
-        relevant = []
-        for msg in other_msgs:
-            content = msg.get('content', '').lower()
-            if any(keyword.lower() in content for keyword in keywords):
-                relevant.append(msg)
-
-        # If we found relevant messages, use them; otherwise fall back to recent
-        if relevant:
-            selected.extend(relevant[-max_messages:])
-        else:
-            selected.extend(other_msgs[-max_messages:])
-    else:
-        # Just take the most recent messages
-        selected.extend(other_msgs[-max_messages:])
-
-    return selected
+    if selector is None:
+        selector = MessageSelector(messages, model=model)
+
+    return selector.select(
+        keywords=keywords,
+        max_tokens=max_tokens,
+        max_messages=max_messages,
+        keep_system=keep_system
+    )
 
 
 def demo_context_select():
@@ -122,6 +113,9 @@ def demo_context_select():
     # Calculate original token count
     original_tokens = estimate_tokens_for_messages(conversation_history, model)
 
+    # Index the history once; every selection below reuses it
+    selector = MessageSelector(conversation_history, model=model)
+
     print_info(f"Original conversation: {len(conversation_history)} messages")
     visualize_tokens(original_tokens, context_window, "Original Context")
 
@@ -131,7 +125,8 @@ def demo_context_select():
     recent_messages = select_relevant_messages(
         conversation_history,
         max_messages=4,  # Keep last 4 non-system messages
-        keep_system=True
+        keep_system=True,
+        selector=selector
     )
 
     recent_tokens = estimate_tokens_for_messages(recent_messages, model)
@@ -161,7 +156,8 @@ def demo_context_select():
         conversation_history,
         keywords=["list", "sort", "reverse"],
         max_messages=6,
-        keep_system=True
+        keep_system=True,
+        selector=selector
     )
 
     keyword_tokens = estimate_tokens_for_messages(keyword_messages, model)
@@ -25,7 +25,8 @@ from utils import (
     get_context_window_size,
     print_info,
     print_success,
-    count_tokens
+    count_tokens,
+    RollingSummarizer
 )
 
 
@@ -40,19 +41,30 @@ def load_config():
         sys.exit(1)
 
 
-def create_conversation_summary(messages, llm_config, model):
+SUMMARY_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".summary_cache")
+
+# Summarizer agents and rolling summarizers, reused per LLM configuration
+_summarizers = {}
+
+
+def get_rolling_summarizer(llm_config, model):
     """
-    Create a summary of conversation messages using an LLM.
+    Get the rolling summarizer for an LLM configuration, creating it on first use.
+
+    The summarizer agent pair is created once and its history cleared before
+    every request, instead of building new agents for each summary.
 
     Args:
-        messages: List of message dictionaries to summarize
         llm_config: LLM configuration
         model: Model name
 
     Returns:
-        Summary message dictionary
+        RollingSummarizer backed by a reusable summarizer agent
     """
-    # Create a summarizer agent
+    key = json.dumps(llm_config, sort_keys=True, default=str)
+    if key in _summarizers:
+        return _summarizers[key]
+
     summarizer = ConversableAgent(
         name="Summarizer",
         system_message="You are a summarization expert. Create concise summaries that preserve key information.",
@@ -60,32 +72,46 @@ def create_conversation_summary(messages, llm_config, model):
         human_input_mode="NEVER",
     )
 
-    # Format messages for summarization
-    conversation_text = "\n".join([
-        f"{msg['role']}: {msg['content']}"
-        for msg in messages
-        if msg['role'] != 'system'
-    ])
-
-    # Request summary
-    summary_request = f"""Summarize the following conversation, preserving key facts, decisions, and context.
-Be concise but include all important information:
-
-{conversation_text}
-
-Provide a summary in 2-3 sentences."""
-
-    # Create a temporary user agent for the request
     temp_user = ConversableAgent(
         name="TempUser",
         llm_config=False,
         human_input_mode="NEVER",
     )
 
-    # Get summary
-    temp_user.send(message=summary_request, recipient=summarizer, request_reply=True)
-    chat_history = summarizer.chat_messages[temp_user]
-    summary = chat_history[-1]['content']
+    def summarize(prompt):
+        summarizer.clear_history()
+        temp_user.clear_history()
+        temp_user.send(message=prompt, recipient=summarizer, request_reply=True)
+        return summarizer.chat_messages[temp_user][-1]['content']
+
+    _summarizers[key] = RollingSummarizer(
+        summarize,
+        block_size=6,
+        cache_dir=SUMMARY_CACHE_DIR,
+        namespace=model,
+        model=model
+    )
+    return _summarizers[key]
+
+
+def create_conversation_summary(messages, llm_config, model):
+    """
+    Create a summary of conversation messages using an LLM.
+
+    Messages are summarized in fixed-size blocks through a cached rolling
+    summarizer, so blocks that were summarized before (in this run or a
+    previous one) cost no LLM call.
+
+    Args:
+        messages: List of message dictionaries to summarize
+        llm_config: LLM configuration
+        model: Model name
+
+    Returns:
+        Summary message dictionary
+    """
+    rolling = get_rolling_summarizer(llm_config, model)
+    summary = rolling.summarize(messages, include_tail=True)
 
     return {
         "role": "system",
@@ -208,6 +234,9 @@ def demo_context_compress():
         {"messages": len(compressed_history_2), "tokens": compressed_tokens_2}
     )
 
+    stats = get_rolling_summarizer(llm_config, model).stats
+    print_info(f"Summarizer LLM calls: {stats['llm_calls']}, cached block summaries reused: {stats['cache_hits']}")
+
     # Strategy comparison
     print_section("Compression Strategy Comparison")
 
@@ -284,11 +284,17 @@ cooking_agent = ConversableAgent(name="Cooking", system_message="Cooking expert"
 # Pattern 2: Clear History
 agent.clear_history()  # Start fresh context
 
-# Pattern 3: Session-based
+# Pattern 3: Session-based (bounded, with LRU eviction and spill to disk)
+pool = SessionAgentPool(
+    lambda session_id, history: create_new_agent(),
+    max_sessions=1000,
+    max_total_tokens=2_000_000,
+    idle_timeout=1800,
+    spill_path="sessions.db",
+)
+
 def get_agent_for_session(session_id):
-    if session_id not in agents:
-        agents[session_id] = create_new_agent()
-    return agents[session_id]
+    return pool.get_agent(session_id)
 """
 
     print(code_example)
@@ -41,6 +41,8 @@ def check_config():
 
         print_success("Configuration loaded successfully")
         print_info(f"Model: {config.get('model', 'gpt-3.5-turbo')}")
+        if config.get('stream', False):
+            print_info("Streaming mode: on (simple_demo.py and run_demo.py show a live token meter, TTFT and tokens/sec)")
         return True
 
     except Exception as e:
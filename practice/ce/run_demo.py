@@ -52,14 +52,24 @@ for i, q in enumerate(questions, 1):
 
     messages.append({"role": "user", "content": q})
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=0.7,
-        max_tokens=100
-    )
-
-    answer = response.choices[0].message.content
+    if config.get('stream', False):
+        answer, stats = stream_chat_completion(
+            client, model, messages,
+            context_window=context_window,
+            label=f"Turn {i} - Streaming",
+            temperature=0.7,
+            max_tokens=100
+        )
+        print_stream_stats(stats, f"Turn {i} latency")
+    else:
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=100
+        )
+        answer = response.choices[0].message.content
+
     messages.append({"role": "assistant", "content": answer})
 
     print(f"{Fore.BLUE}AI:{Style.RESET_ALL} {answer}\n")
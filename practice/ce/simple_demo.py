@@ -17,7 +17,10 @@ from utils import (
     count_tokens,
     print_success,
     print_info,
-    print_warning
+    print_warning,
+    TokenLedger,
+    stream_chat_completion,
+    print_stream_stats
 )
 from colorama import Fore, Style
 
@@ -44,6 +47,7 @@ def demo_1_write():
     messages = [
         {"role": "system", "content": "You are a helpful Python programming assistant. Keep responses concise (2-3 sentences)."}
     ]
+    ledger = TokenLedger(model, messages)
 
     questions = [
         "What is a Python list?",
@@ -60,21 +64,34 @@ def demo_1_write():
 
         # Add user message
         messages.append({"role": "user", "content": question})
+        ledger.append(messages[-1])
 
         # Get AI response
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=150
-        )
+        if config.get('stream', False):
+            assistant_msg, stats = stream_chat_completion(
+                client, model, messages,
+                context_window=context_window,
+                label=f"Turn {i} - Streaming",
+                prompt_tokens=ledger.total,
+                temperature=0.7,
+                max_tokens=150
+            )
+            print_stream_stats(stats, f"Turn {i} latency")
+        else:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=150
+            )
+            assistant_msg = response.choices[0].message.content
 
         # Add assistant response
-        assistant_msg = response.choices[0].message.content
         messages.append({"role": "assistant", "content": assistant_msg})
+        ledger.append(messages[-1])
 
-        # Count tokens
-        total_tokens = estimate_tokens_for_messages(messages, model)
+        # Count tokens (only the new messages are encoded)
+        total_tokens = ledger.total
 
         print(f"{Fore.BLUE}Assistant:{Style.RESET_ALL} {assistant_msg}\n")
 
@@ -82,7 +99,7 @@ def demo_1_write():
         visualize_tokens(total_tokens, context_window, f"Turn {i} - Context Usage")
 
         # Warning
-        percentage = (total_tokens / context_window) * 100
+        percentage = ledger.percentage()
         if percentage > 70:
             print_warning(f"Context at {percentage:.1f}% - Consider management!")
 
@@ -90,7 +107,7 @@ def demo_1_write():
 
     print_section("Key Insight")
     print_success("Context grows with each exchange - management is essential!")
-    print(f"Final context: {len(messages)} messages, {estimate_tokens_for_messages(messages, model):,} tokens\n")
+    print(f"Final context: {len(messages)} messages, {ledger.total:,} tokens\n")
 
 
 def demo_2_select():
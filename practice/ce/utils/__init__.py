@@ -1,19 +1,45 @@
 """Utility functions for context engineering demos."""
 
-from .token_counter import count_tokens, estimate_tokens_for_messages, get_context_window_size, calculate_token_percentage
+from .model_registry import get_model_info, register_model
+from .token_counter import (
+    count_tokens, estimate_tokens_for_messages, get_context_window_size, calculate_token_percentage,
+    count_tokens_batch, estimate_tokens_for_messages_many,
+    get_encoder, get_token_cache_stats, clear_token_cache
+)
+from .token_ledger import TokenLedger
+from .message_selector import MessageSelector
+from .rolling_summarizer import RollingSummarizer, StubSummarizer
+from .session_pool import SessionAgentPool
 from .visualizer import (
     print_header, print_section, visualize_tokens, print_comparison,
-    print_messages, print_success, print_error, print_info, print_warning
+    print_messages, print_success, print_error, print_info, print_warning,
+    visualize_tokens_inline, print_stream_stats
 )
+from .streaming import stream_chat_completion
 
 __all__ = [
     'count_tokens',
     'estimate_tokens_for_messages',
+    'count_tokens_batch',
+    'estimate_tokens_for_messages_many',
     'get_context_window_size',
     'calculate_token_percentage',
+    'get_model_info',
+    'register_model',
+    'get_encoder',
+    'get_token_cache_stats',
+    'clear_token_cache',
+    'TokenLedger',
+    'MessageSelector',
+    'RollingSummarizer',
+    'StubSummarizer',
+    'SessionAgentPool',
     'print_header',
     'print_section',
     'visualize_tokens',
+    'visualize_tokens_inline',
+    'print_stream_stats',
+    'stream_chat_completion',
     'print_comparison',
     'print_messages',
     'print_success',
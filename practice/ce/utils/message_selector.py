@@ -0,0 +1,227 @@
+"""Token-budget-aware message selection for context management."""
+
+import bisect
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Optional, Callable, Sequence
+
+import numpy as np
+
+from .model_registry import get_model_info
+from .token_counter import get_encoder, get_context_window_size, _message_tokens
+
+
+REPLY_PRIMING_TOKENS = 3  # every reply is primed with <|start|>assistant<|message|>
+
+_WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+
+
+def _terms(text: str) -> List[str]:
+    """Split text into lowercase index terms."""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+class MessageSelector:
+    """
+    Select the most relevant messages of a history that fit a token budget.
+
+    The history is indexed once: every non-system message gets its token
+    count and an entry in an inverted keyword index. A selection only looks
+    at the messages that match the query keywords (keyword prefixes, so
+    'list' also matches 'lists'), ranks them with a heap and fills the
+    budget from the best match down. Messages are returned in their original
+    conversation order.
+
+    Optionally, an embedding function can be given to add cosine similarity
+    between the query and each message to the keyword score.
+    """
+
+    def __init__(self, messages: Iterable[Dict[str, Any]] = (), model: str = "gpt-3.5-turbo",
+                 embed_fn: Optional[Callable[[Sequence[str]], Any]] = None,
+                 similarity_weight: float = 1.0, recency_weight: float = 0.1):
+        """
+        Build the index for a conversation history.
+
+        Args:
+            messages: Conversation history to index
+            model: The model name used for token counting and the default budget
+            embed_fn: Optional callable mapping a list of texts to an embedding matrix
+            similarity_weight: Weight of embedding similarity in the score
+            recency_weight: Weight of message position in the score (tie-breaker)
+        """
+        self.model = model
+        self.embed_fn = embed_fn
+        self.similarity_weight = similarity_weight
+        self.recency_weight = recency_weight
+
+        self._encoding = get_encoder(model)
+        self._info = get_model_info(model)
+        self._messages: List[Dict[str, Any]] = []
+        self._counts: List[int] = []
+        self._system: List[int] = []
+        self._others: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._sorted_terms: List[str] = []
+        self._terms_dirty = False
+        self._embeddings: Optional[np.ndarray] = None
+
+        self.extend(messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def add(self, message: Dict[str, Any]):
+        """
+        Index one more message at the end of the history.
+
+        Args:
+            message: Message dictionary with 'role' and 'content' keys
+        """
+        self.extend([message])
+
+    def extend(self, messages: Iterable[Dict[str, Any]]):
+        """
+        Index several messages at the end of the history.
+
+        Args:
+            messages: Message dictionaries to add
+        """
+        new_texts = []
+        for message in messages:
+            index = len(self._messages)
+            self._messages.append(message)
+            self._counts.append(_message_tokens(message, self._encoding, self._info))
+
+            if message.get('role') == 'system':
+                self._system.append(index)
+                continue
+
+            self._others.append(index)
+            content = message.get('content') or ''
+            new_texts.append(content)
+            for term in set(_terms(content)):
+                if term not in self._postings:
+                    self._terms_dirty = True
+                self._postings[term].append(index)
+
+        if self.embed_fn is not None and new_texts:
+            vectors = self._normalize(np.asarray(self.embed_fn(new_texts), dtype=np.float32))
+            if self._embeddings is None:
+                self._embeddings = vectors
+            else:
+                self._embeddings = np.vstack([self._embeddings, vectors])
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length so dot products are cosine similarities."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _matching_postings(self, keyword: str) -> List[List[int]]:
+        """Find the posting lists of every indexed term starting with keyword."""
+        if self._terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._terms_dirty = False
+
+        matches = []
+        position = bisect.bisect_left(self._sorted_terms, keyword)
+        while position < len(self._sorted_terms) and self._sorted_terms[position].startswith(keyword):
+            matches.append(self._postings[self._sorted_terms[position]])
+            position += 1
+        return matches
+
+    def _keyword_scores(self, keywords: Iterable[str]) -> Dict[int, float]:
+        """Score candidate messages by the IDF of the keywords they contain."""
+        total = max(len(self._others), 1)
+        scores: Dict[int, float] = defaultdict(float)
+
+        for keyword in keywords:
+            for word in _terms(keyword):
+                matched = set()
+                for postings in self._matching_postings(word):
+                    matched.update(postings)
+                if not matched:
+                    continue
+                idf = math.log(1 + total / len(matched))
+                for index in matched:
+                    scores[index] += idf
+
+        return scores
+
+    def default_budget(self, reserve_tokens: int = 1000) -> int:
+        """
+        Token budget for the selected context.
+
+        Args:
+            reserve_tokens: Tokens kept free for the model's reply
+
+        Returns:
+            Context window size of the model minus the reserve
+        """
+        return max(get_context_window_size(self.model) - reserve_tokens, 0)
+
+    def select(self, keywords: Optional[Iterable[str]] = None, query: Optional[str] = None,
+               max_tokens: Optional[int] = None, max_messages: Optional[int] = None,
+               keep_system: bool = True) -> List[Dict[str, Any]]:
+        """
+        Select the highest-value messages that fit within a token budget.
+
+        Args:
+            keywords: Keywords to match (defaults to the words of query)
+            query: The upcoming user question, used for keywords and embedding similarity
+            max_tokens: Token budget (defaults to default_budget())
+            max_messages: Optional cap on the number of non-system messages
+            keep_system: Whether to always keep system messages
+
+        Returns:
+            Selected messages in their original order
+        """
+        budget = self.default_budget() if max_tokens is None else max_tokens
+        budget -= REPLY_PRIMING_TOKENS
+
+        chosen = []
+        if keep_system:
+            for index in self._system:
+                if self._counts[index] <= budget:
+                    chosen.append(index)
+                    budget -= self._counts[index]
+
+        if keywords is None and query:
+            keywords = _terms(query)
+
+        scores = self._keyword_scores(keywords) if keywords else {}
+
+        if query and self._embeddings is not None:
+            query_vector = self._normalize(np.asarray(self.embed_fn([query]), dtype=np.float32))[0]
+            similarities = self._embeddings @ query_vector
+            for position, index in enumerate(self._others):
+                scores[index] = scores.get(index, 0.0) + self.similarity_weight * float(similarities[position])
+
+        limit = len(self._others) if max_messages is None else max_messages
+        picked = 0
+
+        if scores:
+            # Rank only the candidates; recency breaks ties between equal scores
+            position_scale = self.recency_weight / max(len(self._messages), 1)
+            heap = [(-(score + index * position_scale), index) for index, score in scores.items()]
+            heapq.heapify(heap)
+            while heap and picked < limit and budget > 0:
+                _, index = heapq.heappop(heap)
+                if self._counts[index] <= budget:
+                    chosen.append(index)
+                    budget -= self._counts[index]
+                    picked += 1
+        else:
+            # Nothing matched: fall back to the most recent messages
+            for index in reversed(self._others):
+                if picked >= limit or self._counts[index] > budget:
+                    break
+                chosen.append(index)
+                budget -= self._counts[index]
+                picked += 1
+
+        chosen.sort()
+        return [self._messages[index] for index in chosen]
@@ -0,0 +1,80 @@
+"""Model registry: context window, output limit and tokenizer details per model."""
+
+import json
+import os
+import threading
+from typing import Dict, Any, Optional
+
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_registry.json")
+
+_registry: Optional[Dict[str, Any]] = None
+_lookup_cache: Dict[str, Dict[str, Any]] = {}
+_registry_lock = threading.Lock()
+
+
+def _load() -> Dict[str, Any]:
+    """Load the bundled registry table on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                with open(REGISTRY_PATH, 'r', encoding='utf-8') as f:
+                    table = json.load(f)
+                # Longest names first so prefix matching picks the most specific model
+                table["prefixes"] = sorted(table["models"], key=len, reverse=True)
+                _registry = table
+    return _registry
+
+
+def get_model_info(model: str) -> Dict[str, Any]:
+    """
+    Get the registry entry for a model.
+
+    Exact names are matched first, then the longest registered name that the
+    model starts with, so dated snapshots such as 'gpt-4o-mini-2024-07-18'
+    resolve to 'gpt-4o-mini'. Unknown models get the default entry.
+
+    Args:
+        model: The model name
+
+    Returns:
+        Dictionary with 'name', 'context_window', 'max_output', 'encoding',
+        'tokens_per_message', 'tokens_per_name' and 'matched' keys
+    """
+    info = _lookup_cache.get(model)
+    if info is not None:
+        return info
+
+    registry = _load()
+    with _registry_lock:
+        name = model if model in registry["models"] else next(
+            (prefix for prefix in registry["prefixes"] if model.startswith(prefix)), None
+        )
+
+        info = dict(registry["default"])
+        if name is not None:
+            info.update(registry["models"][name])
+        info["name"] = name or model
+        info["matched"] = name is not None
+
+        _lookup_cache[model] = info
+
+    return info
+
+
+def register_model(name: str, **fields):
+    """
+    Add a model to the registry or override fields of an existing entry.
+
+    Args:
+        name: Model name (also used as a prefix for dated snapshots)
+        **fields: Any of context_window, max_output, encoding, tokens_per_message, tokens_per_name
+    """
+    registry = _load()
+    with _registry_lock:
+        entry = dict(registry["models"].get(name, {}))
+        entry.update(fields)
+        registry["models"][name] = entry
+        registry["prefixes"] = sorted(registry["models"], key=len, reverse=True)
+        _lookup_cache.clear()
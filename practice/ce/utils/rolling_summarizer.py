@@ -0,0 +1,197 @@
+"""Hierarchical rolling summarization with an on-disk cache of block summaries."""
+
+import hashlib
+import json
+import os
+from typing import List, Dict, Any, Callable, Optional
+
+from .token_counter import count_tokens
+
+
+BLOCK_PROMPT = """Summarize the following conversation, preserving key facts, decisions, and context.
+Be concise but include all important information:
+
+{text}
+
+Provide a summary in 2-3 sentences."""
+
+MERGE_PROMPT = """The following are summaries of consecutive parts of one conversation, in order.
+Combine them into a single summary, preserving key facts, decisions, and context:
+
+{text}
+
+Provide a summary in 2-3 sentences."""
+
+
+class StubSummarizer:
+    """
+    Deterministic local stand-in for an LLM summarizer.
+
+    Keeps the first sentence of every content line of the prompt, so it needs
+    no API key and always returns the same output for the same input. Counts
+    calls and prompt tokens so benchmarks can compare summarization costs.
+    """
+
+    def __init__(self, model: str = "gpt-3.5-turbo", max_chars: int = 400):
+        self.model = model
+        self.max_chars = max_chars
+        self.calls = 0
+        self.input_tokens = 0
+
+    def __call__(self, prompt: str) -> str:
+        self.calls += 1
+        self.input_tokens += count_tokens(prompt, self.model)
+
+        body = prompt.split("\n\n")[1:-1]
+        lines = [line.strip() for part in body for line in part.splitlines() if line.strip()]
+        sentences = [line.split(". ")[0].rstrip(".") + "." for line in lines]
+        return " ".join(sentences)[:self.max_chars]
+
+
+class RollingSummarizer:
+    """
+    Summarize a growing conversation without re-summarizing old messages.
+
+    Messages are cut into fixed-size blocks. Each block is summarized once,
+    and every `fan_in` consecutive summaries at one level are merged into a
+    summary at the next level up, so the summaries form a tree. Every
+    summary is cached (in memory and, optionally, on disk) under a hash of
+    the prompt that produced it. Adding a block to a long session therefore
+    only costs the LLM calls for that block and its path to the root.
+    """
+
+    def __init__(self, summarize_fn: Callable[[str], str], block_size: int = 6, fan_in: int = 4,
+                 cache_dir: Optional[str] = None, namespace: str = "", model: str = "gpt-3.5-turbo"):
+        """
+        Create a rolling summarizer.
+
+        Args:
+            summarize_fn: Callable taking a prompt and returning the LLM's summary
+            block_size: Number of messages per leaf block
+            fan_in: Number of summaries merged into one at the next level
+            cache_dir: Directory for the on-disk summary cache (None for memory only)
+            namespace: Extra cache key component, e.g. the summarizing model's name
+            model: Model name used for token accounting
+        """
+        if block_size < 1 or fan_in < 2:
+            raise ValueError("block_size must be >= 1 and fan_in must be >= 2")
+
+        self.summarize_fn = summarize_fn
+        self.block_size = block_size
+        self.fan_in = fan_in
+        self.cache_dir = cache_dir
+        self.namespace = namespace
+        self.model = model
+
+        self._memory: Dict[str, str] = {}
+        self.stats = {"llm_calls": 0, "cache_hits": 0, "prompt_tokens": 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _summarize_cached(self, prompt: str) -> str:
+        """Run the summarizer for a prompt unless its result is already cached."""
+        key = hashlib.sha256(f"{self.namespace}\n{prompt}".encode("utf-8")).hexdigest()
+
+        if key in self._memory:
+            self.stats["cache_hits"] += 1
+            return self._memory[key]
+
+        if self.cache_dir and os.path.exists(self._cache_path(key)):
+            with open(self._cache_path(key), 'r', encoding='utf-8') as f:
+                summary = json.load(f)["summary"]
+            self._memory[key] = summary
+            self.stats["cache_hits"] += 1
+            return summary
+
+        summary = self.summarize_fn(prompt)
+        self.stats["llm_calls"] += 1
+        self.stats["prompt_tokens"] += count_tokens(prompt, self.model)
+        self._memory[key] = summary
+
+        if self.cache_dir:
+            # Write then rename so a crash never leaves a half-written entry
+            tmp_path = self._cache_path(key) + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"summary": summary}, f)
+            os.replace(tmp_path, self._cache_path(key))
+
+        return summary
+
+    @staticmethod
+    def _format(messages: List[Dict[str, Any]]) -> str:
+        return "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+
+    def _summarize_block(self, block: List[Dict[str, Any]]) -> str:
+        return self._summarize_cached(BLOCK_PROMPT.format(text=self._format(block)))
+
+    def _merge(self, summaries: List[str]) -> str:
+        if len(summaries) == 1:
+            return summaries[0]
+        text = "\n\n".join(f"Part {i}: {summary}" for i, summary in enumerate(summaries, 1))
+        return self._summarize_cached(MERGE_PROMPT.format(text=text))
+
+    def split(self, messages: List[Dict[str, Any]]):
+        """
+        Split a history into complete blocks and the not-yet-full tail.
+
+        Args:
+            messages: Conversation history (system messages are ignored)
+
+        Returns:
+            Tuple of (list of complete blocks, list of tail messages)
+        """
+        others = [msg for msg in messages if msg.get('role') != 'system']
+        full = len(others) - len(others) % self.block_size
+        blocks = [others[i:i + self.block_size] for i in range(0, full, self.block_size)]
+        return blocks, others[full:]
+
+    def summarize(self, messages: List[Dict[str, Any]], include_tail: bool = False) -> str:
+        """
+        Summarize a conversation history.
+
+        Args:
+            messages: Conversation history to summarize
+            include_tail: Also summarize the trailing messages that do not fill a block
+
+        Returns:
+            Summary text ('' if there is nothing to summarize)
+        """
+        blocks, tail = self.split(messages)
+        if include_tail and tail:
+            blocks.append(tail)
+        if not blocks:
+            return ""
+
+        # Leaves, then complete groups of fan_in summaries merged level by level.
+        # Incomplete groups are carried up unchanged and joined at the root.
+        level = [self._summarize_block(block) for block in blocks]
+        carried: List[str] = []
+        while len(level) >= self.fan_in:
+            full = len(level) - len(level) % self.fan_in
+            carried = level[full:] + carried
+            level = [self._merge(level[i:i + self.fan_in]) for i in range(0, full, self.fan_in)]
+
+        return self._merge(level + carried)
+
+    def compress(self, messages: List[Dict[str, Any]], keep_system: bool = True) -> List[Dict[str, Any]]:
+        """
+        Replace the complete blocks of a history with a single summary message.
+
+        Args:
+            messages: Conversation history to compress
+            keep_system: Whether to keep the original system messages
+
+        Returns:
+            System messages, the summary message and the recent tail messages
+        """
+        summary = self.summarize(messages)
+        _, tail = self.split(messages)
+
+        compressed = [msg for msg in messages if msg.get('role') == 'system'] if keep_system else []
+        if summary:
+            compressed.append({"role": "system", "content": f"Previous conversation summary: {summary}"})
+        return compressed + tail
@@ -0,0 +1,235 @@
+"""Bounded pool of per-session agents and histories for context isolation."""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Optional
+
+from .token_ledger import TokenLedger
+
+
+class _Session:
+    """One isolated session: its agent and its token-tracked history."""
+
+    __slots__ = ("agent", "ledger", "last_used")
+
+    def __init__(self, agent: Any, ledger: TokenLedger):
+        self.agent = agent
+        self.ledger = ledger
+        self.last_used = time.monotonic()
+
+
+class SessionAgentPool:
+    """
+    Keep one isolated agent and history per session, within fixed limits.
+
+    Sessions live in an LRU order. When the pool exceeds max_sessions or
+    max_total_tokens, or a session has been idle longer than idle_timeout,
+    sessions are evicted from the least recently used end. With a spill_path,
+    evicted histories are written to a SQLite file as zlib-compressed JSON
+    and rehydrated lazily the next time their session is requested, so memory
+    stays flat while no conversation is lost.
+    """
+
+    def __init__(self, agent_factory: Callable[[str, List[Dict[str, Any]]], Any],
+                 max_sessions: int = 1000, max_total_tokens: Optional[int] = None,
+                 idle_timeout: Optional[float] = None, spill_path: Optional[str] = None,
+                 model: str = "gpt-3.5-turbo"):
+        """
+        Create a session pool.
+
+        Args:
+            agent_factory: Callable taking (session_id, history) and returning a new agent
+            max_sessions: Maximum number of sessions kept in memory
+            max_total_tokens: Maximum tokens across all in-memory histories (None for no limit)
+            idle_timeout: Seconds after which an unused session is evicted (None for no timeout)
+            spill_path: SQLite file for evicted histories (None to drop them)
+            model: Model name used for token counting
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+
+        self.agent_factory = agent_factory
+        self.max_sessions = max_sessions
+        self.max_total_tokens = max_total_tokens
+        self.idle_timeout = idle_timeout
+        self.model = model
+
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._total_tokens = 0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "spills": 0, "rehydrations": 0}
+
+        self._store = None
+        if spill_path:
+            self._store = sqlite3.connect(spill_path, check_same_thread=False)
+            self._store.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, history BLOB NOT NULL)"
+            )
+            self._store.commit()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    @property
+    def total_tokens(self) -> int:
+        """Tokens across all in-memory session histories."""
+        return self._total_tokens
+
+    def get_agent(self, session_id: str) -> Any:
+        """
+        Get the agent for a session, creating or rehydrating it if needed.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The session's agent
+        """
+        with self._lock:
+            return self._get_session(session_id).agent
+
+    def get_history(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Get a copy of a session's message history.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            List of message dictionaries
+        """
+        with self._lock:
+            return self._get_session(session_id).ledger.messages
+
+    def get_tokens(self, session_id: str) -> int:
+        """Estimated tokens of a session's history."""
+        with self._lock:
+            return self._get_session(session_id).ledger.total
+
+    def add_message(self, session_id: str, message: Dict[str, Any]) -> int:
+        """
+        Append a message to a session's history and enforce the pool limits.
+
+        Args:
+            session_id: Session identifier
+            message: Message dictionary with 'role' and 'content' keys
+
+        Returns:
+            Number of tokens the message added
+        """
+        with self._lock:
+            session = self._get_session(session_id)
+            num_tokens = session.ledger.append(message)
+            self._total_tokens += num_tokens
+            self._enforce_limits(keep=session_id)
+            return num_tokens
+
+    def evict(self, session_id: str, spill: bool = True):
+        """
+        Remove a session from memory.
+
+        Args:
+            session_id: Session identifier
+            spill: Whether to write the history to the spill store (if configured)
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return
+
+            self._total_tokens -= session.ledger.total
+            self.stats["evictions"] += 1
+
+            if spill and self._store is not None:
+                payload = zlib.compress(json.dumps(session.ledger.messages).encode("utf-8"))
+                self._store.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, history) VALUES (?, ?)",
+                    (session_id, payload)
+                )
+                self._store.commit()
+                self.stats["spills"] += 1
+
+    def evict_idle(self) -> int:
+        """
+        Evict every session idle for longer than idle_timeout.
+
+        Returns:
+            Number of sessions evicted
+        """
+        if self.idle_timeout is None:
+            return 0
+
+        with self._lock:
+            cutoff = time.monotonic() - self.idle_timeout
+            evicted = 0
+            # LRU order means idle sessions are all at the front
+            while self._sessions:
+                session_id, session = next(iter(self._sessions.items()))
+                if session.last_used > cutoff:
+                    break
+                self.evict(session_id)
+                evicted += 1
+            return evicted
+
+    def close(self):
+        """Spill every in-memory session and close the spill store."""
+        with self._lock:
+            for session_id in list(self._sessions):
+                self.evict(session_id)
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+
+    def _get_session(self, session_id: str) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self.stats["hits"] += 1
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return session
+
+        self.stats["misses"] += 1
+        history = self._load_spilled(session_id)
+        session = _Session(self.agent_factory(session_id, history), TokenLedger(self.model, history))
+        self._sessions[session_id] = session
+        self._total_tokens += session.ledger.total
+        self._enforce_limits(keep=session_id)
+        return session
+
+    def _load_spilled(self, session_id: str) -> List[Dict[str, Any]]:
+        """Take a session's history out of the spill store, if it was spilled."""
+        if self._store is None:
+            return []
+
+        row = self._store.execute(
+            "SELECT history FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return []
+
+        self._store.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        self._store.commit()
+        self.stats["rehydrations"] += 1
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def _enforce_limits(self, keep: str):
+        """Evict idle, then least recently used sessions until within limits."""
+        self.evict_idle()
+
+        def over_limits():
+            if len(self._sessions) > self.max_sessions:
+                return True
+            return self.max_total_tokens is not None and self._total_tokens > self.max_total_tokens
+
+        while over_limits():
+            victim = next((sid for sid in self._sessions if sid != keep), None)
+            if victim is None:
+                break
+            self.evict(victim)
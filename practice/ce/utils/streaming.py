@@ -0,0 +1,80 @@
+"""Streaming chat completions with a live token meter and latency stats."""
+
+import time
+from typing import List, Dict, Any, Optional
+
+from .token_counter import count_tokens, estimate_tokens_for_messages, get_context_window_size
+from .visualizer import visualize_tokens_inline
+
+
+def stream_chat_completion(client, model: str, messages: List[Dict[str, Any]],
+                           context_window: Optional[int] = None, label: str = "Streaming",
+                           prompt_tokens: Optional[int] = None, refresh_every: int = 5,
+                           **create_kwargs):
+    """
+    Run a streaming chat completion while updating a token meter.
+
+    The meter starts at the prompt's token count and grows with every chunk
+    received (OpenAI sends roughly one token per content chunk), so the bar
+    moves as the answer arrives. When the stream ends the meter line is
+    cleared and the output is counted exactly.
+
+    Args:
+        client: OpenAI client
+        model: The model name
+        messages: Messages sent as the prompt
+        context_window: Context window size (defaults to the model's)
+        label: Label for the meter
+        prompt_tokens: Token count of messages, if already known (e.g. from a TokenLedger)
+        refresh_every: Redraw the meter every this many chunks
+        **create_kwargs: Extra arguments for client.chat.completions.create
+
+    Returns:
+        Tuple of (answer text, stats dictionary with 'ttft', 'duration',
+        'output_tokens', 'tokens_per_sec' and 'total_tokens' keys)
+    """
+    if context_window is None:
+        context_window = get_context_window_size(model)
+    if prompt_tokens is None:
+        prompt_tokens = estimate_tokens_for_messages(messages, model)
+
+    start = time.perf_counter()
+    first_token_at = None
+    parts = []
+    chunks = 0
+
+    stream = client.chat.completions.create(model=model, messages=messages, stream=True, **create_kwargs)
+
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+        parts.append(delta)
+        chunks += 1
+
+        if chunks % refresh_every == 0:
+            visualize_tokens_inline(prompt_tokens + chunks, context_window, label)
+
+    end = time.perf_counter()
+    answer = "".join(parts)
+    output_tokens = count_tokens(answer, model)
+
+    ttft = (first_token_at - start) if first_token_at is not None else end - start
+    generation_time = end - (first_token_at if first_token_at is not None else start)
+    stats = {
+        "ttft": ttft,
+        "duration": end - start,
+        "output_tokens": output_tokens,
+        "tokens_per_sec": output_tokens / generation_time if generation_time > 0 else 0.0,
+        "total_tokens": prompt_tokens + output_tokens,
+    }
+
+    # Clear the in-place meter; the caller prints the final usage
+    print("\r" + " " * 100 + "\r", end="", flush=True)
+
+    return answer, stats
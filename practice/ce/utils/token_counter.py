@@ -1,7 +1,110 @@
 """Token counting utilities for context management."""
 
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Sequence
+
+import numpy as np
 import tiktoken
-from typing import List, Dict, Any
+
+from .model_registry import get_model_info
+
+
+# Process-wide encoder registry, loaded lazily: encoding name (for registered
+# models) or model name (for models resolved by tiktoken) -> tiktoken Encoding
+_encoders: Dict[str, "tiktoken.Encoding"] = {}
+_encoders_lock = threading.Lock()
+
+# Bounded LRU of token counts keyed by (encoding name, content hash)
+TOKEN_CACHE_SIZE = 4096
+_token_cache: "OrderedDict[tuple, int]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+# Worker threads used by tiktoken's batch encoder
+BATCH_NUM_THREADS = 8
+
+
+def get_encoder(model: str = "gpt-3.5-turbo") -> "tiktoken.Encoding":
+    """
+    Get the tiktoken encoder for a model, loading it only on first use.
+
+    Args:
+        model: The model name to use for encoding
+
+    Returns:
+        The cached tiktoken Encoding for the model
+    """
+    info = get_model_info(model)
+    key = info["encoding"] if info["matched"] else model
+
+    encoding = _encoders.get(key)
+    if encoding is not None:
+        return encoding
+
+    with _encoders_lock:
+        encoding = _encoders.get(key)
+        if encoding is None:
+            if info["matched"]:
+                encoding = tiktoken.get_encoding(info["encoding"])
+            else:
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding(info["encoding"])
+            _encoders[key] = encoding
+
+    return encoding
+
+
+def _cached_token_count(text: str, encoding: "tiktoken.Encoding") -> int:
+    """Count tokens for text, reusing a previous result for identical content."""
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    key = (encoding.name, digest)
+
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached is not None:
+            _token_cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return cached
+        _cache_stats["misses"] += 1
+
+    num_tokens = len(encoding.encode(text))
+
+    with _token_cache_lock:
+        _token_cache[key] = num_tokens
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+    return num_tokens
+
+
+def get_token_cache_stats() -> Dict[str, int]:
+    """
+    Get hit/miss counters for the token count cache.
+
+    Returns:
+        Dictionary with 'hits', 'misses', 'size', 'max_size' and 'encoders' keys
+    """
+    with _token_cache_lock:
+        return {
+            "hits": _cache_stats["hits"],
+            "misses": _cache_stats["misses"],
+            "size": len(_token_cache),
+            "max_size": TOKEN_CACHE_SIZE,
+            "encoders": len(_encoders),
+        }
+
+
+def clear_token_cache():
+    """Clear cached token counts and reset the hit/miss counters."""
+    with _token_cache_lock:
+        _token_cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
 
 
 def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
@@ -15,12 +118,7 @@ def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
     Returns:
         Number of tokens in the text
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
-
-    return len(encoding.encode(text))
+    return _cached_token_count(text, get_encoder(model))
 
 
 def estimate_tokens_for_messages(messages: List[Dict[str, Any]], model: str = "gpt-3.5-turbo") -> int:
@@ -37,47 +135,117 @@ def estimate_tokens_for_messages(messages: List[Dict[str, Any]], model: str = "g
     Returns:
         Estimated total number of tokens
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
-
-    tokens_per_message = 3  # every message follows <|start|>{role/name}\n{content}<|end|>\n
-    tokens_per_name = 1
+    encoding = get_encoder(model)
+    info = get_model_info(model)
 
     num_tokens = 0
     for message in messages:
-        num_tokens += tokens_per_message
-        for key, value in message.items():
-            if isinstance(value, str):
-                num_tokens += len(encoding.encode(value))
-                if key == "name":
-                    num_tokens += tokens_per_name
+        num_tokens += _message_tokens(message, encoding, info)
 
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
     return num_tokens
 
 
+def _message_tokens(message: Dict[str, Any], encoding: "tiktoken.Encoding", info: Dict[str, Any]) -> int:
+    """Count the tokens one message contributes, including formatting overhead."""
+    tokens_per_message = info["tokens_per_message"]  # every message follows <|start|>{role/name}\n{content}<|end|>\n
+    tokens_per_name = info["tokens_per_name"]
+
+    num_tokens = tokens_per_message
+    for key, value in message.items():
+        if isinstance(value, str):
+            num_tokens += _cached_token_count(value, encoding)
+            if key == "name":
+                num_tokens += tokens_per_name
+
+    return num_tokens
+
+
+def count_tokens_batch(texts: Sequence[str], model: str = "gpt-3.5-turbo",
+                       num_threads: int = BATCH_NUM_THREADS) -> np.ndarray:
+    """
+    Count tokens for many text strings in one batched call.
+
+    Duplicate strings are encoded once, and the unique strings are encoded
+    with tiktoken's batch encoder across a thread pool. The per-string LRU
+    used by count_tokens is bypassed so bulk jobs do not evict it.
+
+    Args:
+        texts: The text strings to count tokens for
+        model: The model name to use for encoding
+        num_threads: Number of threads for the batch encoder
+
+    Returns:
+        NumPy array of token counts, one per input string
+    """
+    if len(texts) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    encoding = get_encoder(model)
+    unique_texts = list(dict.fromkeys(texts))
+    encoded = encoding.encode_batch(unique_texts, num_threads=num_threads)
+    unique_counts = {text: len(tokens) for text, tokens in zip(unique_texts, encoded)}
+
+    return np.fromiter((unique_counts[text] for text in texts), dtype=np.int64, count=len(texts))
+
+
+def estimate_tokens_for_messages_many(conversations: Sequence[List[Dict[str, Any]]],
+                                      model: str = "gpt-3.5-turbo",
+                                      num_threads: int = BATCH_NUM_THREADS) -> np.ndarray:
+    """
+    Estimate token usage for many conversations at once.
+
+    Gives the same result as calling estimate_tokens_for_messages on each
+    conversation, but all message strings are counted in a single batch.
+
+    Args:
+        conversations: List of conversations, each a list of message dictionaries
+        model: The model name to use for encoding
+        num_threads: Number of threads for the batch encoder
+
+    Returns:
+        NumPy array of estimated token totals, one per conversation
+    """
+    info = get_model_info(model)
+    tokens_per_message = info["tokens_per_message"]
+    tokens_per_name = info["tokens_per_name"]
+
+    totals = np.full(len(conversations), 3, dtype=np.int64)  # reply priming per conversation
+    texts = []
+    owners = []
+
+    for index, messages in enumerate(conversations):
+        totals[index] += tokens_per_message * len(messages)
+        for message in messages:
+            for key, value in message.items():
+                if isinstance(value, str):
+                    texts.append(value)
+                    owners.append(index)
+                    if key == "name":
+                        totals[index] += tokens_per_name
+
+    if texts:
+        counts = count_tokens_batch(texts, model, num_threads)
+        totals += np.bincount(np.asarray(owners, dtype=np.int64), weights=counts,
+                              minlength=len(conversations)).astype(np.int64)
+
+    return totals
+
+
 def get_context_window_size(model: str) -> int:
     """
     Get the context window size for a given model.
 
+    Sizes come from the bundled model registry (see model_registry.py);
+    dated snapshots resolve through prefix matching.
+
     Args:
         model: The model name
 
     Returns:
         Context window size in tokens
     """
-    context_windows = {
-        "gpt-3.5-turbo": 4096,
-        "gpt-3.5-turbo-16k": 16384,
-        "gpt-4": 8192,
-        "gpt-4-32k": 32768,
-        "gpt-4-turbo": 128000,
-        "gpt-4-turbo-preview": 128000,
-    }
-
-    return context_windows.get(model, 4096)
+    return get_model_info(model)["context_window"]
 
 
 def calculate_token_percentage(used_tokens: int, model: str = "gpt-3.5-turbo") -> float:
@@ -0,0 +1,156 @@
+"""Running token ledger for conversations that grow one message at a time."""
+
+from collections import deque
+from typing import List, Dict, Any, Iterable, Deque
+
+from .model_registry import get_model_info
+from .token_counter import get_encoder, get_context_window_size, calculate_token_percentage, _message_tokens
+
+
+REPLY_PRIMING_TOKENS = 3  # every reply is primed with <|start|>assistant<|message|>
+
+
+class TokenLedger:
+    """
+    Track the token usage of a conversation incrementally.
+
+    Each message is counted once when it is appended and its count is kept
+    alongside it, so total and percentage queries never re-encode the
+    history. Messages and counts are held in deques, so evicting the oldest
+    message is constant time as well. The total always equals estimate_tokens_for_messages() over the
+    messages currently in the ledger.
+    """
+
+    def __init__(self, model: str = "gpt-3.5-turbo", messages: Iterable[Dict[str, Any]] = ()):
+        """
+        Create a ledger, optionally seeded with existing messages.
+
+        Args:
+            model: The model name to use for encoding
+            messages: Messages already in the conversation
+        """
+        self.model = model
+        self.context_window = get_context_window_size(model)
+        self._encoding = get_encoder(model)
+        self._info = get_model_info(model)
+        self._messages: Deque[Dict[str, Any]] = deque()
+        self._counts: Deque[int] = deque()
+        self._message_tokens_total = 0
+        self.extend(messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """Messages currently tracked by the ledger (read-only copy)."""
+        return list(self._messages)
+
+    @property
+    def total(self) -> int:
+        """Total estimated tokens for the tracked messages."""
+        return self._message_tokens_total + REPLY_PRIMING_TOKENS
+
+    @property
+    def last_count(self) -> int:
+        """Token count of the most recently appended message."""
+        return self._counts[-1] if self._counts else 0
+
+    def append(self, message: Dict[str, Any]) -> int:
+        """
+        Add a message to the ledger.
+
+        Args:
+            message: Message dictionary with 'role' and 'content' keys
+
+        Returns:
+            Number of tokens the message added
+        """
+        num_tokens = _message_tokens(message, self._encoding, self._info)
+        self._messages.append(message)
+        self._counts.append(num_tokens)
+        self._message_tokens_total += num_tokens
+        return num_tokens
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add several messages to the ledger.
+
+        Args:
+            messages: Message dictionaries to add
+
+        Returns:
+            Number of tokens the messages added
+        """
+        return sum(self.append(message) for message in messages)
+
+    def sync(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Catch up with a history list that is only ever appended to.
+
+        Useful with agent chat histories such as AutoGen's chat_messages,
+        where the ledger only needs to count the messages it has not seen.
+
+        Args:
+            messages: The full, append-only conversation history
+
+        Returns:
+            Number of tokens the new messages added
+        """
+        return self.extend(messages[len(self._messages):])
+
+    def pop(self, index: int = 0) -> Dict[str, Any]:
+        """
+        Evict a message by position (the oldest message by default).
+
+        Args:
+            index: Position of the message to evict
+
+        Returns:
+            The evicted message
+        """
+        if index == 0:
+            message = self._messages.popleft()
+            self._message_tokens_total -= self._counts.popleft()
+            return message
+
+        message = self._messages[index]
+        self._message_tokens_total -= self._counts[index]
+        del self._messages[index]
+        del self._counts[index]
+        return message
+
+    def remove(self, message: Dict[str, Any]):
+        """
+        Evict a specific message.
+
+        Args:
+            message: The message to evict (matched by identity first, then equality)
+
+        Raises:
+            ValueError: If the message is not tracked by the ledger
+        """
+        for index, tracked in enumerate(self._messages):
+            if tracked is message:
+                self.pop(index)
+                return
+        self.pop(self._messages.index(message))
+
+    def clear(self):
+        """Remove every message from the ledger."""
+        self._messages.clear()
+        self._counts.clear()
+        self._message_tokens_total = 0
+
+    def percentage(self) -> float:
+        """
+        Percentage of the model's context window currently used.
+
+        Returns:
+            Percentage of context window used (0-100)
+        """
+        return calculate_token_percentage(self.total, self.model)
+
+    def remaining(self) -> int:
+        """Tokens left in the model's context window."""
+        return self.context_window - self.total
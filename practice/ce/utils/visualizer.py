@@ -1,7 +1,7 @@
 """Visual output utilities for context engineering demos."""
 
 from colorama import init, Fore, Back, Style
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # Initialize colorama for Windows support
 init(autoreset=True)
@@ -21,18 +21,10 @@ def print_section(title: str):
     print(f"{'-' * 80}{Style.RESET_ALL}\n")
 
 
-def visualize_tokens(used_tokens: int, max_tokens: int, label: str = "Context Usage"):
-    """
-    Visualize token usage with a progress bar.
-
-    Args:
-        used_tokens: Number of tokens used
-        max_tokens: Maximum tokens available
-        label: Label for the visualization
-    """
+def _token_bar(used_tokens: int, max_tokens: int, bar_length: int = 50):
+    """Build the usage percentage, color and progress bar for a token count."""
     percentage = (used_tokens / max_tokens) * 100
-    bar_length = 50
-    filled_length = int(bar_length * used_tokens // max_tokens)
+    filled_length = min(int(bar_length * used_tokens // max_tokens), bar_length)
 
     # Color based on usage percentage
     if percentage < 50:
@@ -43,12 +35,59 @@ def visualize_tokens(used_tokens: int, max_tokens: int, label: str = "Context Us
         color = Fore.RED
 
     bar = '#' * filled_length + '-' * (bar_length - filled_length)
+    return percentage, color, bar
+
+
+def visualize_tokens(used_tokens: int, max_tokens: Optional[int] = None, label: str = "Context Usage",
+                     model: str = "gpt-3.5-turbo"):
+    """
+    Visualize token usage with a progress bar.
+
+    Args:
+        used_tokens: Number of tokens used
+        max_tokens: Maximum tokens available (defaults to the model's context window)
+        label: Label for the visualization
+        model: Model name used when max_tokens is not given
+    """
+    if max_tokens is None:
+        from .token_counter import get_context_window_size
+        max_tokens = get_context_window_size(model)
+
+    percentage, color, bar = _token_bar(used_tokens, max_tokens)
 
     print(f"{Fore.CYAN}{label}:{Style.RESET_ALL}")
     print(f"{color}{bar}{Style.RESET_ALL} {percentage:.1f}%")
     print(f"Tokens: {used_tokens:,} / {max_tokens:,}\n")
 
 
+def visualize_tokens_inline(used_tokens: int, max_tokens: int, label: str = "Context Usage"):
+    """
+    Redraw a one-line token meter in place (for streaming updates).
+
+    Args:
+        used_tokens: Number of tokens used
+        max_tokens: Maximum tokens available
+        label: Label for the visualization
+    """
+    percentage, color, bar = _token_bar(used_tokens, max_tokens, bar_length=30)
+    print(f"\r{Fore.CYAN}{label}:{Style.RESET_ALL} {color}{bar}{Style.RESET_ALL} "
+          f"{percentage:.1f}% ({used_tokens:,} / {max_tokens:,})", end="", flush=True)
+
+
+def print_stream_stats(stats: Dict[str, Any], label: str = "Latency"):
+    """
+    Print time-to-first-token and throughput for a streamed turn.
+
+    Args:
+        stats: Stats dictionary from stream_chat_completion
+        label: Label for the line
+    """
+    print(f"{Fore.CYAN}{label}:{Style.RESET_ALL} "
+          f"TTFT {stats['ttft'] * 1000:.0f} ms | "
+          f"{stats['tokens_per_sec']:.1f} tokens/sec | "
+          f"{stats['output_tokens']} output tokens in {stats['duration']:.2f}s\n")
+
+
 def print_comparison(before: Dict[str, Any], after: Dict[str, Any]):
     """
     Print a before/after comparison of token usage.
@@ -122,16 +161,20 @@ def print_messages(messages: List[Dict[str, str]], title: str = "Messages", mode
         model: Model name for token counting
     """
     from .token_counter import estimate_tokens_for_messages
+    from .model_registry import get_model_info
 
     print_section(f"{title} ({len(messages)} messages)")
 
     total_tokens = estimate_tokens_for_messages(messages, model)
+    info = get_model_info(model)
 
     for i, msg in enumerate(messages, 1):
         print(f"{Fore.YELLOW}Message {i}:{Style.RESET_ALL}")
         print_message(msg, show_tokens=True, model=model)
 
-    print(f"{Fore.CYAN}{Style.BRIGHT}Total tokens for all messages: {total_tokens:,}{Style.RESET_ALL}\n")
+    print(f"{Fore.CYAN}{Style.BRIGHT}Total tokens for all messages: {total_tokens:,}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Context window ({info['name']}): {total_tokens / info['context_window'] * 100:.1f}% "
+          f"of {info['context_window']:,} tokens, max output {info['max_output']:,}{Style.RESET_ALL}\n")
 
 
 def print_success(message: str):